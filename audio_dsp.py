@@ -0,0 +1,189 @@
+"""
+NumPy signal processing for the server-rendered audio.
+
+``time_stretch`` changes the tempo of speech without changing its pitch
+(WSOLA, waveform-similarity overlap-add): the signal is cut into Hann-windowed
+frames that are overlap-added at a fixed synthesis hop, while the analysis
+positions advance by ``hop * speed``.  Each frame is shifted within a small
+tolerance to where it best continues the previous one, which avoids the
+phasing artifacts of a plain overlap-add.  Only that search runs per frame
+(one ``np.correlate`` call); framing, windowing and the overlap-add are
+single array operations over all frames.
+
+``mfcc`` and ``dtw_distance`` compare a learner's recording with a reference
+clip (see pronunciation.py).  MFCCs are computed for all frames at once
+(framing by stride tricks, one batched FFT, matrix products for the mel
+filterbank and the DCT).  DTW fills the cost matrix one row at a time, each
+row as a vectorized min-plus scan (``np.minimum.accumulate``), so a 2-second
+clip against its reference takes a few milliseconds.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+FRAME = 1024       # samples per frame (~46 ms at 22.05 kHz)
+TOLERANCE = 256    # max shift of a frame from its nominal position, in samples
+
+N_MFCC = 13
+N_MELS = 26
+# Mel band shared by 16 kHz recordings and 22.05 kHz TTS clips, so their features are comparable
+MEL_FMIN = 60.0
+MEL_FMAX = 8000.0
+
+
+def pcm16_to_float(frames: bytes) -> np.ndarray:
+    return np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def pcm_to_float(frames: bytes, channels: int, width: int) -> np.ndarray:
+    """Mono float samples in [-1, 1) from interleaved 8-, 16- or 32-bit PCM."""
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = pcm16_to_float(frames)
+    elif width == 4:
+        samples = (np.frombuffer(frames, dtype="<i4") / 2147483648.0).astype(np.float32)
+    else:
+        raise ValueError(f"Unsupported sample width: {width} bytes")
+    if channels > 1:
+        samples = samples[:len(samples) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def float_to_pcm16(samples: np.ndarray) -> bytes:
+    return (np.clip(samples, -1.0, 1.0 - 1.0 / 32768.0) * 32768.0).astype("<i2").tobytes()
+
+
+def time_stretch(samples: np.ndarray, speed: float, frame: int = FRAME, tolerance: int = TOLERANCE) -> np.ndarray:
+    """
+    Returns ``samples`` (mono float) played at ``speed`` times the original
+    tempo, i.e. about ``len(samples) / speed`` samples long, at the same pitch.
+    """
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+    if speed == 1.0 or len(samples) == 0:
+        return samples
+    hop = frame // 2                       # synthesis hop; Hann windows at half overlap sum to one
+    out_length = int(round(len(samples) / speed))
+    n_frames = out_length // hop + 1
+
+    # Padding keeps every candidate frame inside the signal
+    padded = np.concatenate([
+        np.zeros(tolerance, dtype=np.float32),
+        samples.astype(np.float32, copy=False),
+        np.zeros(int(n_frames * hop * speed) + frame + 2 * tolerance, dtype=np.float32),
+    ])
+
+    positions = np.empty(n_frames, dtype=np.int64)
+    positions[0] = tolerance
+    for k in range(1, n_frames):
+        # The previous frame's natural continuation, over the region the next frame overlaps it
+        natural = positions[k - 1] + hop
+        template = padded[natural:natural + hop]
+        nominal = tolerance + int(round(k * hop * speed))
+        region = padded[nominal - tolerance:nominal + tolerance + hop]
+        positions[k] = nominal - tolerance + int(np.argmax(np.correlate(region, template, mode="valid")))
+
+    window = np.hanning(frame + 1)[:frame].astype(np.float32)  # periodic Hann
+    frames = sliding_window_view(padded, frame)[positions] * window
+    out = np.zeros((n_frames + 1, hop), dtype=np.float32)
+    out[:-1] += frames[:, :hop]
+    out[1:] += frames[:, hop:]
+    return out.reshape(-1)[:out_length]
+
+
+# --- FEATURES & ALIGNMENT ---
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(rate: int, n_fft: int, n_mels: int = N_MELS) -> np.ndarray:
+    """(n_mels, n_fft // 2 + 1) triangular filters, equally spaced on the mel scale."""
+    fmax = min(MEL_FMAX, rate / 2)
+    edges = _mel_to_hz(np.linspace(_hz_to_mel(MEL_FMIN), _hz_to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / rate)
+    lower, centre, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (centre - lower)
+    falling = (upper - bins) / (upper - centre)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_in: int, n_out: int) -> np.ndarray:
+    """Orthonormal DCT-II, first ``n_out`` rows."""
+    k = np.arange(n_out)[:, None]
+    matrix = np.cos(np.pi / n_in * (np.arange(n_in) + 0.5) * k) * np.sqrt(2.0 / n_in)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+def resample(samples: np.ndarray, rate: int, target: int) -> np.ndarray:
+    """Band-limited resampling of a mono clip by truncating or zero-padding its spectrum."""
+    if rate == target or len(samples) == 0:
+        return samples
+    length = max(1, int(round(len(samples) * target / rate)))
+    spectrum = np.fft.rfft(samples)[:length // 2 + 1]
+    return (np.fft.irfft(spectrum, length) * (length / len(samples))).astype(np.float32)
+
+
+def mfcc(samples: np.ndarray, rate: int, n_mfcc: int = N_MFCC, frame_ms: float = 25.0, hop_ms: float = 10.0,
+         trim_db: float = 30.0, floor_db: float = 40.0) -> np.ndarray:
+    """
+    (frames, n_mfcc - 1) cepstral coefficients c1.. of a mono clip, normalized
+    to zero mean and unit variance per coefficient (so microphone and level
+    differences cancel out).  Frames more than ``trim_db`` below the loudest
+    one are cut from both ends, dropping leading and trailing silence, and mel
+    energies are floored ``floor_db`` below the clip's peak so background
+    noise in quiet bands does not dominate the cepstra.  Clips are only
+    comparable at the same ``rate``.
+    """
+    frame = int(rate * frame_ms / 1000)
+    hop = int(rate * hop_ms / 1000)
+    samples = samples.astype(np.float32, copy=False)
+    if len(samples) < frame:
+        samples = np.pad(samples, (0, frame - len(samples)))
+
+    # Trimming looks at the plain signal: pre-emphasis would favour hiss over voiced sounds
+    energy = 10.0 * np.log10((sliding_window_view(samples, frame)[::hop] ** 2).mean(axis=1) + 1e-10)
+    loud = np.flatnonzero(energy > energy.max() - trim_db)
+    samples = samples[loud[0] * hop:loud[-1] * hop + frame]
+
+    emphasized = np.append(samples[:1], samples[1:] - 0.97 * samples[:-1])
+    frames = sliding_window_view(emphasized, frame)[::hop] * np.hamming(frame).astype(np.float32)
+    n_fft = 1 << (frame - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+
+    mel = power @ _mel_filterbank(rate, n_fft).T
+    log_mel = np.log(np.maximum(mel, mel.max() * 10.0 ** (-floor_db / 10.0) + 1e-20))
+    cepstra = (log_mel @ _dct_matrix(log_mel.shape[1], n_mfcc).T)[:, 1:]  # c0 is just loudness
+    return (cepstra - cepstra.mean(axis=0)) / (cepstra.std(axis=0) + 1e-8)
+
+
+def dtw_distance(a: np.ndarray, b: np.ndarray) -> float:
+    """
+    Dynamic-time-warping distance between feature sequences ``a`` (n, d) and
+    ``b`` (m, d): the cheapest monotonic alignment under Euclidean frame
+    distance, divided by n + m so clips of any length compare.
+
+    Row i of the accumulated cost is D[i, j] = C[i, j] + min(P[j], D[i, j-1])
+    with P[j] = min(D[i-1, j-1], D[i-1, j]).  Unrolled, that is
+    S[j] + min over k <= j of (P[k] - S[k-1]) for the row's prefix sums S,
+    i.e. one cumulative minimum per row instead of a loop over cells.
+    """
+    squared = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2.0 * a @ b.T
+    cost = np.sqrt(np.maximum(squared, 0.0))
+
+    previous = np.cumsum(cost[0])
+    for row in cost[1:]:
+        best = np.minimum(previous, np.concatenate(([np.inf], previous[:-1])))
+        prefix = np.cumsum(row)
+        previous = prefix + np.minimum.accumulate(best - (prefix - row))
+    return float(previous[-1] / (len(a) + len(b)))
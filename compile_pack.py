@@ -0,0 +1,138 @@
+"""
+Content-pack compiler and validator.
+
+Reads one or more authoring sources, validates the merged content and writes
+the binary pack loaded by the app (content/goethe_content.pack by default).
+Any schema error aborts the build, so the app only ever deserializes content
+that is known to be valid.
+
+Supported sources:
+
+* ``.json`` / ``.yaml`` / ``.yml``: {level: {skill: [items]}}, same shape as
+  content/goethe_content.json (YAML needs PyYAML installed).
+* ``.csv``: one row per item with ``level``, ``skill`` and ``id`` columns plus
+  the item fields.  ``options`` and ``tags`` are ``|``-separated and
+  ``correct`` is an integer.  Reading/listening rows carry one question each
+  (``q``, ``options``, ``correct``); rows sharing an ``id`` become one item.
+
+Usage:
+
+    python compile_pack.py content/goethe_content.json
+    python compile_pack.py content/goethe_content.json extra_vocab.csv -o content/goethe_content.pack
+    python compile_pack.py content/goethe_content.json --check
+"""
+
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from content_pack import PACK_PATH, ContentError, compile_content, write_pack
+
+LIST_FIELDS = ("options", "tags")
+QUESTION_FIELDS = ("q", "options", "correct")
+
+
+def read_json(path: Path) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ContentError(f"{path}: invalid JSON: {e}")
+
+
+def read_yaml(path: Path) -> Dict:
+    try:
+        import yaml
+    except ImportError:
+        raise ContentError(f"{path}: reading YAML sources requires PyYAML (pip install pyyaml)")
+    with open(path, encoding="utf-8") as f:
+        try:
+            return yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise ContentError(f"{path}: invalid YAML: {e}")
+
+
+def read_csv(path: Path) -> Dict:
+    """Reads a CSV source into the {level: {skill: [items]}} shape."""
+    content: Dict[str, Dict[str, List[Dict]]] = {}
+    items_by_id: Dict[str, Dict] = {}
+
+    with open(path, encoding="utf-8", newline="") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            row = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            missing = [k for k in ("level", "skill", "id") if k not in row]
+            if missing:
+                raise ContentError(f"{path}:{line_no}: missing column(s) {', '.join(missing)}")
+            level, skill = row.pop("level"), row.pop("skill")
+
+            for field in LIST_FIELDS:
+                if field in row:
+                    row[field] = [part.strip() for part in row[field].split("|")]
+            if "correct" in row:
+                try:
+                    row["correct"] = int(row["correct"])
+                except ValueError:
+                    raise ContentError(f"{path}:{line_no}: 'correct' must be an integer, got {row['correct']!r}")
+
+            if skill in ("reading", "listening"):
+                question = {k: row.pop(k) for k in QUESTION_FIELDS if k in row}
+                item = items_by_id.get(row["id"])
+                if item is None:
+                    item = items_by_id[row["id"]] = dict(row, questions=[])
+                    content.setdefault(level, {}).setdefault(skill, []).append(item)
+                item["questions"].append(question)
+            else:
+                content.setdefault(level, {}).setdefault(skill, []).append(row)
+    return content
+
+
+READERS = {".json": read_json, ".yaml": read_yaml, ".yml": read_yaml, ".csv": read_csv}
+
+
+def merge_sources(paths: List[Path]) -> Dict:
+    """Reads every source and concatenates their pools per (level, skill)."""
+    merged: Dict[str, Dict[str, List[Dict]]] = {}
+    for path in paths:
+        reader = READERS.get(path.suffix.lower())
+        if reader is None:
+            raise ContentError(f"{path}: unsupported source type (expected one of {', '.join(READERS)})")
+        source = reader(path)
+        if not isinstance(source, dict):
+            raise ContentError(f"{path}: expected a mapping of level -> skill -> items")
+        for level, skills in source.items():
+            if not isinstance(skills, dict):
+                raise ContentError(f"{path}: {level}: expected a mapping of skill -> items")
+            for skill, items in skills.items():
+                merged.setdefault(level, {}).setdefault(skill, []).extend(items or [])
+    return merged
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Validate authoring sources and compile the content pack.")
+    parser.add_argument("sources", nargs="+", type=Path, help="JSON, YAML or CSV authoring sources")
+    parser.add_argument("-o", "--output", type=Path, default=PACK_PATH, help=f"Pack to write (default: {PACK_PATH})")
+    parser.add_argument("--check", action="store_true", help="Only validate, do not write a pack")
+    args = parser.parse_args(argv)
+
+    try:
+        levels = compile_content(merge_sources(args.sources))
+    except (ContentError, OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    counts = {level: sum(len(items) for items in skills.values()) for level, skills in levels.items()}
+    summary = ", ".join(f"{level}: {count}" for level, count in counts.items())
+    if args.check:
+        print(f"OK: {sum(counts.values())} items ({summary})")
+        return 0
+
+    version = write_pack(levels, args.output)
+    print(f"Wrote {args.output} (version {version}, {sum(counts.values())} items; {summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,573 @@
+"""
+Compiled content pack shared by every Goethe Trainer session.
+
+The exercise content used to live as a ``CONTENT_DB`` dict literal inside each
+entry point, which meant every script run re-evaluated it and every session kept
+its own copy.  The content now lives in ``content/goethe_content.json`` and is
+compiled into a binary pack:
+
+    MAGIC (4 bytes) | format (uint16) | header length (uint32) | header | level sections
+
+The header is a JSON object with the content version and, per level, the byte
+offset/length of its section and the number of items per skill.  Every level
+section is a JSON array of item objects, ordered by skill, so a level can be
+decoded on its own the first time it is needed.  Packs are plain data (no
+pickle): the server reloads whatever pack is published, and reading one must
+never run code.
+
+``load_pack()`` deserializes the pack once per server process and hands the
+same read-only ``ContentPack`` to every session.  ``load_content()`` returns
+either that pack or, if configured, the SQLite store from content_store.py.
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+CONTENT_DIR = Path(__file__).resolve().parent / "content"
+SOURCE_PATH = CONTENT_DIR / "goethe_content.json"
+PACK_PATH = CONTENT_DIR / "goethe_content.pack"
+# Set to the path of a database built by content_store.py to use the SQLite backend
+CONTENT_DB_ENV = "GOETHE_CONTENT_DB"
+
+PACK_MAGIC = b"GTPK"
+PACK_FORMAT = 2    # 1 was pickle-based
+_PREAMBLE = struct.Struct("<4sHI")
+
+# Order in which skills are laid out inside a level section
+SKILLS = ("reading", "listening", "writing", "pronunciation", "grammar", "vocabulary")
+
+
+class ContentError(ValueError):
+    """Raised when content fails validation or a pack cannot be read."""
+
+
+# --- VALIDATION & NORMALIZATION ---
+
+def _require_text(item: Dict, field: str, where: str, errors: List[str]) -> str:
+    value = item.get(field)
+    if not isinstance(value, str) or not value.strip():
+        errors.append(f"{where}: '{field}' must be a non-empty string")
+        return ""
+    return value
+
+
+def _compile_question(question: Dict, where: str, errors: List[str]) -> Dict:
+    """Validates one multiple-choice question ({q, options, correct})."""
+    text = _require_text(question, "q", where, errors)
+    options = question.get("options")
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(o, str) for o in options):
+        errors.append(f"{where}: 'options' must be a list of at least two strings")
+        return {"q": text, "options": [], "correct": 0}
+    if len(set(options)) != len(options):
+        errors.append(f"{where}: 'options' must not repeat a label")
+
+    correct = question.get("correct")
+    if not isinstance(correct, int) or isinstance(correct, bool) or not 0 <= correct < len(options):
+        errors.append(f"{where}: 'correct' must be an index into options (0..{len(options) - 1}), got {correct!r}")
+        correct = 0
+    return {"q": text, "options": list(options), "correct": correct}
+
+
+def _compile_item(skill: str, item: Dict, where: str, errors: List[str]) -> Dict:
+    """Validates one item of the given skill and returns its canonical form."""
+    compiled = {"id": item.get("id")}
+
+    if skill in ("reading", "listening"):
+        body_field = "text" if skill == "reading" else "transcript"
+        compiled[body_field] = _require_text(item, body_field, where, errors)
+        questions = item.get("questions")
+        if questions is None and "q" in item:
+            # Single-question scenarios may be written flat ({q, options, correct})
+            questions = [{k: item[k] for k in ("q", "options", "correct") if k in item}]
+        if not isinstance(questions, list) or not questions:
+            errors.append(f"{where}: 'questions' must be a non-empty list")
+            questions = []
+        compiled["questions"] = [
+            _compile_question(q, f"{where}.questions[{i}]", errors) for i, q in enumerate(questions)
+        ]
+
+    elif skill == "grammar":
+        if "q" not in item and "question" in item:
+            item = dict(item, q=item["question"])
+        compiled.update(_compile_question(item, where, errors))
+
+    elif skill == "vocabulary":
+        compiled["german"] = _require_text(item, "german", where, errors)
+        english = compiled["english"] = _require_text(item, "english", where, errors)
+        options = item.get("options")
+        correct = 0
+        if isinstance(options, list) and english in options:
+            correct = options.index(english)
+            if item.get("correct", correct) != correct:
+                errors.append(f"{where}: 'correct' ({item['correct']!r}) does not point at 'english' ({english!r})")
+        elif english:
+            errors.append(f"{where}: 'english' ({english!r}) must be one of 'options'")
+        question = _compile_question(dict(item, q=compiled["german"] or "-", correct=correct), where, errors)
+        compiled["options"] = question["options"]
+        compiled["correct"] = question["correct"]
+
+    elif skill == "pronunciation":
+        compiled["word"] = _require_text(item, "word", where, errors)
+        compiled["meaning"] = _require_text(item, "meaning", where, errors)
+        if item.get("ipa"):
+            compiled["ipa"] = item["ipa"]
+
+    elif skill == "writing":
+        compiled["prompt"] = _require_text(item, "prompt", where, errors)
+
+    tags = item.get("tags")
+    if tags is not None:
+        if not isinstance(tags, list) or not all(isinstance(t, str) and t for t in tags):
+            errors.append(f"{where}: 'tags' must be a list of non-empty strings")
+        else:
+            compiled["tags"] = sorted(set(tags))
+
+    return compiled
+
+
+def compile_content(source: Mapping) -> Dict[str, Dict[str, List[Dict]]]:
+    """
+    Validates authoring content ({level: {skill: [items]}}) and returns it in
+    canonical form.  All problems are collected and reported together.
+    """
+    errors: List[str] = []
+    seen_ids: Dict[str, str] = {}
+    levels: Dict[str, Dict[str, List[Dict]]] = {}
+
+    if not isinstance(source, Mapping) or not source:
+        raise ContentError("Content must be a non-empty mapping of level -> skill -> items")
+
+    for level, skills in source.items():
+        if not isinstance(skills, Mapping):
+            errors.append(f"{level}: expected a mapping of skill -> items")
+            continue
+        levels[level] = {}
+        for skill in SKILLS:
+            items = skills.get(skill, [])
+            if not isinstance(items, list):
+                errors.append(f"{level}.{skill}: expected a list of items")
+                continue
+            compiled_items = []
+            for i, item in enumerate(items):
+                where = f"{level}.{skill}[{i}]"
+                if not isinstance(item, Mapping):
+                    errors.append(f"{where}: expected an object")
+                    continue
+                item_id = item.get("id")
+                if not isinstance(item_id, str) or not item_id:
+                    errors.append(f"{where}: 'id' must be a non-empty string")
+                    continue
+                where = f"{where} ({item_id})"
+                prefix = item_id.split("_", 1)[0]
+                if prefix != level and prefix in source:
+                    errors.append(f"{where}: id belongs to level {prefix} but is listed under {level}")
+                if item_id in seen_ids:
+                    errors.append(f"{where}: duplicate id, already used at {seen_ids[item_id]}")
+                    continue
+                seen_ids[item_id] = f"{level}.{skill}[{i}]"
+                compiled_items.append(_compile_item(skill, item, where, errors))
+            if not compiled_items:
+                errors.append(f"{level}.{skill}: empty pool (every level needs at least one item per skill)")
+            levels[level][skill] = compiled_items
+        for skill in skills:
+            if skill not in SKILLS:
+                errors.append(f"{level}.{skill}: unknown skill (expected one of {', '.join(SKILLS)})")
+
+    if errors:
+        raise ContentError("Invalid content:\n  " + "\n  ".join(errors))
+    return levels
+
+
+# --- PACK ENCODING ---
+
+def _dump_json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_pack(levels: Mapping[str, Mapping[str, List[Dict]]]) -> bytes:
+    """Serializes compiled content (see compile_content) into pack bytes."""
+    sections = []
+    level_table = {}
+    offset = 0
+    for level, skills in levels.items():
+        items = tuple(item for skill in SKILLS for item in skills.get(skill, ()))
+        blob = _dump_json(items)
+        level_table[level] = {
+            "offset": offset,
+            "length": len(blob),
+            "counts": {skill: len(skills[skill]) for skill in SKILLS if skills.get(skill)},
+        }
+        sections.append(blob)
+        offset += len(blob)
+
+    body = b"".join(sections)
+    header = _dump_json({"version": hashlib.sha256(body).hexdigest()[:12], "levels": level_table})
+    return _PREAMBLE.pack(PACK_MAGIC, PACK_FORMAT, len(header)) + header + body
+
+
+def write_pack(levels: Mapping[str, Mapping[str, List[Dict]]], path: Path = PACK_PATH) -> str:
+    """
+    Writes a pack atomically (temp file + rename) so readers never observe a
+    half-written file.  The pack gets the usual 0644-minus-umask mode, so an
+    app running as another user than the compiler can read it.  Returns the
+    content version.
+    """
+    data = encode_pack(levels)
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file as 0600 and the rename keeps that mode
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o644 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return decode_pack(data).version
+
+
+def _freeze(value):
+    """Recursively converts dicts/lists into read-only mappings/tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _LazyLevels(Mapping):
+    """CONTENT_DB-style {level: {skill: items}} view that only decodes the levels it is asked for."""
+
+    def __init__(self, pack: "ContentPack"):
+        self._pack = pack
+
+    def __getitem__(self, level: str) -> Mapping[str, Tuple[Mapping, ...]]:
+        skills = self._pack.skills(level)
+        if not skills:
+            raise KeyError(level)
+        return MappingProxyType({skill: self._pack.pool(level, skill) for skill in skills})
+
+    def __iter__(self):
+        return iter(self._pack.level_names)
+
+    def __len__(self) -> int:
+        return len(self._pack.level_names)
+
+
+class ContentPack:
+    """
+    Read-only view of a pack, shared across sessions.
+
+    Every item gets an integer id.  Items are laid out level by level and skill
+    by skill, so each (level, skill) pool is a contiguous id range in ``index``.
+    The index comes from the pack header; a level's items are only decoded
+    the first time something from that level is accessed.
+    """
+
+    def __init__(self, version: str, data: Union[bytes, mmap.mmap], body_start: int,
+                 level_table: Mapping[str, Mapping]):
+        self.version = version
+        self._data = data
+        self._lock = threading.Lock()
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        self._first_ids: List[int] = []
+        self._decoded: Dict[str, Tuple[Mapping, ...]] = {}
+        self._keys: Dict[str, Dict[str, int]] = {}
+        self._tag_index: Dict[Tuple[str, str, str], array] = {}
+
+        index = {}
+        next_id = 0
+        for level, entry in level_table.items():
+            self._sections[level] = (body_start + entry["offset"], entry["length"])
+            self._first_ids.append(next_id)
+            for skill, count in entry["counts"].items():
+                index[(level, skill)] = range(next_id, next_id + count)
+                next_id += count
+        self.index = MappingProxyType(index)
+        self.level_names = tuple(level_table)
+        self.levels = _LazyLevels(self)
+        self._size = next_id
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _level_items(self, level: str) -> Tuple[Mapping, ...]:
+        """Returns all items of a level, decoding its section on first access."""
+        items = self._decoded.get(level)
+        if items is None:
+            with self._lock:
+                items = self._decoded.get(level)
+                if items is None:
+                    start, length = self._sections[level]
+                    items = _freeze(json.loads(self._data[start:start + length]))
+                    first_id = self._first_ids[self.level_names.index(level)]
+                    self._keys[level] = {item["id"]: first_id + i for i, item in enumerate(items)}
+                    self._decoded[level] = items
+        return items
+
+    def loaded_levels(self) -> Tuple[str, ...]:
+        """Levels whose items have been decoded so far."""
+        return tuple(self._decoded)
+
+    def skills(self, level: str) -> Tuple[str, ...]:
+        return tuple(skill for (lvl, skill) in self.index if lvl == level)
+
+    def pool(self, level: str, skill: str) -> Tuple[Mapping, ...]:
+        """Returns all items of a skill for a level (empty tuple if none)."""
+        ids = self.ids(level, skill)
+        if not ids:
+            return ()
+        first_id = self._first_ids[self.level_names.index(level)]
+        return self._level_items(level)[ids.start - first_id:ids.stop - first_id]
+
+    def ids(self, level: str, skill: str, tag: Optional[str] = None) -> Sequence[int]:
+        """Returns the id range of a (level, skill) pool, optionally narrowed to one tag."""
+        ids = self.index.get((level, skill), range(0))
+        if tag is None:
+            return ids
+        key = (level, skill, tag)
+        tagged = self._tag_index.get(key)
+        if tagged is None:
+            # Built on first use per (level, skill, tag) and kept for the life of the pack
+            tagged = array("I", (i for i in ids if tag in self.item(i).get("tags", ())))
+            self._tag_index[key] = tagged
+        return tagged
+
+    def item(self, item_id: int) -> Mapping:
+        if not 0 <= item_id < self._size:
+            raise IndexError(item_id)
+        position = bisect.bisect_right(self._first_ids, item_id) - 1
+        return self._level_items(self.level_names[position])[item_id - self._first_ids[position]]
+
+    def lookup(self, key: str) -> Optional[int]:
+        """
+        Returns the integer id of the item whose string id is ``key`` (None if absent).
+        String ids start with their level, so only that level is decoded.
+        """
+        level = key.split("_", 1)[0]
+        if level not in self._sections:
+            return None
+        self._level_items(level)
+        return self._keys[level].get(key)
+
+    def resolve(self, item_ids: Sequence[int]) -> List[Mapping]:
+        """Maps a sequence of ids back to their items."""
+        return [self.item(i) for i in item_ids]
+
+    def remember(self, item_ids: Sequence[int]) -> None:
+        """Called for every selection; a pack is immutable and retained whole, so there is nothing to keep."""
+
+    def sample(self, level: str, skill: str, count: int, tag: Optional[str] = None,
+               rng: random.Random = random) -> List[int]:
+        """
+        Draws up to ``count`` distinct ids from a (level, skill) pool.
+        Sampling from the id range only touches the chosen ids, not the whole pool.
+        """
+        ids = self.ids(level, skill, tag)
+        return rng.sample(ids, min(count, len(ids)))
+
+
+def decode_pack(data: Union[bytes, mmap.mmap]) -> ContentPack:
+    """
+    Reads a pack's header.  Level sections stay in ``data`` until first use.
+    No validation happens here; that is done at compile time.
+    """
+    if len(data) < _PREAMBLE.size:
+        raise ContentError("Content pack is truncated")
+    magic, fmt, header_len = _PREAMBLE.unpack_from(data)
+    if magic != PACK_MAGIC:
+        raise ContentError("Not a content pack (bad magic)")
+    if fmt != PACK_FORMAT:
+        raise ContentError(
+            f"Unsupported content pack format {fmt} (expected {PACK_FORMAT}); rebuild it with compile_pack.py"
+        )
+
+    body_start = _PREAMBLE.size + header_len
+    try:
+        header = json.loads(data[_PREAMBLE.size:body_start])
+        return ContentPack(header["version"], data, body_start, header["levels"])
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ContentError(f"Corrupt content pack header: {e!r}") from e
+
+
+def open_pack(path: Path) -> ContentPack:
+    """
+    Memory-maps a pack file.  Packs are replaced by rename (see write_pack), so
+    the mapping keeps the original file contents alive even if a new pack is
+    written later.
+    """
+    with open(path, "rb") as f:
+        return decode_pack(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# --- PROCESS-WIDE LOADING & HOT RELOAD ---
+
+# Minimum seconds between checks of the content files for changes
+RELOAD_INTERVAL = float(os.environ.get("GOETHE_CONTENT_RELOAD_INTERVAL", "2.0"))
+
+logger = logging.getLogger(__name__)
+
+# Superseded pack versions kept alive so sessions that sampled from them can still resolve their ids
+RETAINED_VERSIONS = 4
+
+_pack = None
+_retained: "OrderedDict[str, ContentPack]" = OrderedDict()
+_pack_signature = None
+_store = None
+_last_check = 0.0
+_pack_lock = threading.Lock()
+
+
+def _read_source_pack() -> bytes:
+    """Compiles the JSON authoring source in memory (used when no pack was built)."""
+    with open(SOURCE_PATH, encoding="utf-8") as f:
+        return encode_pack(compile_content(json.load(f)))
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime, size) of a file, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _due_for_check() -> bool:
+    global _last_check
+    now = time.monotonic()
+    if now - _last_check < RELOAD_INTERVAL:
+        return False
+    _last_check = now
+    return True
+
+
+def _retain(content) -> None:
+    """Keeps a content version resolvable for the sessions that sampled from it (oldest dropped first)."""
+    _retained[content.version] = content
+    _retained.move_to_end(content.version)
+    while len(_retained) > RETAINED_VERSIONS + 1:
+        _retained.popitem(last=False)
+
+
+def load_pack() -> ContentPack:
+    """
+    Returns the process-wide content pack, loading it on first use.
+    Prefers the compiled pack; falls back to compiling the JSON source if the
+    pack is missing or older than the source.
+
+    At most every RELOAD_INTERVAL seconds the files are checked again.  A
+    changed file is loaded and, if its content version differs, swapped in as
+    the new process-wide pack.  Callers that already hold items keep them; only
+    later lookups see the new version.  A pack that fails to load is logged and
+    the current version stays in place.
+    """
+    global _pack, _pack_signature
+    if _pack is not None and not _due_for_check():
+        return _pack
+
+    with _pack_lock:
+        pack_sig, source_sig = _file_signature(PACK_PATH), _file_signature(SOURCE_PATH)
+        use_pack = pack_sig is not None and (source_sig is None or pack_sig[1] >= source_sig[1])
+        signature = pack_sig if use_pack else source_sig
+        if _pack is not None and signature == _pack_signature:
+            return _pack
+
+        try:
+            pack = open_pack(PACK_PATH) if use_pack else decode_pack(_read_source_pack())
+        except (ContentError, OSError, ValueError) as e:
+            if _pack is None:
+                raise
+            logger.warning("Content reload failed, keeping version %s: %s", _pack.version, e)
+        else:
+            if _pack is None or pack.version != _pack.version:
+                if _pack is not None:
+                    logger.info("Content reloaded: version %s -> %s", _pack.version, pack.version)
+                _pack = pack
+                _retain(pack)
+        # Remember the signature even on failure so a broken file is not retried on every call
+        _pack_signature = signature
+    return _pack
+
+
+def load_content():
+    """
+    Returns the content source the app should use: the SQLite store named by
+    the GOETHE_CONTENT_DB environment variable if set, otherwise the content pack.
+    """
+    db_path = os.environ.get(CONTENT_DB_ENV)
+    if not db_path:
+        return load_pack()
+
+    global _store
+    if _store is None or str(_store.path) != db_path:
+        with _pack_lock:
+            if _store is None or str(_store.path) != db_path:
+                from content_store import SQLiteContentStore
+                _store = SQLiteContentStore(Path(db_path))
+    elif _due_for_check():
+        with _pack_lock:
+            superseded = _store.refresh()
+        if superseded is not None:
+            # The database was edited in place: what sessions selected from the old version lives on
+            _retain(superseded)
+    return _store
+
+
+def content_for_version(version: str):
+    """
+    Returns the content source for a given version: the current one, or a
+    retained superseded pack (or SQLite store snapshot).  None if that
+    version is no longer available.
+    """
+    content = load_content()
+    if content.version == version:
+        return content
+    return _retained.get(version)
+
+
+# --- COMPACT SESSION SELECTIONS ---
+
+class Selection(NamedTuple):
+    """A sampled exercise as stored in session state: content version plus item ids."""
+    version: str
+    ids: array
+
+
+def make_selection(content, item_ids: Sequence[int]) -> Selection:
+    content.remember(item_ids)
+    return Selection(content.version, array("I", item_ids))
+
+
+def resolve_selection(selection: Optional[Selection]) -> Optional[List[Mapping]]:
+    """
+    Resolves a selection against the content version it was sampled from.
+    Returns None for no selection or when that version (or, for a superseded
+    store version, the selection's items) is no longer retained.
+    """
+    if selection is None:
+        return None
+    content = content_for_version(selection.version)
+    if content is None:
+        return None
+    try:
+        return content.resolve(selection.ids)
+    except KeyError:
+        return None
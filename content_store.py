@@ -0,0 +1,335 @@
+"""
+SQLite content backend with FTS5 full-text search.
+
+An alternative to the in-memory content pack for large content sets.  The
+database is built from a compiled pack (so item ids are identical in both
+backends) and then opened read-only by the app through a small pool of
+connections, so queries from concurrent sessions run in parallel without
+connecting on every script run.  It exposes the same lookup/sampling methods as ``ContentPack``
+plus ``search()``; id pools, decoded pools and the level/skill layout are
+cached until the content version changes.
+
+Unlike a pack, the database is edited in place, so an old version cannot be
+kept whole.  Instead the store remembers every item it handed out in a
+selection; when the version changes those items become a ``StoreSnapshot``
+that content_pack retains like a superseded pack, and sessions keep their
+exercise until "Next Exercise".
+
+Build the database, then point the app at it:
+
+    python content_store.py content/goethe_content.sqlite
+    GOETHE_CONTENT_DB=content/goethe_content.sqlite streamlit run streamlit_app.py
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from content_pack import ContentPack, _freeze, _LazyLevels, load_pack
+
+# Fields indexed for full-text search; items without a field leave it empty
+SEARCH_FIELDS = ("text", "transcript", "q", "german", "english")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE items (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    level TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX items_level_skill ON items (level, skill, id);
+CREATE TABLE item_tags (
+    tag TEXT NOT NULL,
+    item_id INTEGER NOT NULL REFERENCES items (id),
+    PRIMARY KEY (tag, item_id)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE items_fts USING fts5(
+    text, transcript, q, german, english,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def build_store(pack: ContentPack, path: Path) -> None:
+    """Writes a pack into a fresh SQLite database (WAL mode) at ``path``."""
+    path = Path(path)
+    if path.exists():
+        path.unlink()
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (pack.version,))
+            for (level, skill), ids in pack.index.items():
+                for item_id in ids:
+                    item = _thaw(pack.item(item_id))
+                    conn.execute(
+                        "INSERT INTO items (id, key, level, skill, data) VALUES (?, ?, ?, ?, ?)",
+                        (item_id, item["id"], level, skill, json.dumps(item, ensure_ascii=False)),
+                    )
+                    conn.executemany(
+                        "INSERT INTO item_tags (tag, item_id) VALUES (?, ?)",
+                        [(tag, item_id) for tag in item.get("tags", ())],
+                    )
+                    conn.execute(
+                        "INSERT INTO items_fts (rowid, text, transcript, q, german, english) VALUES (?, ?, ?, ?, ?, ?)",
+                        (item_id, *_search_fields(item)),
+                    )
+            conn.execute("INSERT INTO items_fts (items_fts) VALUES ('optimize')")
+    finally:
+        conn.close()
+
+
+def _thaw(value):
+    """Inverse of content_pack._freeze, for JSON serialization."""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _search_fields(item: Mapping) -> Tuple[str, ...]:
+    """Returns the FTS column values for an item (reading/listening questions go into 'q')."""
+    questions = " ".join(q["q"] for q in item.get("questions", ()))
+    return tuple(
+        (item.get(field) or "") + (" " + questions if field == "q" and questions else "")
+        for field in SEARCH_FIELDS
+    )
+
+
+def _fts_query(text: str) -> str:
+    """Turns free text into a safe FTS5 query: every word must match as a prefix."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class StoreSnapshot:
+    """The items selected from a superseded store version, as a minimal read-only content source."""
+
+    def __init__(self, version: str, selected: Mapping[int, Mapping]):
+        self.version = version
+        self._selected = selected
+
+    def item(self, item_id: int) -> Mapping:
+        return self._selected[item_id]
+
+    def resolve(self, item_ids: Sequence[int]) -> List[Mapping]:
+        return [self.item(i) for i in item_ids]
+
+
+class SQLiteContentStore:
+    """Read-only content source backed by a database written by ``build_store``."""
+
+    def __init__(self, path: Path, cache_size: int = 4096, pool_size: int = 8, selected_size: int = 4096):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Content database not found: {self.path}")
+        # Idle read-only connections.  Streamlit runs every rerun on a fresh thread, so connections are
+        # borrowed per query instead of tied to a thread; up to pool_size of them are kept open.
+        self.pool_size = pool_size
+        self._idle: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+        # At most selected_size recently selected items are remembered; older selections of a superseded
+        # version stop resolving, as they would once the version itself is no longer retained
+        self.selected_size = selected_size
+        self._selected_lock = threading.Lock()
+        self._item = lru_cache(maxsize=cache_size)(self._load_item)
+        self._reset_caches()
+        self.version = self._query("SELECT value FROM meta WHERE key = 'version'")[0][0]
+        self.levels = _LazyLevels(self)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Used by one thread at a time, but not always the one that opened it
+        conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[tuple]:
+        with self._pool_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            with self._pool_lock:
+                keep = not self._closed and len(self._idle) < self.pool_size
+                if keep:
+                    self._idle.append(conn)
+            if not keep:
+                conn.close()
+
+    def _reset_caches(self) -> None:
+        # Replaced rather than cleared, so a reader on another thread never sees a half-emptied cache
+        self._ids: Dict[Tuple[str, str, Optional[str]], array] = {}
+        self._pools: Dict[Tuple[str, str], Tuple[Mapping, ...]] = {}
+        self._layout: Optional[Dict[str, Tuple[str, ...]]] = None
+        # item id -> item of the items recently selected from this version, oldest first
+        self._selected: "OrderedDict[int, Mapping]" = OrderedDict()
+
+    def refresh(self) -> Optional[StoreSnapshot]:
+        """
+        Picks up content edited in place: WAL readers see committed changes on
+        their next query, so only the caches have to be dropped when the
+        version in ``meta`` changes.  Returns the snapshot of the superseded
+        version's selected items then, otherwise None.
+        """
+        version = self._query("SELECT value FROM meta WHERE key = 'version'")[0][0]
+        if version == self.version:
+            return None
+        with self._selected_lock:
+            snapshot = StoreSnapshot(self.version, dict(self._selected))
+        self._item.cache_clear()
+        self._reset_caches()
+        self.version = version
+        return snapshot
+
+    def remember(self, item_ids: Sequence[int]) -> None:
+        """
+        Keeps the items of a new selection, so it still resolves once this
+        version is superseded.  Only the ``selected_size`` most recently
+        selected items are kept.
+        """
+        selected = self._selected
+        with self._selected_lock:
+            missing = []
+            for item_id in item_ids:
+                if item_id in selected:
+                    selected.move_to_end(item_id)
+                else:
+                    missing.append(item_id)
+        if not missing:
+            return
+        placeholders = ", ".join("?" * len(missing))
+        rows = self._query(f"SELECT id FROM items WHERE id IN ({placeholders})", missing)
+        entries = [(item_id, self.item(item_id)) for item_id, in rows]
+        with self._selected_lock:
+            selected.update(entries)
+            while len(selected) > self.selected_size:
+                selected.popitem(last=False)
+
+    def close(self) -> None:
+        with self._pool_lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _load_item(self, item_id: int) -> Mapping:
+        rows = self._query("SELECT data FROM items WHERE id = ?", (item_id,))
+        if not rows:
+            raise KeyError(item_id)
+        return _freeze(json.loads(rows[0][0]))
+
+    def _skills_by_level(self) -> Dict[str, Tuple[str, ...]]:
+        layout = self._layout
+        if layout is None:
+            layout = {}
+            for level, skill in self._query(
+                "SELECT level, skill FROM items GROUP BY level, skill ORDER BY MIN(id)"
+            ):
+                layout[level] = layout.get(level, ()) + (skill,)
+            self._layout = layout
+        return layout
+
+    # --- ContentPack-compatible lookups ---
+
+    @property
+    def level_names(self) -> Tuple[str, ...]:
+        return tuple(self._skills_by_level())
+
+    def skills(self, level: str) -> Tuple[str, ...]:
+        return self._skills_by_level().get(level, ())
+
+    def ids(self, level: str, skill: str, tag: Optional[str] = None) -> Sequence[int]:
+        key = (level, skill, tag)
+        ids = self._ids.get(key)
+        if ids is None:
+            if tag is None:
+                rows = self._query("SELECT id FROM items WHERE level = ? AND skill = ? ORDER BY id", (level, skill))
+            else:
+                rows = self._query(
+                    "SELECT items.id FROM item_tags JOIN items ON items.id = item_tags.item_id "
+                    "WHERE item_tags.tag = ? AND items.level = ? AND items.skill = ? ORDER BY items.id",
+                    (tag, level, skill),
+                )
+            ids = self._ids[key] = array("q", (row[0] for row in rows))
+        return ids
+
+    def item(self, item_id: int) -> Mapping:
+        return self._item(item_id)
+
+    def lookup(self, key: str) -> Optional[int]:
+        rows = self._query("SELECT id FROM items WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def resolve(self, item_ids: Sequence[int]) -> List[Mapping]:
+        return [self._item(i) for i in item_ids]
+
+    def pool(self, level: str, skill: str) -> Tuple[Mapping, ...]:
+        """All items of a pool; decoded once per content version (``levels`` is built from these)."""
+        key = (level, skill)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = tuple(self.resolve(self.ids(level, skill)))
+        return pool
+
+    def sample(self, level: str, skill: str, count: int, tag: Optional[str] = None,
+               rng: random.Random = random) -> List[int]:
+        ids = self.ids(level, skill, tag)
+        return rng.sample(ids, min(count, len(ids)))
+
+    # --- Full-text search ---
+
+    def search(self, text: str, level: Optional[str] = None, skill: Optional[str] = None,
+               limit: int = 20) -> List[Tuple[int, str, str, str]]:
+        """
+        Returns up to ``limit`` matches as (id, level, skill, snippet), best first.
+        Matched words are wrapped in ** for markdown rendering.
+        """
+        query = _fts_query(text)
+        if not query:
+            return []
+        sql = (
+            "SELECT items.id, items.level, items.skill, "
+            "snippet(items_fts, -1, '**', '**', ' … ', 12) "
+            "FROM items_fts JOIN items ON items.id = items_fts.rowid "
+            "WHERE items_fts MATCH ?"
+        )
+        params: List = [query]
+        if level is not None:
+            sql += " AND items.level = ?"
+            params.append(level)
+        if skill is not None:
+            sql += " AND items.skill = ?"
+            params.append(skill)
+        sql += " ORDER BY bm25(items_fts) LIMIT ?"
+        params.append(limit)
+        return [tuple(row) for row in self._query(sql, params)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite content database from the content pack.")
+    parser.add_argument("output", type=Path, help="Path of the .sqlite file to write")
+    args = parser.parse_args()
+
+    pack = load_pack()
+    build_store(pack, args.output)
+    print(f"Wrote {len(pack)} items (version {pack.version}) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
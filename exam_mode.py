@@ -0,0 +1,188 @@
+"""
+Full Goethe mock exam: Lesen, Hören, Schreiben and Sprechen in one paper.
+
+``assemble_exam`` samples every section for a level from the content index
+and stores the whole paper as one ``Selection`` plus per-section counts, so
+rendering resolves all items and question views in a single batched lookup.
+The deadline is fixed on the server when the paper is assembled; answers
+submitted after it (plus a short grace for the round trip) are discarded, as
+when papers are collected.  ``grade_exam`` scores all sections in one pass.
+
+Only Lesen and Hören are graded against an answer key, so only they decide
+whether the paper passes.  Schreiben (scored on word count) and Sprechen (a
+checkbox per word) are self-assessed: they are scored and shown, but ticking
+boxes and typing filler cannot pass an exam.
+"""
+
+import random
+import time
+from typing import List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from content_pack import Selection, content_for_version, make_selection
+from view_models import QuestionView, item_views
+
+SECTION_TITLES = {
+    "reading": "Lesen",
+    "listening": "Hören",
+    "writing": "Schreiben",
+    "pronunciation": "Sprechen",
+}
+
+
+class SectionSpec(NamedTuple):
+    skill: str
+    items: int     # passages / scenarios / prompts / words
+    minutes: int
+
+
+# Section order and timing follow the Goethe exams; item counts are scaled to the content pools
+EXAM_BLUEPRINT = {
+    "A1": (SectionSpec("listening", 6, 20), SectionSpec("reading", 3, 25),
+           SectionSpec("writing", 2, 20), SectionSpec("pronunciation", 6, 15)),
+    "A2": (SectionSpec("reading", 3, 30), SectionSpec("listening", 3, 30),
+           SectionSpec("writing", 2, 30), SectionSpec("pronunciation", 5, 15)),
+    "B1": (SectionSpec("reading", 4, 65), SectionSpec("listening", 4, 40),
+           SectionSpec("writing", 3, 60), SectionSpec("pronunciation", 4, 15)),
+    "B2": (SectionSpec("reading", 4, 65), SectionSpec("listening", 4, 40),
+           SectionSpec("writing", 2, 75), SectionSpec("pronunciation", 4, 15)),
+}
+
+# Sections with an answer key; each counts equally and 60% over them passes
+AUTO_GRADED_SKILLS = ("reading", "listening")
+PASS_MARK = 0.6
+
+# Writing earns full marks at this many words per prompt, pro rata below
+MIN_WORDS = {"A1": 30, "A2": 40, "B1": 80, "B2": 150}
+
+# Seconds a submission may arrive after the deadline (request round trip)
+SUBMIT_GRACE = 30
+
+
+class ExamPaper(NamedTuple):
+    level: str
+    selection: Selection          # all items, section by section
+    counts: Tuple[int, ...]       # items per section of EXAM_BLUEPRINT[level]
+    started_at: float
+    deadline: float
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        """Seconds left on the server clock (negative once time is up)."""
+        return self.deadline - (time.time() if now is None else now)
+
+
+class ExamSection(NamedTuple):
+    spec: SectionSpec
+    items: List[Mapping]
+    views: List[Tuple[QuestionView, ...]]
+
+
+class SectionResult(NamedTuple):
+    skill: str
+    points: float
+    max_points: float
+    details: Tuple[str, ...]      # markdown, one entry per question / prompt / word
+
+    @property
+    def score(self) -> float:
+        return self.points / self.max_points if self.max_points else 0.0
+
+    @property
+    def self_assessed(self) -> bool:
+        return self.skill not in AUTO_GRADED_SKILLS
+
+
+class ExamResult(NamedTuple):
+    paper: ExamPaper
+    sections: Tuple[SectionResult, ...]
+    total: float                  # 0..1, mean of the auto-graded section scores; decides ``passed``
+    passed: bool
+    late: bool                    # submitted after the deadline; answers were discarded
+
+
+def assemble_exam(content, level: str, rng: random.Random = random, now: Optional[float] = None) -> ExamPaper:
+    """Samples every section of the level's blueprint (index lookups only, no items are decoded)."""
+    ids: List[int] = []
+    counts: List[int] = []
+    for spec in EXAM_BLUEPRINT[level]:
+        section_ids = content.sample(level, spec.skill, spec.items, rng=rng)
+        ids.extend(section_ids)
+        counts.append(len(section_ids))
+    now = time.time() if now is None else now
+    minutes = sum(spec.minutes for spec in EXAM_BLUEPRINT[level])
+    return ExamPaper(level, make_selection(content, ids), tuple(counts), now, now + minutes * 60)
+
+
+def exam_sections(paper: ExamPaper) -> Optional[List[ExamSection]]:
+    """
+    Resolves the whole paper (items and question views) in one pass against
+    the content version it was assembled from; None if that version is gone.
+    """
+    content = content_for_version(paper.selection.version)
+    if content is None:
+        return None
+    items = content.resolve(paper.selection.ids)
+    views = item_views(content, paper.selection.ids)
+
+    sections, start = [], 0
+    for spec, count in zip(EXAM_BLUEPRINT[paper.level], paper.counts):
+        sections.append(ExamSection(spec, items[start:start + count], views[start:start + count]))
+        start += count
+    return sections
+
+
+# Widget keys of the exam form, prefixed so they never clash with the practice exercises
+def choice_key(view: QuestionView) -> str:
+    return f"exam_{view.key}"
+
+
+def text_key(item: Mapping) -> str:
+    return f"exam_{item['id']}_text"
+
+
+def spoken_key(item: Mapping) -> str:
+    return f"exam_{item['id']}_spoken"
+
+
+def _grade_choices(views: Sequence[Tuple[QuestionView, ...]], answers: Mapping) -> Tuple[float, float, List[str]]:
+    points, details = 0, []
+    questions = [view for question_views in views for view in question_views]
+    for view in questions:
+        selected = view.option_index.get(answers.get(choice_key(view)))
+        if selected is None:
+            details.append(f"⚪ {view.label}<br>_Not answered. Correct answer:_ **{view.options[view.correct]}**")
+        else:
+            points += selected == view.correct
+            details.append(view.feedback[selected])
+    return points, len(questions), details
+
+
+def grade_exam(paper: ExamPaper, sections: Sequence[ExamSection], answers: Mapping,
+               submitted_at: Optional[float] = None) -> ExamResult:
+    """Grades every section in one pass.  ``answers`` maps the form's widget keys to their values."""
+    submitted_at = time.time() if submitted_at is None else submitted_at
+    late = submitted_at > paper.deadline + SUBMIT_GRACE
+    if late:
+        answers = {}
+
+    results = []
+    for section in sections:
+        skill = section.spec.skill
+        if skill in ("reading", "listening"):
+            points, max_points, details = _grade_choices(section.views, answers)
+        elif skill == "writing":
+            target = MIN_WORDS[paper.level]
+            points, details = 0.0, []
+            for item in section.items:
+                words = len((answers.get(text_key(item)) or "").split())
+                points += min(1.0, words / target)
+                details.append(f"**{item['prompt']}**<br>{words} words (full marks from {target})")
+            max_points = len(section.items)
+        else:
+            spoken = [bool(answers.get(spoken_key(item))) for item in section.items]
+            points, max_points = sum(spoken), len(section.items)
+            details = [f"{'✅' if ok else '⚪'} **{item['word']}**" for item, ok in zip(section.items, spoken)]
+        results.append(SectionResult(skill, points, max_points, tuple(details)))
+
+    graded = [result.score for result in results if not result.self_assessed]
+    total = sum(graded) / len(graded) if graded else 0.0
+    return ExamResult(paper, tuple(results), total, total >= PASS_MARK, late)
@@ -0,0 +1,73 @@
+"""
+Exercise phase state machine and rerun accounting.
+
+Every exercise moves select -> answer -> graded and back to select on "Next
+Exercise".  Transitions are made in widget callbacks, which Streamlit runs
+before the script, so the run that follows a click already renders the new
+phase; no extra ``st.rerun()`` is needed to "catch up".
+
+``ExerciseFlow`` also counts the script runs spent on each exercise (from
+the run that shows it to the click on "Next Exercise"), including fragment
+runs that escalate to a full-app rerun, so tests can assert on reruns per
+completed exercise (tests/test_exercise_flow.py).
+"""
+
+from enum import Enum
+from typing import Dict
+
+
+class Phase(str, Enum):
+    SELECT = "select"   # no exercise drawn yet
+    ANSWER = "answer"   # exercise shown, collecting answers
+    GRADED = "graded"   # results shown
+
+
+TRANSITIONS = {
+    Phase.SELECT: (Phase.ANSWER,),
+    Phase.ANSWER: (Phase.GRADED, Phase.SELECT),  # back to select: exercise discarded (level change, content gone)
+    Phase.GRADED: (Phase.SELECT,),               # 'Next Exercise'
+}
+
+
+class ExerciseFlow:
+    """Phase of every exercise type of one session, plus run counters."""
+
+    def __init__(self):
+        self._phases: Dict[str, Phase] = {}
+        self._exercise_runs: Dict[str, int] = {}
+        self.runs = 0               # script runs that rendered an exercise panel
+        self.completed = 0          # exercises graded and left with 'Next Exercise'
+        self.completed_runs = 0     # runs spent on those exercises
+        self.score_revision = 0     # bumped on every score change
+        self.rendered_revision = 0  # score revision the header and sidebar were last rendered with
+
+    def phase(self, key: str) -> Phase:
+        return self._phases.get(key, Phase.SELECT)
+
+    def advance(self, key: str, phase: Phase) -> None:
+        """Moves an exercise to ``phase``; raises ValueError for a transition the machine doesn't allow."""
+        current = self.phase(key)
+        if phase not in TRANSITIONS[current]:
+            raise ValueError(f"{key}: cannot go from {current.value} to {phase.value}")
+        if current is Phase.GRADED:
+            self.completed += 1
+            self.completed_runs += self._exercise_runs.get(key, 0)
+        if phase is Phase.SELECT:
+            self._exercise_runs[key] = 0
+        self._phases[key] = phase
+
+    def reset(self, key: str) -> None:
+        """Returns an exercise to the select phase from wherever it is."""
+        if self.phase(key) is not Phase.SELECT:
+            self.advance(key, Phase.SELECT)
+
+    def record_run(self, key: str) -> None:
+        self.runs += 1
+        self._exercise_runs[key] = self._exercise_runs.get(key, 0) + 1
+
+    def score_changed(self) -> None:
+        self.score_revision += 1
+
+    @property
+    def runs_per_exercise(self) -> float:
+        return self.completed_runs / self.completed if self.completed else 0.0
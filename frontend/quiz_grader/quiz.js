@@ -0,0 +1,135 @@
+// Browser-graded multiple-choice quiz (see quiz_grader.py).
+// Every click is graded locally; one result record is posted to Python at the end.
+
+function sendMessage(type, data) {
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+}
+
+function setFrameHeight() {
+    sendMessage('streamlit:setFrameHeight', { height: document.body.scrollHeight });
+}
+
+const elements = {
+    status: document.getElementById('status'),
+    questions: document.getElementById('questions'),
+    prev: document.getElementById('prev'),
+    next: document.getElementById('next'),
+    page: document.getElementById('page'),
+    submit: document.getElementById('submit'),
+};
+
+let quiz = null;       // {quiz, questions, prompt, page_size} from the last render
+let answers = [];      // chosen option index per question, null while unanswered
+let page = 0;
+
+// Answers survive the iframe being re-created (e.g. when the page layout changes)
+function storageKey() {
+    return 'quiz_grader:' + quiz.quiz;
+}
+
+function saveState() {
+    try {
+        sessionStorage.setItem(storageKey(), JSON.stringify({ answers: answers, page: page }));
+    } catch (e) { /* storage disabled: answers just live in this frame */ }
+}
+
+function restoreState() {
+    answers = quiz.questions.map(() => null);
+    page = 0;
+    try {
+        const saved = JSON.parse(sessionStorage.getItem(storageKey()) || 'null');
+        if (saved && saved.answers.length === answers.length) {
+            answers = saved.answers;
+            page = saved.page;
+        }
+    } catch (e) { /* ignore */ }
+}
+
+function pages() {
+    return Math.max(1, Math.ceil(quiz.questions.length / quiz.page_size));
+}
+
+function render() {
+    const answered = answers.filter(a => a !== null).length;
+    const correct = answers.filter((a, i) => a === quiz.questions[i].correct).length;
+    elements.status.textContent = answered + ' / ' + answers.length + ' answered · ' + correct + ' correct';
+
+    elements.questions.replaceChildren();
+    const start = page * quiz.page_size;
+    const end = Math.min(start + quiz.page_size, quiz.questions.length);
+    for (let i = start; i < end; i++) {
+        const question = quiz.questions[i];
+        const block = document.createElement('div');
+        block.className = 'question';
+
+        const label = document.createElement('div');
+        label.className = 'label';
+        label.textContent = (i + 1) + '. ' + question.label;
+        const prompt = document.createElement('div');
+        prompt.className = 'prompt';
+        prompt.textContent = quiz.prompt;
+        const options = document.createElement('div');
+        options.className = 'options';
+
+        question.options.forEach((option, j) => {
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.textContent = option;
+            if (answers[i] !== null) {
+                button.disabled = true;
+                if (j === question.correct) {
+                    button.classList.add('correct');
+                } else if (j === answers[i]) {
+                    button.classList.add('wrong');
+                }
+            }
+            button.addEventListener('click', () => {
+                answers[i] = j;
+                saveState();
+                render();
+            });
+            options.appendChild(button);
+        });
+
+        block.append(label, prompt, options);
+        elements.questions.appendChild(block);
+    }
+
+    const total = pages();
+    elements.prev.style.visibility = total > 1 ? 'visible' : 'hidden';
+    elements.next.style.visibility = total > 1 ? 'visible' : 'hidden';
+    elements.prev.disabled = page === 0;
+    elements.next.disabled = page === total - 1;
+    elements.page.textContent = total > 1 ? 'Page ' + (page + 1) + ' of ' + total : '';
+    elements.submit.disabled = answered < answers.length;
+    setFrameHeight();
+}
+
+elements.prev.addEventListener('click', () => { page -= 1; saveState(); render(); });
+elements.next.addEventListener('click', () => { page += 1; saveState(); render(); });
+elements.submit.addEventListener('click', () => {
+    elements.submit.disabled = true;
+    try {
+        sessionStorage.removeItem(storageKey());
+    } catch (e) { /* ignore */ }
+    // sent_at makes every submission a new value, even for a repeated (seeded) quiz
+    sendMessage('streamlit:setComponentValue', {
+        value: { quiz: quiz.quiz, answers: answers, sent_at: Date.now() },
+        dataType: 'json',
+    });
+});
+
+window.addEventListener('message', event => {
+    if (event.data.type !== 'streamlit:render') {
+        return;
+    }
+    const args = event.data.args;
+    if (!quiz || quiz.quiz !== args.quiz || quiz.page_size !== args.page_size) {
+        quiz = args;
+        restoreState();
+        page = Math.min(page, pages() - 1);
+    }
+    render();
+});
+
+sendMessage('streamlit:componentReady', { apiVersion: 1 });
@@ -0,0 +1,93 @@
+// Browser text-to-speech button, loaded once per session and cached (see tts_player.py).
+// Speaks with the browser's native SpeechSynthesis API.
+
+let germanVoice = null;
+
+// Ensure voices are loaded and find the German voice
+function loadAndFindVoice() {
+    const voices = window.speechSynthesis.getVoices();
+    germanVoice = voices.find(voice => voice.lang.startsWith('de'));
+    return !!germanVoice;
+}
+
+if ('speechSynthesis' in window) {
+    window.speechSynthesis.onvoiceschanged = loadAndFindVoice;
+    loadAndFindVoice();
+}
+
+function speakGerman(text, rate) {
+    if (!('speechSynthesis' in window)) {
+        alert('Your browser does not support native text-to-speech.');
+        return;
+    }
+    if (!germanVoice) {
+        loadAndFindVoice();
+    }
+
+    const utterance = new SpeechSynthesisUtterance(text);
+    if (germanVoice) {
+        utterance.voice = germanVoice;
+    } else {
+        utterance.lang = 'de-DE';
+    }
+    utterance.pitch = 1.0;
+    utterance.rate = rate || 0.9; // Playback speed chosen in the app; slightly slower by default
+
+    // Stop any current speaking and start the new one
+    window.speechSynthesis.cancel();
+    window.speechSynthesis.speak(utterance);
+}
+
+// Text files are named by the hash of their text, so the browser may keep them as long as it likes
+const texts = {};
+let loadedText = null;
+function loadText(url) {
+    if (!texts[url]) {
+        texts[url] = fetch(url, { cache: 'force-cache' }).then(response => response.text());
+    }
+    return texts[url];
+}
+
+// --- Streamlit component protocol (postMessage, no build step) ---
+
+function sendMessage(type, data) {
+    window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+}
+
+const button = document.getElementById('play');
+let current = null;
+
+button.addEventListener('click', () => {
+    if (!current) {
+        return;
+    }
+    if (current.text !== null && current.text !== undefined) {
+        speakGerman(current.text, current.rate);
+    } else if (loadedText !== null) {
+        // Speak synchronously: some browsers only allow speech inside the click handler itself
+        speakGerman(loadedText, current.rate);
+    } else {
+        const rate = current.rate;
+        loadText(current.text_url).then(text => speakGerman(text, rate));
+    }
+});
+
+window.addEventListener('message', event => {
+    if (event.data.type !== 'streamlit:render') {
+        return;
+    }
+    if (current && current.text_url !== event.data.args.text_url) {
+        loadedText = null;
+    }
+    current = event.data.args;
+    button.textContent = current.label;
+    button.disabled = !!event.data.disabled;
+    if (current.text_url) {
+        // Prefetch, so the first click speaks at once
+        const url = current.text_url;
+        loadText(url).then(text => { if (current.text_url === url) { loadedText = text; } });
+    }
+    sendMessage('streamlit:setFrameHeight', { height: document.body.scrollHeight });
+});
+
+sendMessage('streamlit:componentReady', { apiVersion: 1 });
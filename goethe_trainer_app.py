@@ -3,6 +3,7 @@ import random
 import time
 from typing import Dict, List
 import pandas as pd
+from content_pack import load_content
 
 # Configure Streamlit page
 st.set_page_config(
@@ -23,256 +24,9 @@ EXERCISE_TYPES = {
     "Wortschatz (Vocabulary)": "vocabulary",
 }
 
-# Base content structured by CEFR level and skill (simulating a database)
-# A1 Reading, Listening, and Writing sections now meet the 30+ item requirement pool size.
-CONTENT_DB = {
-    "A1": {
-        "reading": [
-            {"id": "A1_R1", "text": "Hallo! Ich heiße Anna. Ich wohne in München. Ich bin Studentin. Mein Hobby ist Bücher lesen.", "questions": [{"q": "Wo wohnt Anna?", "options": ["Berlin", "München", "Köln"], "correct": 1}, {"q": "Was ist Anna?", "options": ["Lehrerin", "Studentin", "Ärztin"], "correct": 1}, {"q": "Was ist ihr Hobby?", "options": ["Musik", "Lesen", "Kochen"], "correct": 1}]},
-            {"id": "A1_R2", "text": "Das ist ein Tisch. Der Tisch ist groß und blau. Er steht im Wohnzimmer. Neben dem Tisch ist ein Stuhl.", "questions": [{"q": "Welche Farbe hat der Tisch?", "options": ["rot", "blau", "grün"], "correct": 1}, {"q": "Wo steht der Tisch?", "options": ["Küche", "Schlafzimmer", "Wohnzimmer"], "correct": 2}, {"q": "Was ist neben dem Tisch?", "options": ["Lampe", "Stuhl", "Sofa"], "correct": 1}]},
-            {"id": "A1_R3", "text": "Mein Name ist Max. Ich arbeite als Koch in einem kleinen Restaurant. Ich koche gern Pizza. Am Wochenende gehe ich wandern.", "questions": [{"q": "Was ist Max's Beruf?", "options": ["Bäcker", "Koch", "Kellner"], "correct": 1}, {"q": "Was kocht er gern?", "options": ["Pasta", "Suppe", "Pizza"], "correct": 2}, {"q": "Was macht er am Wochenende?", "options": ["wandern", "Kino", "schlafen"], "correct": 0}]},
-            {"id": "A1_R4", "text": "Wir fahren am Samstag in die Berge. Es wird kalt, also brauchen wir warme Kleidung und gute Schuhe. Wir bleiben dort drei Tage.", "questions": [{"q": "Wann fahren sie weg?", "options": ["Sonntag", "Samstag", "Freitag"], "correct": 1}, {"q": "Was brauchen sie?", "options": ["nur Schuhe", "warme Kleidung und Schuhe", "nichts"], "correct": 1}, {"q": "Wie lange bleiben sie?", "options": ["zwei Tage", "drei Tage", "eine Woche"], "correct": 1}]},
-            {"id": "A1_R5", "text": "Morgen hat mein Bruder Geburtstag. Er wird 8 Jahre alt. Wir machen eine Party mit Kuchen und Saft. Die Party beginnt um 15 Uhr.", "questions": [{"q": "Wer hat Geburtstag?", "options": ["Ich", "Der Bruder", "Die Schwester"], "correct": 1}, {"q": "Was gibt es auf der Party?", "options": ["Kaffee", "Kuchen und Saft", "Pizza"], "correct": 1}, {"q": "Wann beginnt die Party?", "options": ["13 Uhr", "15 Uhr", "17 Uhr"], "correct": 1}]},
-            {"id": "A1_R6", "text": "Ich möchte einen Flug nach Rom buchen. Die Reise dauert drei Stunden. Ich muss am Flughafen um 10 Uhr sein. Der Flug kostet 120 Euro.", "questions": [{"q": "Wohin möchte ich fliegen?", "options": ["Paris", "London", "Rom"], "correct": 2}, {"q": "Um wie viel Uhr muss ich am Flughafen sein?", "options": ["09:00", "10:00", "11:00"], "correct": 1}, {"q": "Wie viel kostet der Flug?", "options": ["100 Euro", "120 Euro", "150 Euro"], "correct": 1}]},
-            {"id": "A1_R7", "text": "Meine Mutter kauft heute im Supermarkt Obst und Gemüse. Sie braucht Äpfel, Bananen und Kartoffeln für das Abendessen. Sie fährt mit dem Auto.", "questions": [{"q": "Was kauft die Mutter?", "options": ["Käse", "Fleisch", "Obst und Gemüse"], "correct": 2}, {"q": "Was braucht sie für das Abendessen?", "options": ["Brot", "Nudeln", "Kartoffeln"], "correct": 2}, {"q": "Wie fährt sie zum Supermarkt?", "options": ["mit Bus", "mit Auto", "zu Fuß"], "correct": 1}]},
-            {"id": "A1_R8", "text": "Der Zug fährt pünktlich um 15:30 Uhr ab. Bitte seien Sie zehn Minuten vorher am Gleis 5. Fahrkarten gibt es am Schalter.", "questions": [{"q": "Wann fährt der Zug ab?", "options": ["14:30 Uhr", "15:30 Uhr", "16:00 Uhr"], "correct": 1}, {"q": "An welchem Gleis fährt der Zug ab?", "options": ["Gleis 4", "Gleis 5", "Gleis 6"], "correct": 1}, {"q": "Wo kauft man die Fahrkarten?", "options": ["Im Zug", "Am Schalter", "Online"], "correct": 1}]},
-            {"id": "A1_R9", "text": "Ich kann heute Abend nicht ins Kino gehen. Ich muss zu Hause bleiben, weil ich krank bin und Medizin nehmen muss. Meine Freundin geht allein.", "questions": [{"q": "Warum kann ich nicht ins Kino gehen?", "options": ["kein Geld", "krank", "keine Zeit"], "correct": 1}, {"q": "Was muss ich nehmen?", "options": ["Vitamine", "Medizin", "Kaffee"], "correct": 1}, {"q": "Wer geht ins Kino?", "options": ["Ich", "Die Freundin", "Niemand"], "correct": 1}]},
-            {"id": "A1_R10", "text": "Am Wochenende besuchen wir einen Freund, der in Hamburg lebt. Wir bleiben dort zwei Nächte und sehen uns die Stadt an. Wir fahren mit dem Zug.", "questions": [{"q": "Wo lebt der Freund?", "options": ["Berlin", "Köln", "Hamburg"], "correct": 2}, {"q": "Wie lange bleiben sie dort?", "options": ["eine Nacht", "zwei Nächte", "eine Woche"], "correct": 1}, {"q": "Wie reisen sie?", "options": ["Mit dem Auto", "Mit dem Zug", "Mit dem Flugzeug"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "A1_G1", "q": "Er __ aus der Schweiz.", "options": ["komme", "kommt", "kommen"], "correct": 1},
-            {"id": "A1_G2", "q": "Das ist __ Auto.", "options": ["eine", "ein", "einer"], "correct": 1},
-            {"id": "A1_G3", "q": "Wie __ du?", "options": ["heißen", "heißt", "bin"], "correct": 1},
-            {"id": "A1_G4", "q": "Wir __ in Berlin.", "options": ["wohnst", "wohne", "wohnen"], "correct": 2},
-            {"id": "A1_G5", "q": "__ du eine Katze?", "options": ["Bist", "Hast", "Habe"], "correct": 1},
-            {"id": "A1_G6", "q": "Ich __ fünfzig Jahre alt.", "options": ["bin", "ist", "sind"], "correct": 0},
-            {"id": "A1_G7", "q": "Ist das __ Tisch?", "options": ["ein", "einen", "eine"], "correct": 0},
-            {"id": "A1_G8", "q": "Sie __ gern Kaffee.", "options": ["trinkt", "trinken", "trinke"], "correct": 0},
-            {"id": "A1_G9", "q": "Der Mann __ müde.", "options": ["bin", "ist", "sind"], "correct": 1},
-            {"id": "A1_G10", "q": "Kaufen Sie __ Brot.", "options": ["das", "die", "der"], "correct": 0},
-            {"id": "A1_G11", "q": "Ihr __ im Garten.", "options": ["spielt", "spielen", "spiele"], "correct": 0},
-            {"id": "A1_G12", "q": "Woher __ Sie?", "options": ["komme", "kommst", "kommen"], "correct": 2},
-            {"id": "A1_G13", "q": "Das ist __ Haus.", "options": ["ein", "eine", "einen"], "correct": 0},
-            {"id": "A1_G14", "q": "Hast du __ Bruder?", "options": ["ein", "einen", "eine"], "correct": 1},
-            {"id": "A1_G15", "q": "Ich __ Hunger.", "options": ["bin", "habe", "ist"], "correct": 1},
-            {"id": "A1_G16", "q": "Wir __ glücklich.", "options": ["sind", "ist", "bin"], "correct": 0},
-            {"id": "A1_G17", "q": "Das ist __ Frau.", "options": ["der", "die", "das"], "correct": 1},
-            {"id": "A1_G18", "q": "__ ist dein Name?", "options": ["Wer", "Wo", "Was"], "correct": 2},
-            {"id": "A1_G19", "q": "Ich spreche __ gut Deutsch.", "options": ["nicht", "kein", "keine"], "correct": 0},
-            {"id": "A1_G20", "q": "Er arbeitet __ München.", "options": ["nach", "in", "aus"], "correct": 1},
-            {"id": "A1_G21", "q": "Sie __ eine Schwester.", "options": ["hat", "ist", "habe"], "correct": 0},
-            {"id": "A1_G22", "q": "Das sind __ Kinder.", "options": ["eine", "ein", "keine"], "correct": 2},
-            {"id": "A1_G23", "q": "Kommst du __ mir?", "options": ["auf", "zu", "von"], "correct": 1},
-            {"id": "A1_G24", "q": "Das Buch liegt __ dem Tisch.", "options": ["in", "auf", "unter"], "correct": 1},
-            {"id": "A1_G25", "q": "Ich kaufe __ Apfel.", "options": ["der", "den", "das"], "correct": 1},
-            {"id": "A1_G26", "q": "__ ist das da?", "options": ["Was", "Wann", "Wer"], "correct": 2},
-            {"id": "A1_G27", "q": "Ich mag __ Schokolade.", "options": ["keine", "kein", "keinen"], "correct": 0},
-            {"id": "A1_G28", "q": "Wir gehen __ Hause.", "options": ["im", "zu", "am"], "correct": 1},
-            {"id": "A1_G29", "q": "__ Uhr ist es?", "options": ["Was", "Wie", "Wann"], "correct": 1},
-            {"id": "A1_G30", "q": "Gehst du __ Supermarkt?", "options": ["in den", "zu dem", "am"], "correct": 0},
-            {"id": "A1_G31", "q": "Ich esse __ Käse.", "options": ["einen", "ein", "eine"], "correct": 0},
-            {"id": "A1_G32", "q": "Ich schenke __ Frau Blumen.", "options": ["der", "die", "den"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "A1_V1", "german": "der Hund", "english": "dog", "options": ["cat", "dog", "house"], "correct": 1},
-            {"id": "A1_V2", "german": "die Milch", "english": "milk", "options": ["water", "juice", "milk"], "correct": 2},
-            {"id": "A1_V3", "german": "der Baum", "english": "tree", "options": ["flower", "tree", "grass"], "correct": 1},
-            {"id": "A1_V4", "german": "trinken", "english": "to drink", "options": ["to eat", "to sleep", "to drink"], "correct": 2},
-            {"id": "A1_V5", "german": "groß", "english": "big", "options": ["small", "big", "fast"], "correct": 1},
-            {"id": "A1_V6", "german": "kalt", "english": "cold", "options": ["warm", "cold", "hot"], "correct": 1},
-            {"id": "A1_V7", "german": "sprechen", "english": "to speak", "options": ["to write", "to read", "to speak"], "correct": 2},
-            {"id": "A1_V8", "german": "der Stuhl", "english": "chair", "options": ["table", "chair", "bed"], "correct": 1},
-            {"id": "A1_V9", "german": "die Zeitung", "english": "newspaper", "options": ["book", "magazine", "newspaper"], "correct": 2},
-            {"id": "A1_V10", "german": "machen", "english": "to do/make", "options": ["to go", "to do/make", "to see"], "correct": 1},
-            {"id": "A1_V11", "german": "heute", "english": "today", "options": ["yesterday", "tomorrow", "today"], "correct": 2},
-            {"id": "A1_V12", "german": "die Küche", "english": "kitchen", "options": ["bathroom", "bedroom", "kitchen"], "correct": 2},
-            {"id": "A1_V13", "german": "fragen", "english": "to ask", "options": ["to answer", "to listen", "to ask"], "correct": 2},
-            {"id": "A1_V14", "german": "klein", "english": "small", "options": ["small", "big", "new"], "correct": 0},
-            {"id": "A1_V15", "german": "die Wohnung", "english": "apartment", "options": ["house", "car", "apartment"], "correct": 2},
-            {"id": "A1_V16", "german": "rot", "english": "red", "options": ["blue", "red", "yellow"], "correct": 1},
-            {"id": "A1_V17", "german": "der Schlüssel", "english": "key", "options": ["money", "key", "phone"], "correct": 1},
-            {"id": "A1_V18", "german": "fahren", "english": "to drive/go", "options": ["to walk", "to sleep", "to drive/go"], "correct": 2},
-            {"id": "A1_V19", "german": "die Familie", "english": "family", "options": ["friends", "colleagues", "family"], "correct": 2},
-            {"id": "A1_V20", "german": "gut", "english": "good", "options": ["bad", "good", "fast"], "correct": 1},
-            {"id": "A1_V21", "german": "der Kaffee", "english": "coffee", "options": ["tea", "water", "coffee"], "correct": 2},
-            {"id": "A1_V22", "german": "lesen", "english": "to read", "options": ["to write", "to read", "to sing"], "correct": 1},
-            {"id": "A1_V23", "german": "schlafen", "english": "to sleep", "options": ["to eat", "to wake up", "to sleep"], "correct": 2},
-            {"id": "A1_V24", "german": "die Schule", "english": "school", "options": ["work", "school", "university"], "correct": 1},
-            {"id": "A1_V25", "german": "der Tisch", "english": "table", "options": ["chair", "table", "lamp"], "correct": 1},
-            {"id": "A1_V26", "german": "wohnen", "english": "to live", "options": ["to work", "to eat", "to live"], "correct": 2},
-            {"id": "A1_V27", "german": "das Zimmer", "english": "room", "options": ["house", "room", "garden"], "correct": 1},
-            {"id": "A1_V28", "german": "zehn", "english": "ten", "options": ["five", "ten", "twenty"], "correct": 1},
-            {"id": "A1_V29", "german": "arbeiten", "english": "to work", "options": ["to work", "to relax", "to travel"], "correct": 0},
-            {"id": "A1_V30", "german": "gehen", "english": "to go/walk", "options": ["to sit", "to go/walk", "to run"], "correct": 1},
-            {"id": "A1_V31", "german": "essen", "english": "to eat", "options": ["to drink", "to sleep", "to eat"], "correct": 2},
-            {"id": "A1_V32", "german": "das Kind", "english": "child", "options": ["adult", "child", "friend"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "A1_P1", "word": "tschüs", "meaning": "bye"},
-            {"id": "A1_P2", "word": "neun", "meaning": "nine"},
-            {"id": "A1_P3", "word": "fünf", "meaning": "five"},
-            {"id": "A1_P4", "word": "ich", "meaning": "I"},
-            {"id": "A1_P5", "word": "gern", "meaning": "gladly"},
-            {"id": "A1_P6", "word": "Mädchen", "meaning": "girl"},
-            {"id": "A1_P7", "word": "Haus", "meaning": "house"},
-            {"id": "A1_P8", "word": "Auto", "meaning": "car"},
-            {"id": "A1_P9", "word": "Straße", "meaning": "street"},
-            {"id": "A1_P10", "word": "Kaffee", "meaning": "coffee"},
-            {"id": "A1_P11", "word": "Apfel", "meaning": "apple"},
-            {"id": "A1_P12", "word": "Brot", "meaning": "bread"},
-            {"id": "A1_P13", "word": "Eins", "meaning": "one"},
-            {"id": "A1_P14", "word": "Zwei", "meaning": "two"},
-            {"id": "A1_P15", "word": "Drei", "meaning": "three"},
-            {"id": "A1_P16", "word": "Vier", "meaning": "four"},
-            {"id": "A1_P17", "word": "Sechs", "meaning": "six"},
-            {"id": "A1_P18", "word": "Sieben", "meaning": "seven"},
-            {"id": "A1_P19", "word": "Acht", "meaning": "eight"},
-            {"id": "A1_P20", "word": "Zehn", "meaning": "ten"},
-            {"id": "A1_P21", "word": "Katze", "meaning": "cat"},
-            {"id": "A1_P22", "word": "Tasse", "meaning": "cup"},
-            {"id": "A1_P23", "word": "Milch", "meaning": "milk"},
-            {"id": "A1_P24", "word": "Buch", "meaning": "book"},
-            {"id": "A1_P25", "word": "Wohnung", "meaning": "apartment"},
-            {"id": "A1_P26", "word": "Stuhl", "meaning": "chair"},
-            {"id": "A1_P27", "word": "Tisch", "meaning": "table"},
-            {"id": "A1_P28", "word": "Zeitung", "meaning": "newspaper"},
-            {"id": "A1_P29", "word": "Spielen", "meaning": "to play"},
-            {"id": "A1_P30", "word": "Arbeiten", "meaning": "to work"},
-        ],
-        "listening": [
-            {"id": "A1_L1", "transcript": "Guten Tag. Wie heißen Sie? - Ich heiße Frau Schmidt.", "q": "Was hört die Person?", "options": ["Wie spät ist es?", "Wie heißen Sie?", "Wo wohnen Sie?"], "correct": 1},
-            {"id": "A1_L2", "transcript": "Ist das dein Fahrrad? - Nein, das ist das Auto von meinem Bruder.", "q": "Wem gehört das Auto?", "options": ["Der Frau", "Dem Bruder", "Dem Mann"], "correct": 1},
-            {"id": "A1_L3", "transcript": "Woher kommen Sie? - Ich komme aus Italien.", "q": "Woher kommt die Person?", "options": ["Spanien", "Frankreich", "Italien"], "correct": 2},
-            {"id": "A1_L4", "transcript": "Ich hätte gern eine Tasse Kaffee mit Milch, bitte.", "q": "Was bestellt die Person?", "options": ["Tee", "Kaffee", "Wasser"], "correct": 1},
-            {"id": "A1_L5", "transcript": "Es ist vierzehn Uhr.", "q": "Wie spät ist es?", "options": ["12:00 Uhr", "14:00 Uhr", "16:00 Uhr"], "correct": 1},
-            {"id": "A1_L6", "transcript": "Wie ist Ihre Telefonnummer? - Null-fünf-drei-zwei-eins.", "q": "Was fragt die Person?", "options": ["Die Adresse", "Die Nummer", "Den Namen"], "correct": 1},
-            {"id": "A1_L7", "transcript": "Entschuldigung, wo ist die Toilette? - Im ersten Stock links.", "q": "Wo ist die Toilette?", "options": ["rechts", "im ersten Stock", "im Erdgeschoss"], "correct": 1},
-            {"id": "A1_L8", "transcript": "Ich brauche ein Ticket nach Hamburg. - Einfache Fahrt oder hin und zurück?", "q": "Was möchte die Person kaufen?", "options": ["Essen", "Ein Buch", "Ein Ticket"], "correct": 2},
-            {"id": "A1_L9", "transcript": "Haben Sie ein Zimmer frei? - Ja, ein Doppelzimmer mit Blick auf den See.", "q": "Welches Zimmer ist frei?", "options": ["Einzelzimmer", "Doppelzimmer", "Dreibettzimmer"], "correct": 1},
-            {"id": "A1_L10", "transcript": "Können Sie das bitte wiederholen? - Gern, es ist sehr wichtig.", "q": "Was soll die andere Person tun?", "options": ["langsamer sprechen", "wiederholen", "stoppen"], "correct": 1},
-            # Expanded listening scenarios
-            {"id": "A1_L11", "transcript": "Ich wohne in der Schillerstraße 12. Die Miete ist 500 Euro.", "q": "Wie hoch ist die Miete?", "options": ["400 Euro", "500 Euro", "600 Euro"], "correct": 1},
-            {"id": "A1_L12", "transcript": "Mein Mann arbeitet als Arzt im Krankenhaus. Er arbeitet lange.", "q": "Was macht der Mann beruflich?", "options": ["Lehrer", "Polizist", "Arzt"], "correct": 2},
-            {"id": "A1_L13", "transcript": "Wir essen am Abend Brot und Käse.", "q": "Was essen sie am Abend?", "options": ["Reis und Fisch", "Brot und Käse", "Pizza"], "correct": 1},
-            {"id": "A1_L14", "transcript": "Der Bus fährt nur bis 20 Uhr.", "q": "Wie lange fährt der Bus?", "options": ["bis 21 Uhr", "bis 20 Uhr", "bis Mitternacht"], "correct": 1},
-            {"id": "A1_L15", "transcript": "Ich habe zwei Kinder, einen Sohn und eine Tochter.", "q": "Wie viele Kinder hat die Person?", "options": ["eins", "zwei", "drei"], "correct": 1},
-        ],
-        "writing": [
-            {"id": "A1_W1", "prompt": "Schreiben Sie 3 Sätze über Ihre Hobbys."},
-            {"id": "A1_W2", "prompt": "Stellen Sie sich vor (Name, Alter, Beruf)."},
-            {"id": "A1_W3", "prompt": "Beschreiben Sie kurz, was Sie heute essen."},
-            {"id": "A1_W4", "prompt": "Schreiben Sie einen kurzen Dialog (3 Sätze) im Café."},
-            {"id": "A1_W5", "prompt": "Beschreiben Sie das Wetter in Ihrer Stadt heute."},
-            {"id": "A1_W6", "prompt": "Schreiben Sie 4 Dinge, die Sie in Ihrer Wohnung haben."},
-            {"id": "A1_W7", "prompt": "Schreiben Sie einen Gruß an einen Freund/eine Freundin."},
-            {"id": "A1_W8", "prompt": "Schreiben Sie die Zahlen von 1 bis 10 in Worten."},
-            {"id": "A1_W9", "prompt": "Schreiben Sie einen kurzen Satz mit 'Ich habe'. (z.B. Ich habe Hunger.)"},
-            {"id": "A1_W10", "prompt": "Schreiben Sie einen kurzen Satz mit 'Ich bin'. (z.B. Ich bin Student.)"},
-            {"id": "A1_W11", "prompt": "Schreiben Sie 3 Sätze über Ihre Familie."},
-            {"id": "A1_W12", "prompt": "Füllen Sie ein Formular aus: Name, Vorname, Geburtsdatum, Wohnort."},
-            {"id": "A1_W13", "prompt": "Schreiben Sie, was Sie gestern Abend gemacht haben."},
-            {"id": "A1_W14", "prompt": "Schreiben Sie eine Entschuldigung (3 Sätze), warum Sie zu spät sind."},
-            {"id": "A1_W15", "prompt": "Schreiben Sie, was Sie in der Küche haben."},
-            {"id": "A1_W16", "prompt": "Schreiben Sie 5 Sätze über Ihre tägliche Routine."},
-            {"id": "A1_W17", "prompt": "Schreiben Sie 3 Sätze über Ihren Lieblingssport."},
-            {"id": "A1_W18", "prompt": "Schreiben Sie, was Sie am Wochenende machen möchten."},
-            {"id": "A1_W19", "prompt": "Schreiben Sie eine kurze Einladung an einen Freund."},
-            {"id": "A1_W20", "prompt": "Beschreiben Sie Ihr bestes Kleidungsstück (Farbe, Größe)."},
-            {"id": "A1_W21", "prompt": "Schreiben Sie 4 Fragen an einen neuen Nachbarn."},
-            {"id": "A1_W22", "prompt": "Schreiben Sie einen kurzen Dankesbrief."},
-            {"id": "A1_W23", "prompt": "Schreiben Sie 3 Dinge, die Sie nicht mögen."},
-            {"id": "A1_W24", "prompt": "Schreiben Sie, was Sie in Ihrer Tasche/Ihrem Rucksack haben."},
-            {"id": "A1_W25", "prompt": "Schreiben Sie die Uhrzeit auf Deutsch (z.B. 10:45 Uhr)."},
-            {"id": "A1_W26", "prompt": "Schreiben Sie einen kurzen Satz mit dem Verb 'haben' (Perfekt)."},
-            {"id": "A1_W27", "prompt": "Schreiben Sie 3 Sätze, wo Ihre Freunde wohnen."},
-            {"id": "A1_W28", "prompt": "Schreiben Sie einen kurzen Wunsch (z.B. Ich wünsche dir alles Gute)."},
-            {"id": "A1_W29", "prompt": "Schreiben Sie, wie Sie zur Arbeit/Uni kommen."},
-            {"id": "A1_W30", "prompt": "Schreiben Sie einen Satz mit 'weil' (Begründung)."},
-        ]
-    },
-    "A2": {
-        "reading": [
-            {"id": "A2_R1", "text": "Ich habe gestern meine Tante im Krankenhaus besucht. Sie hat mir erzählt, dass sie am Wochenende wieder nach Hause darf. Das ist sehr gut!", "questions": [{"q": "Wo war die Tante?", "options": ["im Park", "im Krankenhaus", "im Kino"], "correct": 1}, {"q": "Wann darf sie nach Hause?", "options": ["morgen", "am Wochenende", "nächste Woche"], "correct": 1}]},
-            {"id": "A2_R2", "text": "Wir suchen eine neue Wohnung. Sie soll drei Zimmer und einen Balkon haben. Die Miete darf nicht über 900 Euro liegen.", "questions": [{"q": "Wie viele Zimmer soll die Wohnung haben?", "options": ["zwei", "drei", "vier"], "correct": 1}, {"q": "Was ist die maximale Miete?", "options": ["800 Euro", "900 Euro", "1000 Euro"], "correct": 1}]},
-            {"id": "A2_R3", "text": "Bitte senden Sie uns Ihre Bewerbungsunterlagen bis zum 15. Mai. Wir benötigen Ihren Lebenslauf und ein Motivationsschreiben. Verspätete Bewerbungen können nicht berücksichtigt werden.", "questions": [{"q": "Welches Dokument wird benötigt?", "options": ["Foto", "Reisepass", "Motivationsschreiben"], "correct": 2}, {"q": "Wann ist die Frist?", "options": ["15. April", "15. Mai", "15. Juni"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "A2_G1", "q": "Obwohl es regnete, __ wir spazieren gegangen.", "options": ["sind", "haben", "waren"], "correct": 0},
-            {"id": "A2_G2", "q": "Der Mann, __ ich gestern getroffen habe, ist mein Nachbar.", "options": ["der", "den", "dem"], "correct": 1},
-            {"id": "A2_G3", "q": "Ich möchte, __ du mir hilfst.", "options": ["dass", "ob", "weil"], "correct": 0},
-            {"id": "A2_G4", "q": "Das gehört __ Frau.", "options": ["der", "die", "den"], "correct": 0},
-            {"id": "A2_G5", "q": "Sie hat __ einen neuen Computer gekauft.", "options": ["sich", "ihr", "ihm"], "correct": 0},
-            {"id": "A2_G6", "q": "Er spielt Fußball, obwohl __.", "options": ["muss er arbeiten", "er arbeiten muss", "er arbeiten kann"], "correct": 1},
-            {"id": "A2_G7", "q": "Ich fahre __ meinem Fahrrad.", "options": ["mit", "bei", "zu"], "correct": 0},
-            {"id": "A2_G8", "q": "Wir wissen nicht, __ er kommt.", "options": ["wann", "was", "wer"], "correct": 0},
-            {"id": "A2_G9", "q": "Möchtest du __ Tee oder Kaffee?", "options": ["einen", "ein", "eine"], "correct": 0},
-            {"id": "A2_G10", "q": "Ich gehe ohne __ Mantel spazieren.", "options": ["mein", "meinem", "meinen"], "correct": 2},
-        ],
-        "vocabulary": [
-            {"id": "A2_V1", "german": "der Fahrstuhl", "english": "elevator", "options": ["stairs", "door", "elevator"], "correct": 2},
-            {"id": "A2_V2", "german": "die Behörde", "english": "authority", "options": ["school", "market", "authority"], "correct": 2},
-            {"id": "A2_V3", "german": "unterschreiben", "english": "to sign", "options": ["to read", "to sign", "to print"], "correct": 1},
-            {"id": "A2_V4", "german": "pünktlich", "english": "punctual", "options": ["late", "fast", "punctual"], "correct": 2},
-            {"id": "A2_V5", "german": "die Nebenkosten", "english": "utility costs", "options": ["rent", "food costs", "utility costs"], "correct": 2},
-            {"id": "A2_V6", "german": "kennenlernen", "english": "to get to know", "options": ["to forget", "to meet", "to get to know"], "correct": 2},
-            {"id": "A2_V7", "german": "die Kündigung", "english": "termination", "options": ["contract", "promotion", "termination"], "correct": 2},
-            {"id": "A2_V8", "german": "die Verspätung", "english": "delay", "options": ["delay", "start", "speed"], "correct": 0},
-            {"id": "A2_V9", "german": "der Ratschlag", "english": "advice", "options": ["money", "advice", "gift"], "correct": 1},
-            {"id": "A2_V10", "german": "ausfüllen", "english": "to fill out", "options": ["to empty", "to close", "to fill out"], "correct": 2},
-        ],
-        "pronunciation": [
-            {"id": "A2_P1", "word": "Entschuldigung", "meaning": "excuse me"},
-        ],
-        "listening": [
-            {"id": "A2_L1", "transcript": "Können Sie mir bitte sagen, wie ich zum Bahnhof komme? - Gehen Sie geradeaus bis zur Ampel, dann links.", "q": "Was soll die Person an der Ampel tun?", "options": ["rechts gehen", "geradeaus gehen", "links gehen"], "correct": 2},
-        ],
-        "writing": [
-            {"id": "A2_W1", "prompt": "Schreiben Sie eine E-Mail an Ihren Freund über Ihren letzten Urlaub."},
-        ]
-    },
-    "B1": {
-        "reading": [
-            {"id": "B1_R1", "text": "Die Mülltrennung ist in Deutschland gesetzlich geregelt. Jeder Haushalt muss seinen Abfall sorgfältig trennen, um die Umwelt zu schützen. Wer dies nicht tut, riskiert hohe Bußgelder.", "questions": [{"q": "Was wird durch Mülltrennung geschützt?", "options": ["Die Nachbarn", "Die Wirtschaft", "Die Umwelt"], "correct": 2}]},
-        ],
-        "grammar": [
-            {"id": "B1_G1", "q": "Wenn ich mehr Geld hätte, __ ich ein neues Auto kaufen.", "options": ["werde", "kann", "würde"], "correct": 2},
-            {"id": "B1_G2", "q": "Das ist das Buch, __ ich dir empfohlen habe.", "options": ["das", "dem", "den", "der"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "B1_V1", "german": "die Nachhaltigkeit", "english": "sustainability", "options": ["growth", "sustainability", "efficiency"], "correct": 1},
-            {"id": "B1_V2", "german": "sich bemühen", "english": "to make an effort", "options": ["to forget", "to make an effort", "to complain"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "B1_P1", "word": "Gesellschaft", "meaning": "society"},
-        ],
-        "listening": [
-            {"id": "B1_L1", "transcript": "Der Gastronom sagte, dass er aufgrund steigender Lebensmittelpreise die Preise erhöhen müsse. Er hofft auf das Verständnis seiner Kunden.", "q": "Warum erhöht der Gastronom die Preise?", "options": ["wegen des Wetters", "wegen der Preise", "wegen der Lebensmittelpreise"], "correct": 2},
-        ],
-        "writing": [
-            {"id": "B1_W1", "prompt": "Diskutieren Sie die Vor- und Nachteile der Digitalisierung in der Schule. (ca. 80 Wörter)"},
-        ]
-    },
-    "B2": {
-        "reading": [
-            {"id": "B2_R1", "text": "Die kontroverse Debatte über Künstliche Intelligenz wirft ethische Fragen auf. Die Automatisierung vieler Prozesse könnte Arbeitsplätze vernichten, aber gleichzeitig zu enormen Produktivitätssteigerungen führen. Es ist ein Balanceakt.", "questions": [{"q": "Welche Art von Fragen wirft die KI-Debatte auf?", "options": ["politische", "ethische", "historische"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "B2_G1", "q": "Er sagte, __ er morgen kommen würde.", "options": ["dass", "ob", "falls"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "B2_V1", "german": "die Eindämmung", "english": "containment", "options": ["expansion", "containment", "development"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "B2_P1", "word": "Gewährleisten", "meaning": "to guarantee"},
-        ],
-        "listening": [
-            {"id": "B2_L1", "transcript": "Der Soziologe betonte, dass der demografische Wandel eine fundamentale Umgestaltung der sozialen Sicherungssysteme erfordert. Dies sei unvermeidlich.", "q": "Was erfordert der demografische Wandel?", "options": ["neue Steuern", "eine fundamentale Umgestaltung", "mehr Arbeitskräfte"], "correct": 1},
-        ],
-        "writing": [
-            {"id": "B2_W1", "prompt": "Analysieren Sie kritisch die Auswirkungen der Globalisierung auf die lokale Kultur. (ca. 100 Wörter)"},
-        ]
-    }
-}
+# Exercise content structured by CEFR level and skill, compiled from content/goethe_content.json.
+# The pack is loaded once per server process and shared read-only by every session.
+CONTENT_DB = load_content().levels
 
 
 class GoetheTrainer:
@@ -673,6 +427,8 @@ class GoetheTrainer:
         
         for i, item in enumerate(pron_items):
             with st.expander(f"Word {i+1}: **{item['word']}**"):
+                if item.get('ipa'):
+                    st.markdown(f"**IPA:** {item['ipa']}")
                 st.markdown(f"**Meaning:** {item['meaning']}")
                 st.info("🎤 Recording feature placeholder. Speak the word now.")
             
@@ -0,0 +1,306 @@
+"""
+Adaptive difficulty with item response theory (Rasch / 1PL model).
+
+Every graded question (reading, listening, grammar, vocabulary) is appended to
+a response log.  A batch job calibrates a difficulty ``b`` per question and an
+ability ``theta`` per learner from that log with vectorized Newton updates,
+and writes the difficulties to a JSON file:
+
+    python irt.py                       # data/responses.csv -> data/item_difficulty.json
+
+At runtime each learner's ability is re-estimated from their own answers, and
+``DifficultyIndex.select`` picks items whose difficulty is close to it: pools
+are sorted by difficulty once, so a selection is a binary search plus a small
+sample.  Items that were never calibrated count as difficulty 0.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+RESPONSE_LOG = Path(os.environ.get("GOETHE_RESPONSE_LOG", DATA_DIR / "responses.csv"))
+DIFFICULTY_PATH = Path(os.environ.get("GOETHE_DIFFICULTY_FILE", DATA_DIR / "item_difficulty.json"))
+
+# Skills whose questions have a single correct option and can be calibrated
+IRT_SKILLS = ("reading", "listening", "grammar", "vocabulary")
+
+# Standard-normal prior on abilities and difficulties keeps estimates finite for all-correct/all-wrong rows
+PRIOR_PRECISION = 1.0
+MAX_LOGIT = 4.0
+
+logger = logging.getLogger(__name__)
+
+
+def _expit(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def question_keys(item: Mapping) -> List[str]:
+    """Calibration keys of an item's questions: ``<id>#<n>`` for reading/listening, the id otherwise."""
+    if "questions" in item:
+        return [f"{item['id']}#{i}" for i in range(len(item["questions"]))]
+    return [item["id"]]
+
+
+# --- RESPONSE LOG ---
+
+_log_lock = threading.Lock()
+
+
+def log_responses(learner: str, keys: Sequence[str], correct: Sequence[bool], path: Path = RESPONSE_LOG) -> None:
+    """
+    Appends one row per answered question: timestamp, learner, question key, 0/1.
+    A read-only deployment just loses the log; grading never fails because of it.
+    """
+    now = int(time.time())
+    rows = [(now, learner, key, int(ok)) for key, ok in zip(keys, correct)]
+    try:
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerows(rows)
+    except OSError as e:
+        logger.warning("Could not append to response log %s: %s", path, e)
+
+
+def read_responses(path: Path = RESPONSE_LOG) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Loads the response log as parallel arrays.
+    Returns (learner_index, item_index, correct, learner_names, item_keys).
+    """
+    learners, items, correct = [], [], []
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if len(row) == 4:
+                learners.append(row[1])
+                items.append(row[2])
+                correct.append(row[3] == "1")
+    learner_names, learner_idx = np.unique(np.array(learners, dtype=object), return_inverse=True)
+    item_keys, item_idx = np.unique(np.array(items, dtype=object), return_inverse=True)
+    return learner_idx, item_idx, np.array(correct, dtype=np.float64), learner_names, item_keys
+
+
+# --- CALIBRATION ---
+
+def calibrate(learner_idx: np.ndarray, item_idx: np.ndarray, correct: np.ndarray,
+              n_learners: int, n_items: int, iterations: int = 100,
+              tol: float = 1e-5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Joint MAP estimate of Rasch abilities and difficulties,
+    P(correct) = 1 / (1 + exp(b_item - theta_learner)).
+
+    Alternates one Newton step for all abilities and one for all
+    difficulties; every step is a handful of array operations over the
+    responses plus bincount reductions, with no Python loop per response.
+    """
+    theta = np.zeros(n_learners)
+    b = np.zeros(n_items)
+    for _ in range(iterations):
+        p = _expit(theta[learner_idx] - b[item_idx])
+        residual, weight = correct - p, p * (1.0 - p)
+        theta_step = (np.bincount(learner_idx, residual, n_learners) - PRIOR_PRECISION * theta) / (
+            np.bincount(learner_idx, weight, n_learners) + PRIOR_PRECISION
+        )
+        theta = np.clip(theta + theta_step, -MAX_LOGIT, MAX_LOGIT)
+
+        p = _expit(theta[learner_idx] - b[item_idx])
+        residual, weight = correct - p, p * (1.0 - p)
+        b_step = (-np.bincount(item_idx, residual, n_items) - PRIOR_PRECISION * b) / (
+            np.bincount(item_idx, weight, n_items) + PRIOR_PRECISION
+        )
+        b = np.clip(b + b_step, -MAX_LOGIT, MAX_LOGIT)
+
+        if max(np.abs(theta_step).max(initial=0.0), np.abs(b_step).max(initial=0.0)) < tol:
+            break
+    return theta, b
+
+
+def write_difficulties(item_keys: Sequence[str], b: np.ndarray, counts: np.ndarray,
+                       path: Path = DIFFICULTY_PATH) -> None:
+    """Writes calibrated difficulties atomically so the app never reads a partial file."""
+    payload = {
+        "calibrated_at": int(time.time()),
+        "items": {key: {"b": round(float(d), 4), "n": int(n)} for key, d, n in zip(item_keys, b, counts)},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+_difficulties: Dict[str, float] = {}
+_difficulty_signature = None
+_difficulty_lock = threading.Lock()
+
+
+def load_difficulties(path: Path = DIFFICULTY_PATH) -> Dict[str, float]:
+    """Question key -> difficulty from the latest calibration (empty if none); re-read when the file changes."""
+    global _difficulties, _difficulty_signature
+    try:
+        st = path.stat()
+        signature = (st.st_ino, st.st_mtime_ns)
+    except FileNotFoundError:
+        signature = None
+    if signature != _difficulty_signature:
+        with _difficulty_lock:
+            if signature != _difficulty_signature:
+                if signature is None:
+                    _difficulties = {}
+                else:
+                    with open(path, encoding="utf-8") as f:
+                        _difficulties = {k: v["b"] for k, v in json.load(f)["items"].items()}
+                _difficulty_signature = signature
+    return _difficulties
+
+
+# --- PER-LEARNER ABILITY ---
+
+# Answers are aggregated per difficulty bin of this width (logits); far below the estimate's own error
+DIFFICULTY_STEP = 0.1
+_BIN_CENTRES = np.arange(-MAX_LOGIT, MAX_LOGIT + DIFFICULTY_STEP / 2, DIFFICULTY_STEP)
+
+
+class AbilityEstimate:
+    """
+    A learner's ability, re-estimated (MAP, Newton) from their answers to
+    calibrated questions.  Under the Rasch model only the number of answers
+    and correct answers per difficulty matter, so those are kept per
+    difficulty bin: the estimate stays a fixed size in session state and an
+    update costs the same after ten answers or ten thousand.
+    """
+
+    def __init__(self):
+        self.theta = 0.0
+        self._answered = np.zeros(len(_BIN_CENTRES), dtype=np.int32)
+        self._correct = np.zeros(len(_BIN_CENTRES), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return int(self._answered.sum())
+
+    def update(self, difficulties: Sequence[float], correct: Sequence[bool], iterations: int = 10) -> float:
+        bins = np.rint((np.clip(difficulties, -MAX_LOGIT, MAX_LOGIT) + MAX_LOGIT) / DIFFICULTY_STEP).astype(np.intp)
+        np.add.at(self._answered, bins, 1)
+        np.add.at(self._correct, bins, np.asarray(correct, dtype=np.int32))
+        used = np.flatnonzero(self._answered)
+        b, n, k = _BIN_CENTRES[used], self._answered[used], self._correct[used]
+        theta = self.theta
+        for _ in range(iterations):
+            p = _expit(theta - b)
+            step = (np.sum(k - n * p) - PRIOR_PRECISION * theta) / (np.sum(n * p * (1.0 - p)) + PRIOR_PRECISION)
+            theta = float(np.clip(theta + step, -MAX_LOGIT, MAX_LOGIT))
+            if abs(step) < 1e-4:
+                break
+        self.theta = theta
+        return theta
+
+
+# --- ADAPTIVE SELECTION ---
+
+class DifficultyIndex:
+    """Per-(level, skill) pools sorted by item difficulty for one content version and calibration."""
+
+    def __init__(self, content, difficulties: Mapping[str, float]):
+        self._content = content
+        self._difficulties = difficulties
+        self._pools: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray, bool]] = {}
+
+    def item_difficulty(self, item: Mapping) -> float:
+        """Mean difficulty of an item's questions."""
+        keys = question_keys(item)
+        return sum(self._difficulties.get(key, 0.0) for key in keys) / len(keys)
+
+    def _pool(self, level: str, skill: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, bool]:
+        """
+        (sorted difficulties, ids in the same order, their positions in the
+        pool, whether any item is calibrated)
+        """
+        pool = self._pools.get((level, skill))
+        if pool is None:
+            ids = np.fromiter(self._content.ids(level, skill), dtype=np.int64)
+            items = [self._content.item(int(i)) for i in ids]
+            b = np.array([self.item_difficulty(item) for item in items])
+            calibrated = any(key in self._difficulties for item in items for key in question_keys(item))
+            # Equal difficulties (e.g. uncalibrated items) are shuffled so a window is not always the same ids;
+            # the shuffle is fixed so selections stay reproducible for a given rng
+            order = np.lexsort((np.random.default_rng(len(ids)).permutation(len(ids)), b))
+            pool = self._pools[(level, skill)] = (b[order], ids[order], order, calibrated)
+        return pool
+
+    def select(self, level: str, skill: str, theta: float, count: int,
+               rng: random.Random = random, spread: int = 3,
+               allowed: Optional[np.ndarray] = None) -> List[int]:
+        """
+        Samples ``count`` ids among the ``spread * count`` items whose
+        difficulty is closest to ``theta``; a pool without any calibrated
+        item is sampled uniformly.  ``allowed`` optionally restricts the
+        candidates to a boolean mask over pool positions (see sampling.SeenSet).
+        """
+        b, ids, positions, calibrated = self._pool(level, skill)
+        if allowed is not None:
+            keep = allowed[positions]
+            b, ids = b[keep], ids[keep]
+        n = len(ids)
+        if not calibrated:
+            return [int(ids[j]) for j in rng.sample(range(n), min(count, n))]
+        window = min(n, max(spread * count, count))
+        centre = int(np.searchsorted(b, theta))
+        lo = max(0, min(centre - window // 2, n - window))
+        picks = rng.sample(range(lo, lo + window), min(count, window))
+        return [int(ids[j]) for j in picks]
+
+
+_indexes: "WeakKeyDictionary[object, Tuple[str, Dict[str, float], DifficultyIndex]]" = WeakKeyDictionary()
+
+
+def difficulty_index(content) -> DifficultyIndex:
+    """
+    Returns the shared index for a content source, rebuilt when a new
+    calibration is loaded or the source changes version in place (SQLite
+    store refresh), so its pools never point at edited or deleted items.
+    """
+    difficulties = load_difficulties()
+    version = content.version
+    cached = _indexes.get(content)
+    if cached is None or cached[0] != version or cached[1] is not difficulties:
+        cached = (version, difficulties, DifficultyIndex(content, difficulties))
+        _indexes[content] = cached
+    return cached[2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate Rasch item difficulties from the response log.")
+    parser.add_argument("--log", type=Path, default=RESPONSE_LOG, help=f"Response log (default: {RESPONSE_LOG})")
+    parser.add_argument("--output", type=Path, default=DIFFICULTY_PATH, help=f"Output (default: {DIFFICULTY_PATH})")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        learner_idx, item_idx, correct, learner_names, item_keys = read_responses(args.log)
+    except OSError as e:
+        parser.exit(1, f"error: cannot read response log {args.log}: {e}\n")
+    if not len(correct):
+        # Calibrating nothing would overwrite a good difficulty file with an empty one
+        parser.exit(1, f"error: no responses in {args.log}, {args.output} left unchanged\n")
+    theta, b = calibrate(learner_idx, item_idx, correct, len(learner_names), len(item_keys), args.iterations)
+    write_difficulties(item_keys, b, np.bincount(item_idx, minlength=len(item_keys)), args.output)
+    print(
+        f"Calibrated {len(item_keys)} questions from {len(correct)} responses by {len(learner_names)} learners "
+        f"in {time.perf_counter() - started:.2f}s -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
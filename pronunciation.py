@@ -0,0 +1,72 @@
+"""
+Local pronunciation scoring against the reference TTS clips.
+
+A learner's recording of a word is compared with the cached server-rendered
+clip of the same word (speech.py): both become MFCC sequences and are
+aligned by dynamic time warping (audio_dsp.py), so speaking faster or slower
+than the reference costs nothing and only differences in the sounds count.
+The alignment distance is mapped to a 0-100 similarity.
+
+Reference features depend only on the clip, whose file name is a hash of its
+text and voice, so they are computed once per word and process; scoring a
+recording then analyses just the recording.  Nothing leaves the server.
+"""
+
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+import speech
+from audio_dsp import dtw_distance, mfcc, pcm_to_float, resample
+
+# DTW distances (per step, between unit-variance cepstra) that map to a similarity of 100 and 0.
+# Heuristic: a careful repetition of the reference word lands near the first (below it when spoken
+# by the same voice), a different word beyond the second.
+MATCH_DISTANCE = 0.6
+MISMATCH_DISTANCE = 1.8
+
+ANALYSIS_RATE = 16000  # browser recordings and TTS clips are resampled to one rate before comparing
+MIN_SPEECH_SECONDS = 0.15
+SILENCE_PEAK = 0.01    # recordings that never get louder than -40 dBFS count as silent
+
+
+class PronunciationScore(NamedTuple):
+    similarity: int    # 0-100
+    distance: float
+
+
+def features(audio: bytes) -> np.ndarray:
+    """MFCC sequence of a WAV recording; SpeechError if it is not a WAV clip or holds no speech."""
+    (channels, width, rate), frames = speech.read_wav(audio)
+    try:
+        samples = pcm_to_float(frames, channels, width)
+    except ValueError as e:
+        raise speech.SpeechError(str(e)) from e
+    if len(samples) < MIN_SPEECH_SECONDS * rate or np.abs(samples).max() < SILENCE_PEAK:
+        raise speech.SpeechError("No speech detected in the recording")
+    return mfcc(resample(samples, rate, ANALYSIS_RATE), ANALYSIS_RATE)
+
+
+@lru_cache(maxsize=512)
+def _reference_features(path: str) -> np.ndarray:
+    with open(path, "rb") as f:
+        return features(f.read())
+
+
+def similarity(distance: float) -> int:
+    share = (MISMATCH_DISTANCE - distance) / (MISMATCH_DISTANCE - MATCH_DISTANCE)
+    return int(round(100 * min(1.0, max(0.0, share))))
+
+
+def score_recording(recording: bytes, word: str) -> Optional[PronunciationScore]:
+    """
+    Similarity of a recording to the reference clip of ``word``; None when
+    there is no reference (no TTS engine installed).  Raises SpeechError for
+    an unreadable or silent recording.
+    """
+    reference = speech.clip_path(word)
+    if reference is None:
+        return None
+    distance = dtw_distance(features(recording), _reference_features(str(reference)))
+    return PronunciationScore(similarity(distance), distance)
@@ -0,0 +1,80 @@
+"""
+Multiple-choice quizzes graded in the browser ("instant feedback" mode).
+
+The whole quiz (question texts, options and correct indices) goes to the
+static component in frontend/quiz_grader/ as one JSON payload.  The browser
+marks every answer right or wrong as soon as it is clicked and pages through
+the quiz locally, so a 30-item vocabulary drill costs no server round trip
+per click.  When every question is answered, the learner sends one result
+record ``{"quiz": <token>, "answers": [option index, ...]}`` back; the server
+re-grades those indices against its own views rather than trusting the
+browser's verdict.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from content_pack import Selection
+from view_models import QuestionView
+
+COMPONENT_DIR = Path(__file__).resolve().parent / "frontend" / "quiz_grader"
+
+_component = components.declare_component("quiz_grader", path=str(COMPONENT_DIR))
+
+
+def quiz_token(selection: Selection) -> str:
+    """Identifies one drawn exercise, so a result posted for an earlier quiz is never graded again."""
+    digest = hashlib.blake2b(selection.version.encode(), digest_size=8)
+    digest.update(selection.ids.tobytes())
+    return digest.hexdigest()
+
+
+def quiz_payload(views: Sequence[QuestionView]) -> List[dict]:
+    return [
+        {"label": view.label.strip("*"), "options": list(view.options), "correct": view.correct}
+        for view in views
+    ]
+
+
+def submitted_answers(record, token: str, views: Sequence[QuestionView]) -> Optional[List[int]]:
+    """
+    The option indices of a posted result record, or None if it belongs to
+    another quiz or is incomplete / malformed.
+    """
+    if not isinstance(record, dict) or record.get("quiz") != token:
+        return None
+    answers = record.get("answers")
+    if not isinstance(answers, list) or len(answers) != len(views):
+        return None
+    for answer, view in zip(answers, views):
+        if not isinstance(answer, int) or isinstance(answer, bool) or not 0 <= answer < len(view.options):
+            return None
+    return answers
+
+
+def instant_quiz(views: Sequence[QuestionView], selection: Selection, key: str, prompt: str,
+                 page_size: int, on_submit: Callable[[List[int]], None]) -> None:
+    """
+    Renders the browser-graded quiz.  ``on_submit(answers)`` runs as the
+    component's on_change callback, before the script, once per quiz.
+    """
+    token = quiz_token(selection)
+
+    def _on_change():
+        answers = submitted_answers(st.session_state.get(key), token, views)
+        if answers is not None:
+            on_submit(answers)
+
+    _component(
+        quiz=token,
+        questions=quiz_payload(views),
+        prompt=prompt,
+        page_size=page_size,
+        key=key,
+        default=None,
+        on_change=_on_change,
+    )
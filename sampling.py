@@ -0,0 +1,270 @@
+"""
+Per-learner exercise sampling helpers.
+
+``SeenSet`` remembers which items of each (level, skill) pool a learner has
+already been served, as one bit per pool position, so "Next Exercise" keeps
+showing new items until the pool is exhausted and then starts a new cycle.
+A bitset costs ``len(pool) / 8`` bytes per pool however many items have been
+served, unlike a list of ids.  When the content is reloaded, the served
+items are carried over to the new version by their string ids, so a content
+edit does not make a learner start every pool from scratch.
+
+``seeded_rng`` gives reproducible selections (mock exams handed to a class,
+benchmarks): the same seed, level, skill and content version always yield
+the same items.
+
+``ErrorWeights`` drives the "practice my mistakes" mode: items a learner got
+wrong get extra sampling weight, drawn in O(1) per item with Walker's alias
+method.
+"""
+
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from content_pack import content_for_version
+
+# Extra sampling weight added per wrong answer (every item weighs 1), halved per correct answer
+ERROR_WEIGHT = 4.0
+MIN_ERROR_WEIGHT = 0.25
+
+# pick(allowed, n) returns up to n item ids among the pool positions where ``allowed`` is True
+Picker = Callable[[np.ndarray, int], List[int]]
+
+
+def seeded_rng(seed: str, level: str, skill: str, version: str) -> random.Random:
+    """
+    A private RNG determined by (seed, level, skill, content version).
+    String seeds are hashed with SHA-512 by ``random.Random``, so the
+    sequence is the same in every process regardless of PYTHONHASHSEED.
+    """
+    return random.Random(f"{seed}|{level}|{skill}|{version}")
+
+
+class _SeenBits:
+    """Served-items bitset of one pool of one content version."""
+
+    __slots__ = ("version", "pool", "bits")
+
+    def __init__(self, version: str, pool: Sequence[int]):
+        self.version = version
+        self.pool = pool    # the pool's ids in that version, shared with the content source
+        self.bits = bytearray((len(pool) + 7) // 8)
+
+    @property
+    def size(self) -> int:
+        return len(self.pool)
+
+    def seen_ids(self) -> np.ndarray:
+        return np.asarray(self.pool, dtype=np.int64)[~self.unseen()]
+
+    def unseen(self) -> np.ndarray:
+        """Boolean mask over pool positions, True where the item was not served yet."""
+        seen = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), count=self.size, bitorder="little")
+        return seen == 0
+
+    def mark(self, positions: np.ndarray) -> None:
+        seen = ~self.unseen()
+        seen[positions] = True
+        self.bits[:] = np.packbits(seen, bitorder="little").tobytes()
+
+    def clear(self, positions: np.ndarray) -> None:
+        seen = ~self.unseen()
+        seen[positions] = False
+        self.bits[:] = np.packbits(seen, bitorder="little").tobytes()
+
+
+class SeenSet:
+    """A learner's served items, one bitset per (level, skill) pool."""
+
+    def __init__(self):
+        self._pools: Dict[Tuple[str, str], _SeenBits] = {}
+
+    def _bits(self, content, level: str, skill: str, pool: Sequence[int]) -> _SeenBits:
+        """Returns the pool's bitset, carried over to the current content version if needed."""
+        bits = self._pools.get((level, skill))
+        if bits is None or bits.version != content.version:
+            bits = self._pools[(level, skill)] = _carry_over(bits, content, pool)
+        return bits
+
+    def seen_count(self, content, level: str, skill: str) -> int:
+        if (level, skill) not in self._pools:
+            return 0
+        bits = self._bits(content, level, skill, content.ids(level, skill))
+        return int((~bits.unseen()).sum())
+
+    def select(self, content, level: str, skill: str, count: int, tag: Optional[str] = None,
+               rng: random.Random = random, pick: Optional[Picker] = None) -> List[int]:
+        """
+        Picks ``count`` ids the learner has not been served in the current
+        cycle and marks them as served.  When fewer unseen items are left,
+        those are taken first and a new cycle starts for the rest.
+
+        ``pick`` chooses among allowed pool positions (uniformly by default),
+        so other selection policies can run on top of the seen set.
+        """
+        pool = np.asarray(content.ids(level, skill), dtype=np.int64)
+        if not len(pool):
+            return []
+        bits = self._bits(content, level, skill, content.ids(level, skill))
+        if pick is None:
+            pick = lambda allowed, n: _pick_uniform(pool, allowed, n, rng)
+
+        eligible = np.ones(len(pool), dtype=bool)
+        if tag is not None:
+            eligible[:] = False
+            eligible[np.searchsorted(pool, np.asarray(content.ids(level, skill, tag), dtype=np.int64))] = True
+
+        unseen = bits.unseen() & eligible
+        chosen = pick(unseen, count) if unseen.any() else []
+        if len(chosen) < count:
+            # Pool exhausted: start a new cycle, without repeating what was just chosen
+            bits.clear(eligible)
+            rest = eligible.copy()
+            rest[np.searchsorted(pool, np.asarray(chosen, dtype=np.int64))] = False
+            chosen = list(chosen) + (pick(rest, count - len(chosen)) if rest.any() else [])
+
+        bits.mark(np.searchsorted(pool, np.asarray(chosen, dtype=np.int64)))
+        return chosen
+
+
+def _carry_over(old: Optional[_SeenBits], content, pool: Sequence[int]) -> _SeenBits:
+    """
+    A bitset for the pool of the current version, marking the items served
+    from ``old``'s version.  Items are matched by string id through that
+    version's content while it is retained; otherwise the bits are kept only
+    if the pool's ids are unchanged.
+    """
+    bits = _SeenBits(content.version, pool)
+    if old is None:
+        return bits
+    previous = content_for_version(old.version)
+    if previous is None:
+        if len(old.pool) == len(pool) and np.array_equal(np.asarray(old.pool), np.asarray(pool)):
+            bits.bits[:] = old.bits
+        return bits
+
+    keys = []
+    for item_id in old.seen_ids().tolist():
+        try:
+            keys.append(previous.item(item_id)["id"])
+        except KeyError:
+            continue    # no longer retained (superseded store versions keep recent selections only)
+    new_ids = np.asarray([i for i in map(content.lookup, keys) if i is not None], dtype=np.int64)
+    ids = np.asarray(pool, dtype=np.int64)
+    positions = np.searchsorted(ids, new_ids)
+    found = positions < len(ids)
+    positions = positions[found][ids[positions[found]] == new_ids[found]]
+    if len(positions):
+        bits.mark(positions)
+    return bits
+
+
+def _pick_uniform(pool: np.ndarray, allowed: np.ndarray, count: int, rng: random.Random) -> List[int]:
+    positions = np.flatnonzero(allowed)
+    picks = rng.sample(range(len(positions)), min(count, len(positions)))
+    return [int(pool[positions[j]]) for j in picks]
+
+
+class AliasTable:
+    """Walker's alias method (Vose's variant): O(n) to build, O(1) per weighted draw."""
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Leftovers are 1.0 up to rounding error
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: random.Random = random) -> int:
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class ErrorWeights:
+    """
+    A learner's extra sampling weight for items they answered wrongly, per
+    (level, skill) pool.  Every item in a pool weighs 1, so a draw is a
+    two-level mixture: uniform over the pool, or an alias-table draw over
+    only the missed items.  Memory and table rebuilds scale with the number
+    of mistakes, not the pool; tables are rebuilt lazily after new results.
+    """
+
+    def __init__(self):
+        self._weights: Dict[Tuple[str, str], Dict[str, float]] = {}
+        # (level, skill) -> (content version, item ids, alias table) of the current weights
+        self._tables: Dict[Tuple[str, str], Tuple[str, List[int], AliasTable]] = {}
+
+    def has_errors(self, level: str, skill: str) -> bool:
+        return bool(self._weights.get((level, skill)))
+
+    def record(self, level: str, skill: str, keys: Sequence[str], correct: Sequence[bool]) -> None:
+        """Adds weight to wrongly answered items and decays it for correct ones."""
+        weights = self._weights.setdefault((level, skill), {})
+        for key, ok in zip(keys, correct):
+            if not ok:
+                weights[key] = weights.get(key, 0.0) + ERROR_WEIGHT
+            elif key in weights:
+                weights[key] /= 2
+                if weights[key] < MIN_ERROR_WEIGHT:
+                    del weights[key]
+        self._tables.pop((level, skill), None)
+
+    def _table(self, content, level: str, skill: str) -> Tuple[List[int], AliasTable, float]:
+        """Returns (item ids, alias table, total extra weight) for the pool's missed items."""
+        cached = self._tables.get((level, skill))
+        if cached is None or cached[0] != content.version:
+            weights = self._weights.get((level, skill), {})
+            ids = []
+            for key in list(weights):
+                item_id = content.lookup(key)
+                if item_id is None:
+                    del weights[key]  # item removed from the content
+                else:
+                    ids.append(item_id)
+            table = AliasTable(list(weights.values())) if weights else None
+            cached = self._tables[(level, skill)] = (content.version, ids, table)
+        _, ids, table = cached
+        weights = self._weights.get((level, skill), {})
+        return ids, table, sum(weights.values())
+
+    def select(self, content, level: str, skill: str, count: int, rng: random.Random = random,
+               max_draws_factor: int = 10) -> List[int]:
+        """
+        Draws up to ``count`` distinct ids, each with probability proportional
+        to 1 + its error weight.  Duplicates are redrawn; after
+        ``max_draws_factor * count`` draws the rest is filled uniformly.
+        """
+        pool = content.ids(level, skill)
+        count = min(count, len(pool))
+        ids, table, extra = self._table(content, level, skill)
+        total = len(pool) + extra
+
+        chosen: Dict[int, None] = {}
+        for _ in range(max_draws_factor * count):
+            if len(chosen) == count:
+                break
+            u = rng.random() * total
+            item_id = pool[int(u)] if u < len(pool) else ids[table.draw(rng)]
+            chosen.setdefault(int(item_id))
+        if len(chosen) < count:
+            for position in rng.sample(range(len(pool)), len(pool)):
+                chosen.setdefault(int(pool[position]))
+                if len(chosen) == count:
+                    break
+        return list(chosen)
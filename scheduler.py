@@ -0,0 +1,174 @@
+"""
+Spaced-repetition scheduling (SM-2) for vocabulary and grammar items.
+
+Each learner has a ``ReviewScheduler`` holding one card per item they have
+answered, keyed by the item's string id so history survives content reloads.
+Cards of a (level, skill) deck sit in a min-heap ordered by due time, so the
+next ``k`` cards to review are found in O(k log n) however long the history
+is.  Superseded heap entries are skipped lazily and compacted away when they
+outnumber live cards.
+"""
+
+import heapq
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+DAY = 24 * 60 * 60
+
+# Skills whose exercises are picked by the scheduler instead of uniform sampling
+SRS_SKILLS = ("vocabulary", "grammar")
+
+# A failed card comes back within the same study session instead of tomorrow
+RELEARN_DELAY = 10 * 60
+
+# SM-2 answer quality for a correct / wrong multiple-choice answer
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+class Card:
+    """SM-2 state of one item for one learner."""
+
+    __slots__ = ("key", "ease", "interval", "repetitions", "due", "stamp")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.ease = 2.5
+        self.interval = 0.0  # days
+        self.repetitions = 0
+        self.due = 0.0
+        self.stamp = 0  # bumped on every review; heap entries with an older stamp are stale
+
+    def review(self, quality: int, now: float) -> None:
+        """Applies one SM-2 review with answer quality 0..5."""
+        if quality < 3:
+            self.repetitions = 0
+            self.interval = 0.0
+            self.due = now + RELEARN_DELAY
+        else:
+            self.repetitions += 1
+            if self.repetitions == 1:
+                self.interval = 1.0
+            elif self.repetitions == 2:
+                self.interval = 6.0
+            else:
+                self.interval = round(self.interval * self.ease, 1)
+            self.due = now + self.interval * DAY
+        self.ease = max(1.3, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.stamp += 1
+
+
+class ReviewScheduler:
+    """Per-learner SM-2 cards with one due-time heap per (level, skill) deck."""
+
+    def __init__(self):
+        self._cards: Dict[str, Card] = {}
+        self._decks: Dict[Tuple[str, str], List[Tuple[float, int, str]]] = {}
+        self._deck_sizes: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def card(self, key: str) -> Optional[Card]:
+        return self._cards.get(key)
+
+    def review(self, level: str, skill: str, key: str, correct: bool, now: Optional[float] = None) -> Card:
+        """Records an answer and reschedules the item."""
+        now = time.time() if now is None else now
+        deck = (level, skill)
+        card = self._cards.get(key)
+        if card is None:
+            card = self._cards[key] = Card(key)
+            self._deck_sizes[deck] = self._deck_sizes.get(deck, 0) + 1
+        card.review(QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+
+        heap = self._decks.setdefault(deck, [])
+        heapq.heappush(heap, (card.due, card.stamp, key))
+        if len(heap) > 2 * self._deck_sizes[deck] + 16:
+            self._compact(deck)
+        return card
+
+    def _compact(self, deck: Tuple[str, str]) -> None:
+        heap = [entry for entry in self._decks[deck] if self._is_live(entry)]
+        heapq.heapify(heap)
+        self._decks[deck] = heap
+
+    def _is_live(self, entry: Tuple[float, int, str]) -> bool:
+        card = self._cards.get(entry[2])
+        return card is not None and card.stamp == entry[1]
+
+    def next_cards(self, level: str, skill: str, count: int) -> List[Card]:
+        """
+        Returns up to ``count`` cards of a deck, soonest due first, in
+        O(count log n): live entries are popped and pushed back.
+        """
+        heap = self._decks.get((level, skill))
+        if not heap:
+            return []
+        popped, cards = [], []
+        while heap and len(cards) < count:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                popped.append(entry)
+                cards.append(self._cards[entry[2]])
+        for entry in popped:
+            heapq.heappush(heap, entry)
+        return cards
+
+    def select(self, content, level: str, skill: str, count: int, now: Optional[float] = None,
+               rng: random.Random = random, sample: Optional[Callable[[int], List[int]]] = None) -> List[int]:
+        """
+        Picks ``count`` item ids for a quiz: cards that are due first, then
+        items the learner has not seen yet, then the cards due soonest.
+        Cards whose item no longer exists in ``content`` are forgotten.
+        New items are drawn with ``sample(n)`` (uniform over the pool by default).
+        """
+        now = time.time() if now is None else now
+        upcoming = self.next_cards(level, skill, count)
+
+        selected: List[int] = []
+        later: List[int] = []
+        for card in upcoming:
+            item_id = content.lookup(card.key)
+            if item_id is None:
+                self._forget(level, skill, card.key)
+            elif card.due <= now:
+                selected.append(item_id)
+            else:
+                later.append(item_id)
+
+        missing = count - len(selected)
+        if missing > 0:
+            if sample is None:
+                sample = lambda n: content.sample(level, skill, n, rng=rng)
+            selected.extend(self._new_items(content, missing, set(selected) | set(later), sample))
+            selected.extend(later[:count - len(selected)])
+        return selected
+
+    def _new_items(self, content, count: int, exclude: set, sample: Callable[[int], List[int]],
+                   attempts: int = 4) -> List[int]:
+        """
+        Samples up to ``count`` ids the learner has no card for.  Draws small
+        batches and rejects known items, so the cost does not grow with the
+        size of the history; a mostly-known deck just yields fewer new items.
+        """
+        new_ids: List[int] = []
+        for _ in range(attempts):
+            for item_id in sample(2 * count):
+                if item_id not in exclude and content.item(item_id)["id"] not in self._cards:
+                    exclude.add(item_id)
+                    new_ids.append(item_id)
+                    if len(new_ids) == count:
+                        return new_ids
+        return new_ids
+
+    def _forget(self, level: str, skill: str, key: str) -> None:
+        if self._cards.pop(key, None) is not None:
+            self._deck_sizes[(level, skill)] -= 1
+
+    def record_results(self, level: str, skill: str, keys: Sequence[str], correct: Sequence[bool],
+                       now: Optional[float] = None) -> None:
+        """Reviews every item of a graded quiz."""
+        for key, ok in zip(keys, correct):
+            self.review(level, skill, key, ok, now)
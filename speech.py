@@ -0,0 +1,436 @@
+"""
+Offline server-side text-to-speech with a content-addressed audio cache.
+
+Listening transcripts and pronunciation words are rendered to WAV by a local
+espeak-ng (or espeak) binary, so audio no longer depends on the browser
+having a German ``speechSynthesis`` voice.  Every clip is stored under
+``<sha256 of (text, voice, rate)>.wav``: the same text is synthesized once
+per process tree and deployment, and later plays cost one file read.
+
+Slower playback (``SPEEDS``) is produced from the synthesized clip by a
+pitch-preserving time-stretch (audio_dsp.py) and cached as a variant of it,
+so every device hears the same audio at the same speed.
+
+The cache is capped at ``GOETHE_AUDIO_CACHE_MB`` megabytes.  Writes keep a
+running size total; only when it goes over the cap is the directory scanned
+and the least recently used clips (by mtime, refreshed on every hit) evicted,
+down to ``EVICT_TO`` of the cap.  Without a TTS binary ``available()``
+is False and the app keeps using the browser button (tts_player.py).
+
+Listening transcripts are split into sentences and every sentence is a clip
+of its own: learners can replay one sentence, and the whole passage is the
+cached sentence clips joined with short pauses, so neither a replay nor a
+passage ever re-synthesizes text that was already rendered.
+
+The cache can be warmed at deploy time, rendering every clip of the content
+in parallel:
+
+    python speech.py                    # all listening transcripts and pronunciation words
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, List, Mapping, Optional, Sequence, Tuple
+
+from audio_dsp import float_to_pcm16, pcm16_to_float, time_stretch
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+AUDIO_CACHE_DIR = Path(os.environ.get("GOETHE_AUDIO_CACHE", DATA_DIR / "audio"))
+AUDIO_CACHE_MB = float(os.environ.get("GOETHE_AUDIO_CACHE_MB", "200"))
+# Eviction frees the cache down to this share of the cap, so a full cache is not rescanned on every write
+EVICT_TO = 0.9
+
+VOICE = "de"
+# Synthesis rate relative to espeak's default of 175 words per minute; slower playback comes from
+# time-stretched variants of the clip (SPEEDS)
+DEFAULT_RATE = 1.0
+ESPEAK_WPM = 175
+
+# Playback speeds learners can choose; slightly slower than natural by default, for clarity
+SPEEDS = (0.75, 0.9, 1.0)
+DEFAULT_SPEED = 0.9
+SYNTHESIS_TIMEOUT = 30
+
+# Pause between the sentences of a passage
+SENTENCE_GAP = 0.35
+
+logger = logging.getLogger(__name__)
+
+
+class SpeechError(RuntimeError):
+    """Raised when no TTS engine is installed or synthesis fails."""
+
+
+@lru_cache(maxsize=None)
+def tts_binary() -> Optional[str]:
+    """The TTS executable, looked up on PATH once per process."""
+    return shutil.which("espeak-ng") or shutil.which("espeak")
+
+
+def available() -> bool:
+    return tts_binary() is not None
+
+
+def synthesize(text: str, voice: str = VOICE, rate: float = DEFAULT_RATE) -> bytes:
+    """Renders ``text`` to WAV bytes with the local TTS engine."""
+    binary = tts_binary()
+    if binary is None:
+        raise SpeechError("No TTS engine found (install espeak-ng)")
+    try:
+        # Text goes through stdin, so quotes and leading dashes are never parsed as arguments
+        completed = subprocess.run(
+            [binary, "-v", voice, "-s", str(round(ESPEAK_WPM * rate)), "--stdin", "--stdout"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=SYNTHESIS_TIMEOUT,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        raise SpeechError(f"Synthesis failed: {e}") from e
+    if not completed.stdout:
+        raise SpeechError("Synthesis produced no audio")
+    # espeak streams its WAV to stdout with placeholder chunk sizes; rewrite it with real ones
+    fmt, frames = read_wav(completed.stdout)
+    return write_wav(fmt, frames)
+
+
+# (channels, bytes per sample, sample rate)
+WavFormat = Tuple[int, int, int]
+
+
+def read_wav(audio: bytes) -> Tuple[WavFormat, bytes]:
+    """Returns (format, PCM frames) of a WAV clip."""
+    try:
+        with wave.open(io.BytesIO(audio)) as f:
+            return (f.getnchannels(), f.getsampwidth(), f.getframerate()), f.readframes(f.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise SpeechError(f"Not a WAV clip: {e}") from e
+
+
+def write_wav(fmt: WavFormat, frames: bytes) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as f:
+        f.setnchannels(fmt[0])
+        f.setsampwidth(fmt[1])
+        f.setframerate(fmt[2])
+        f.writeframes(frames)
+    return out.getvalue()
+
+
+def join_wavs(clips: Sequence[bytes], gap: float = SENTENCE_GAP) -> bytes:
+    """Concatenates clips of the same format with ``gap`` seconds of silence between them."""
+    fmt, parts = None, []
+    for clip in clips:
+        clip_fmt, frames = read_wav(clip)
+        if fmt is None:
+            fmt = clip_fmt
+        elif clip_fmt != fmt:
+            raise SpeechError("Clips to join have different formats")
+        parts.append(frames)
+    if fmt is None:
+        raise SpeechError("No clips to join")
+    channels, width, framerate = fmt
+    silence_byte = b"\x80" if width == 1 else b"\x00"  # 8-bit WAV is unsigned
+    silence = silence_byte * (int(framerate * gap) * channels * width)
+    return write_wav(fmt, silence.join(parts))
+
+
+def stretch_wav(audio: bytes, speed: float) -> bytes:
+    """The clip played at ``speed`` times its tempo, same pitch (16-bit mono WAV, as espeak writes)."""
+    fmt, frames = read_wav(audio)
+    if fmt[:2] != (1, 2):
+        raise SpeechError(f"Only 16-bit mono clips can be time-stretched, got {fmt[0]} channels x {fmt[1]} bytes")
+    return write_wav(fmt, float_to_pcm16(time_stretch(pcm16_to_float(frames), speed)))
+
+
+# Sentence ends: . ! ? … followed by whitespace and an optional dialogue dash
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+(?:[-–—]\s+)?")
+# A period after these does not end a sentence
+_ABBREVIATIONS = ("z.B.", "d.h.", "u.a.", "bzw.", "usw.", "ca.", "Dr.", "Prof.", "Nr.", "Str.", "Hr.", "Fr.", "etc.")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Splits a transcript into sentences (dialogue turns separated by " - " included)."""
+    sentences: List[str] = []
+    for piece in _SENTENCE_END.split(text.strip()):
+        if not piece:
+            continue
+        # Re-join after abbreviations and ordinals ("am 3. Mai")
+        if sentences and (sentences[-1].endswith(_ABBREVIATIONS) or re.search(r"\b\d+\.$", sentences[-1])):
+            sentences[-1] = f"{sentences[-1]} {piece}"
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def spoken_text(item: Mapping) -> str:
+    return item["transcript"] if "transcript" in item else item["word"]
+
+
+def cache_key(text: str, voice: str = VOICE, rate: float = DEFAULT_RATE, variant: str = "") -> str:
+    """Hash of what a clip contains; ``variant`` names derived clips (e.g. a joined passage)."""
+    parts = [text, voice, rate] + ([variant] if variant else [])
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """WAV clips on disk keyed by the hash of what was synthesized, with an LRU size cap."""
+
+    def __init__(self, directory: Path = AUDIO_CACHE_DIR, max_bytes: int = int(AUDIO_CACHE_MB * 1024 * 1024),
+                 evict_on_store: bool = True):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Batch writers turn this off and call evict() once at the end
+        self.evict_on_store = evict_on_store
+        self._evict_lock = threading.Lock()
+        # Running total of the cache size, from the last directory scan plus this process's writes since.
+        # Other processes' writes are only seen at the next scan, so several writers may overshoot the cap
+        # until one of them crosses it.
+        self._size: Optional[int] = None
+
+    def path(self, text: str, voice: str = VOICE, rate: float = DEFAULT_RATE, variant: str = "") -> Path:
+        return self.directory / f"{cache_key(text, voice, rate, variant)}.wav"
+
+    def lookup(self, text: str, voice: str = VOICE, rate: float = DEFAULT_RATE, variant: str = "") -> Optional[Path]:
+        """The cached clip (marked as recently used), or None."""
+        path = self.path(text, voice, rate, variant)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get(self, text: str, voice: str = VOICE, rate: float = DEFAULT_RATE, speed: float = 1.0) -> Path:
+        """Path of the clip for ``text`` at ``speed``, synthesizing (and stretching) and caching it on a miss."""
+        if speed != 1.0:
+            return self._stretched(lambda: self.get(text, voice, rate), text, voice, rate, "", speed)
+        path = self.lookup(text, voice, rate)
+        if path is None:
+            path = self.store(self.path(text, voice, rate), synthesize(text, voice, rate))
+        return path
+
+    def passage(self, text: str, voice: str = VOICE, rate: float = DEFAULT_RATE, speed: float = 1.0) -> Path:
+        """
+        Path of the whole-passage clip: its sentence clips (see ``get``) joined
+        with pauses.  A single sentence is just its own clip.
+        """
+        sentences = split_sentences(text)
+        if len(sentences) <= 1:
+            return self.get(text, voice, rate, speed)
+        if speed != 1.0:
+            return self._stretched(lambda: self.passage(text, voice, rate), text, voice, rate, "passage", speed)
+        path = self.lookup(text, voice, rate, variant="passage")
+        if path is None:
+            clips = [self.get(sentence, voice, rate).read_bytes() for sentence in sentences]
+            path = self.store(self.path(text, voice, rate, variant="passage"), join_wavs(clips))
+        return path
+
+    def _stretched(self, base: Callable[[], Path], text: str, voice: str, rate: float, variant: str,
+                   speed: float) -> Path:
+        """The ``speed`` variant of a clip, time-stretched from ``base()`` on a miss."""
+        variant = f"{variant} x{speed:g}".strip()
+        path = self.lookup(text, voice, rate, variant)
+        if path is None:
+            path = self.store(self.path(text, voice, rate, variant), stretch_wav(base().read_bytes(), speed))
+        return path
+
+    def store(self, path: Path, audio: bytes) -> Path:
+        """
+        Writes a clip atomically (concurrent writers of the same key are
+        harmless) and enforces the cap; the directory is only scanned when
+        the running size total goes over it.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        with self._evict_lock:
+            if self._size is not None:
+                self._size += len(audio)
+            over = self._size is None or self._size > self.max_bytes
+        if over and self.evict_on_store:
+            self.evict()
+        return path
+
+    def stats(self) -> Tuple[int, int]:
+        """(number of clips, total bytes)"""
+        entries = self._entries()
+        return len(entries), sum(entry.stat().st_size for entry in entries)
+
+    def _entries(self):
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".wav")]
+        except FileNotFoundError:
+            return []
+
+    def evict(self) -> None:
+        """Deletes least recently used clips, if it is over ``max_bytes``, until the cache is at EVICT_TO of it."""
+        with self._evict_lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICT_TO if total > self.max_bytes else total
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self._size = total
+
+
+_cache: Optional[AudioCache] = None
+
+
+def audio_cache() -> AudioCache:
+    """The process-wide cache in AUDIO_CACHE_DIR."""
+    global _cache
+    if _cache is None:
+        _cache = AudioCache()
+    return _cache
+
+
+def clip_path(text: str, speed: float = 1.0, passage: bool = False,
+              voice: str = VOICE, rate: float = DEFAULT_RATE) -> Optional[Path]:
+    """
+    The cached clip for ``text`` at ``speed`` (the joined sentence clips if
+    ``passage``), rendered on a miss; None (logged) when no engine is
+    installed or synthesis fails, so callers can fall back to browser TTS.
+    """
+    if not available():
+        return None
+    try:
+        cache = audio_cache()
+        return cache.passage(text, voice, rate, speed) if passage else cache.get(text, voice, rate, speed)
+    except (SpeechError, OSError) as e:
+        logger.warning("Server-side TTS unavailable for %r: %s", text[:40], e)
+        return None
+
+
+# --- CACHE WARMING ---
+
+def spoken_texts(content) -> Tuple[List[str], List[str]]:
+    """
+    (every distinct clip text, the transcripts) of the content: the sentences
+    of all listening transcripts and all pronunciation words.
+    """
+    texts, transcripts = {}, {}
+    for level in content.levels:
+        for item in content.resolve(content.ids(level, "listening")):
+            transcripts.setdefault(item["transcript"])
+            for sentence in split_sentences(item["transcript"]):
+                texts.setdefault(sentence)
+        for item in content.resolve(content.ids(level, "pronunciation")):
+            texts.setdefault(item["word"])
+    return list(texts), list(transcripts)
+
+
+def _render_clip(job: Tuple[str, str, float, str]) -> Optional[str]:
+    """Process-pool worker: synthesizes one clip into the cache; returns an error message on failure."""
+    text, voice, rate, directory = job
+    cache = AudioCache(Path(directory), evict_on_store=False)
+    try:
+        cache.store(cache.path(text, voice, rate), synthesize(text, voice, rate))
+    except (SpeechError, OSError) as e:
+        return f"{text[:40]!r}: {e}"
+    return None
+
+
+def _derive_clips(job: Tuple[str, bool, Tuple[float, ...], str, float, str]) -> Optional[str]:
+    """Process-pool worker: joins a passage and/or time-stretches the speed variants of an already rendered text."""
+    text, passage, speeds, voice, rate, directory = job
+    cache = AudioCache(Path(directory), evict_on_store=False)
+    try:
+        for speed in speeds:
+            if passage:
+                cache.passage(text, voice, rate, speed)
+            else:
+                cache.get(text, voice, rate, speed)
+    except (SpeechError, OSError) as e:
+        return f"{text[:40]!r}: {e}"
+    return None
+
+
+def warm_cache(texts: List[str], transcripts: List[str], cache: AudioCache, speeds: Sequence[float] = SPEEDS,
+               voice: str = VOICE, rate: float = DEFAULT_RATE, workers: Optional[int] = None) -> Tuple[int, List[str]]:
+    """
+    Renders every clip of ``texts`` (sentences and words) missing from
+    ``cache``, then the joined ``transcripts`` and all ``speeds`` variants,
+    across a process pool.  Returns (clips written, errors); the size cap is
+    enforced once at the end.
+    """
+    clips_before, _ = cache.stats()
+    missing = [text for text in texts if not cache.path(text, voice, rate).exists()]
+    directory = str(cache.directory)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = [(text, voice, rate, directory) for text in missing]
+        errors = [error for error in executor.map(_render_clip, jobs, chunksize=8) if error]
+        # Derived clips only read the clips rendered above: no synthesis, just joins and stretches
+        speeds = tuple(speeds)
+        jobs = [(text, False, speeds, voice, rate, directory) for text in texts]
+        jobs += [(text, True, speeds, voice, rate, directory) for text in transcripts]
+        errors += [error for error in executor.map(_derive_clips, jobs, chunksize=8) if error]
+    written = cache.stats()[0] - clips_before
+    cache.evict()
+    return written, errors
+
+
+def main():
+    from content_pack import load_content
+
+    parser = argparse.ArgumentParser(description="Pre-render the audio of all listening and pronunciation items.")
+    parser.add_argument("--cache", type=Path, default=AUDIO_CACHE_DIR, help=f"Cache directory (default: {AUDIO_CACHE_DIR})")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--speeds", type=float, nargs="+", default=list(SPEEDS),
+                        help=f"Playback speeds to pre-render (default: {' '.join(f'{s:g}' for s in SPEEDS)})")
+    args = parser.parse_args()
+
+    if not available():
+        parser.error("no TTS engine found (install espeak-ng)")
+    cache = AudioCache(args.cache)
+    texts, transcripts = spoken_texts(load_content())
+
+    started = time.perf_counter()
+    written, errors = warm_cache(texts, transcripts, cache, speeds=args.speeds, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    for error in errors:
+        print(f"Failed: {error}")
+    items = len(texts) + len(transcripts)
+    clips, size = cache.stats()
+    print(
+        f"Processed {items} texts at {len(args.speeds)} speeds in {elapsed:.1f}s "
+        f"({items / elapsed if elapsed else 0.0:.1f} items/s): {written} clips written, {len(errors)} failed; "
+        f"cache: {clips} clips, {size / 1024 / 1024:.1f} MB in {cache.directory}"
+    )
+    if size >= cache.max_bytes * 0.9:
+        print(f"Warning: the cache is near its {AUDIO_CACHE_MB:g} MB cap (GOETHE_AUDIO_CACHE_MB); some clips may be evicted")
+
+
+if __name__ == "__main__":
+    main()
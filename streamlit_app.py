@@ -1,8 +1,25 @@
 import streamlit as st
+import math
 import random
 import time
-from typing import Dict, List
+import uuid
+from typing import Dict, List, Optional
 import pandas as pd
+import streamlit.components.v1 as components
+from content_pack import load_content, make_selection, resolve_selection
+from view_models import selection_views
+from scheduler import SRS_SKILLS, ReviewScheduler
+from sampling import ErrorWeights, SeenSet, seeded_rng
+from irt import IRT_SKILLS, AbilityEstimate, difficulty_index, load_difficulties, log_responses, question_keys
+from exercise_flow import ExerciseFlow, Phase
+import speech
+import pronunciation
+from tts_player import speak_button
+from quiz_grader import instant_quiz
+from exam_mode import (
+    EXAM_BLUEPRINT, MIN_WORDS, SECTION_TITLES, SUBMIT_GRACE,
+    assemble_exam, choice_key, exam_sections, grade_exam, spoken_key, text_key,
+)
 
 # Configure Streamlit page
 st.set_page_config(
@@ -12,57 +29,6 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# --- JAVASCRIPT FOR ZERO-COST BROWSER TTS ---
-# This script uses the browser's native SpeechSynthesis API, made more robust.
-JS_TTS_SCRIPT = """
-<script>
-    let germanVoice = null;
-    
-    // Function to ensure voices are loaded and find the German voice
-    function loadAndFindVoice() {
-        const voices = window.speechSynthesis.getVoices();
-        germanVoice = voices.find(voice => voice.lang.startsWith('de'));
-        // If the voice is found, we set the flag.
-        return !!germanVoice;
-    }
-    
-    // Load voices immediately and attach event listener for when they change
-    window.speechSynthesis.onvoiceschanged = loadAndFindVoice;
-    loadAndFindVoice();
-
-    // Main function called by the HTML button
-    function speakGerman(text) {
-        if (!('speechSynthesis' in window)) {
-            alert('Your browser does not support native text-to-speech.');
-            return;
-        }
-        
-        // Attempt to load voice right before speaking, just in case
-        if (!germanVoice) {
-            loadAndFindVoice();
-        }
-
-        var utterance = new SpeechSynthesisUtterance(text);
-        
-        // Apply the best German voice found
-        if (germanVoice) {
-            utterance.voice = germanVoice;
-        } else {
-            // Fallback: Set language to German
-            utterance.lang = 'de-DE';
-        }
-        
-        utterance.pitch = 1.0;
-        utterance.rate = 0.9; // Slightly slower speed for clarity
-        
-        // Stop any current speaking and start the new one
-        window.speechSynthesis.cancel();
-        window.speechSynthesis.speak(utterance);
-    }
-</script>
-"""
-st.markdown(JS_TTS_SCRIPT, unsafe_allow_html=True) # Inject the script once
-
 # --- CONSTANTS & DATA STRUCTURES ---
 
 EXERCISE_TYPES = {
@@ -72,263 +38,22 @@ EXERCISE_TYPES = {
     "Sprechen (Pronunciation)": "pronunciation",
     "Grammatik (Grammar Quiz)": "grammar",
     "Wortschatz (Vocabulary)": "vocabulary",
+    "Prüfung (Mock Exam)": "exam",
 }
 
-# Base content structured by CEFR level and skill (simulating a database)
-# A1 Reading, Listening, and Writing sections now meet the 30+ item requirement pool size.
-CONTENT_DB = {
-    "A1": {
-        "reading": [
-            {"id": "A1_R1", "text": "Hallo! Ich heiße Anna. Ich wohne in München. Ich bin Studentin. Mein Hobby ist Bücher lesen.", "questions": [{"q": "Wo wohnt Anna?", "options": ["Berlin", "München", "Köln"], "correct": 1}, {"q": "Was ist Anna?", "options": ["Lehrerin", "Studentin", "Ärztin"], "correct": 1}, {"q": "Was ist ihr Hobby?", "options": ["Musik", "Lesen", "Kochen"], "correct": 1}]},
-            {"id": "A1_R2", "text": "Das ist ein Tisch. Der Tisch ist groß und blau. Er steht im Wohnzimmer. Neben dem Tisch ist ein Stuhl.", "questions": [{"q": "Welche Farbe hat der Tisch?", "options": ["rot", "blau", "grün"], "correct": 1}, {"q": "Wo steht der Tisch?", "options": ["Küche", "Schlafzimmer", "Wohnzimmer"], "correct": 2}, {"q": "Was ist neben dem Tisch?", "options": ["Lampe", "Stuhl", "Sofa"], "correct": 1}]},
-            {"id": "A1_R3", "text": "Mein Name ist Max. Ich arbeite als Koch in einem kleinen Restaurant. Ich koche gern Pizza. Am Wochenende gehe ich wandern.", "questions": [{"q": "Was ist Max's Beruf?", "options": ["Bäcker", "Koch", "Kellner"], "correct": 1}, {"q": "Was kocht er gern?", "options": ["Pasta", "Suppe", "Pizza"], "correct": 2}, {"q": "Was macht er am Wochenende?", "options": ["wandern", "Kino", "schlafen"], "correct": 0}]},
-            {"id": "A1_R4", "text": "Wir fahren am Samstag in die Berge. Es wird kalt, also brauchen wir warme Kleidung und gute Schuhe. Wir bleiben dort drei Tage.", "questions": [{"q": "Wann fahren sie weg?", "options": ["Sonntag", "Samstag", "Freitag"], "correct": 1}, {"q": "Was brauchen sie?", "options": ["nur Schuhe", "warme Kleidung und Schuhe", "nichts"], "correct": 1}, {"q": "Wie lange bleiben sie?", "options": ["zwei Tage", "drei Tage", "eine Woche"], "correct": 1}]},
-            {"id": "A1_R5", "text": "Morgen hat mein Bruder Geburtstag. Er wird 8 Jahre alt. Wir machen eine Party mit Kuchen und Saft. Die Party beginnt um 15 Uhr.", "questions": [{"q": "Wer hat Geburtstag?", "options": ["Ich", "Der Bruder", "Die Schwester"], "correct": 1}, {"q": "Was gibt es auf der Party?", "options": ["Kaffee", "Kuchen und Saft", "Pizza"], "correct": 1}, {"q": "Wann beginnt die Party?", "options": ["13 Uhr", "15 Uhr", "17 Uhr"], "correct": 1}]},
-            {"id": "A1_R6", "text": "Ich möchte einen Flug nach Rom buchen. Die Reise dauert drei Stunden. Ich muss am Flughafen um 10 Uhr sein. Der Flug kostet 120 Euro.", "questions": [{"q": "Wohin möchte ich fliegen?", "options": ["Paris", "London", "Rom"], "correct": 2}, {"q": "Um wie viel Uhr muss ich am Flughafen sein?", "options": ["09:00", "10:00", "11:00"], "correct": 1}, {"q": "Wie viel kostet der Flug?", "options": ["100 Euro", "120 Euro", "150 Euro"], "correct": 1}]},
-            {"id": "A1_R7", "text": "Meine Mutter kauft heute im Supermarkt Obst und Gemüse. Sie braucht Äpfel, Bananen und Kartoffeln für das Abendessen. Sie fährt mit dem Auto.", "questions": [{"q": "Was kauft die Mutter?", "options": ["Käse", "Fleisch", "Obst und Gemüse"], "correct": 2}, {"q": "Was braucht sie für das Abendessen?", "options": ["Brot", "Nudeln", "Kartoffeln"], "correct": 2}, {"q": "Wie fährt sie zum Supermarkt?", "options": ["mit Bus", "mit Auto", "zu Fuß"], "correct": 1}]},
-            {"id": "A1_R8", "text": "Der Zug fährt pünktlich um 15:30 Uhr ab. Bitte seien Sie zehn Minuten vorher am Gleis 5. Fahrkarten gibt es am Schalter.", "questions": [{"q": "Wann fährt der Zug ab?", "options": ["14:30 Uhr", "15:30 Uhr", "16:00 Uhr"], "correct": 1}, {"q": "An welchem Gleis fährt der Zug ab?", "options": ["Gleis 4", "Gleis 5", "Gleis 6"], "correct": 1}, {"q": "Wo kauft man die Fahrkarten?", "options": ["Im Zug", "Am Schalter", "Online"], "correct": 1}]},
-            {"id": "A1_R9", "text": "Ich kann heute Abend nicht ins Kino gehen. Ich muss zu Hause bleiben, weil ich krank bin und Medizin nehmen muss. Meine Freundin geht allein.", "questions": [{"q": "Warum kann ich nicht ins Kino gehen?", "options": ["kein Geld", "krank", "keine Zeit"], "correct": 1}, {"q": "Was muss ich nehmen?", "options": ["Vitamine", "Medizin", "Kaffee"], "correct": 1}, {"q": "Wer geht ins Kino?", "options": ["Ich", "Die Freundin", "Niemand"], "correct": 1}]},
-            {"id": "A1_R10", "text": "Am Wochenende besuchen wir einen Freund, der in Hamburg lebt. Wir bleiben dort zwei Nächte und sehen uns die Stadt an. Wir fahren mit dem Zug.", "questions": [{"q": "Wo lebt der Freund?", "options": ["Berlin", "Köln", "Hamburg"], "correct": 2}, {"q": "Wie lange bleiben sie dort?", "options": ["eine Nacht", "zwei Nächte", "eine Woche"], "correct": 1}, {"q": "Wie reisen sie?", "options": ["Mit dem Auto", "Mit dem Zug", "Mit dem Flugzeug"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "A1_G1", "q": "Er __ aus der Schweiz.", "options": ["komme", "kommt", "kommen"], "correct": 1},
-            {"id": "A1_G2", "q": "Das ist __ Auto.", "options": ["eine", "ein", "einer"], "correct": 1},
-            {"id": "A1_G3", "q": "Wie __ du?", "options": ["heißen", "heißt", "bin"], "correct": 1},
-            {"id": "A1_G4", "q": "Wir __ in Berlin.", "options": ["wohnst", "wohne", "wohnen"], "correct": 2},
-            {"id": "A1_G5", "q": "__ du eine Katze?", "options": ["Bist", "Hast", "Habe"], "correct": 1},
-            {"id": "A1_G6", "q": "Ich __ fünfzig Jahre alt.", "options": ["bin", "ist", "sind"], "correct": 0},
-            {"id": "A1_G7", "q": "Ist das __ Tisch?", "options": ["ein", "einen", "eine"], "correct": 0},
-            {"id": "A1_G8", "q": "Sie __ gern Kaffee.", "options": ["trinkt", "trinken", "trinke"], "correct": 0},
-            {"id": "A1_G9", "q": "Der Mann __ müde.", "options": ["bin", "ist", "sind"], "correct": 1},
-            {"id": "A1_G10", "q": "Kaufen Sie __ Brot.", "options": ["das", "die", "der"], "correct": 0},
-            {"id": "A1_G11", "q": "Ihr __ im Garten.", "options": ["spielt", "spielen", "spiele"], "correct": 0},
-            {"id": "A1_G12", "q": "Woher __ Sie?", "options": ["komme", "kommst", "kommen"], "correct": 2},
-            {"id": "A1_G13", "q": "Das ist __ Haus.", "options": ["ein", "eine", "einen"], "correct": 0},
-            {"id": "A1_G14", "q": "Hast du __ Bruder?", "options": ["ein", "einen", "eine"], "correct": 1},
-            {"id": "A1_G15", "q": "Ich __ Hunger.", "options": ["bin", "habe", "ist"], "correct": 1},
-            {"id": "A1_G16", "q": "Wir __ glücklich.", "options": ["sind", "ist", "bin"], "correct": 0},
-            {"id": "A1_G17", "q": "Das ist __ Frau.", "options": ["der", "die", "das"], "correct": 1},
-            {"id": "A1_G18", "q": "__ ist dein Name?", "options": ["Wer", "Wo", "Was"], "correct": 2},
-            {"id": "A1_G19", "q": "Ich spreche __ gut Deutsch.", "options": ["nicht", "kein", "keine"], "correct": 0},
-            {"id": "A1_G20", "q": "Er arbeitet __ München.", "options": ["nach", "in", "aus"], "correct": 1},
-            {"id": "A1_G21", "q": "Sie __ eine Schwester.", "options": ["hat", "ist", "habe"], "correct": 0},
-            {"id": "A1_G22", "q": "Das sind __ Kinder.", "options": ["eine", "ein", "keine"], "correct": 2},
-            {"id": "A1_G23", "q": "Kommst du __ mir?", "options": ["auf", "zu", "von"], "correct": 1},
-            {"id": "A1_G24", "q": "Das Buch liegt __ dem Tisch.", "options": ["in", "auf", "unter"], "correct": 1},
-            {"id": "A1_G25", "q": "Ich kaufe __ Apfel.", "options": ["der", "den", "das"], "correct": 1},
-            {"id": "A1_G26", "q": "__ ist das da?", "options": ["Was", "Wann", "Wer"], "correct": 2},
-            {"id": "A1_G27", "q": "Ich mag __ Schokolade.", "options": ["keine", "kein", "keinen"], "correct": 0},
-            {"id": "A1_G28", "q": "Wir gehen __ Hause.", "options": ["im", "zu", "am"], "correct": 1},
-            {"id": "A1_G29", "q": "__ Uhr ist es?", "options": ["Was", "Wie", "Wann"], "correct": 1},
-            {"id": "A1_G30", "q": "Gehst du __ Supermarkt?", "options": ["in den", "zu dem", "am"], "correct": 0},
-            {"id": "A1_G31", "q": "Ich esse __ Käse.", "options": ["einen", "ein", "eine"], "correct": 0},
-            {"id": "A1_G32", "q": "Ich schenke __ Frau Blumen.", "options": ["der", "die", "den"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "A1_V1", "german": "der Hund", "english": "dog", "options": ["cat", "dog", "house"], "correct": 1},
-            {"id": "A1_V2", "german": "die Milch", "english": "milk", "options": ["water", "juice", "milk"], "correct": 2},
-            {"id": "A1_V3", "german": "der Baum", "english": "tree", "options": ["flower", "tree", "grass"], "correct": 1},
-            {"id": "A1_V4", "german": "trinken", "english": "to drink", "options": ["to eat", "to sleep", "to drink"], "correct": 2},
-            {"id": "A1_V5", "german": "groß", "english": "big", "options": ["small", "big", "fast"], "correct": 1},
-            {"id": "A1_V6", "german": "kalt", "english": "cold", "options": ["warm", "cold", "hot"], "correct": 1},
-            {"id": "A1_V7", "german": "sprechen", "english": "to speak", "options": ["to write", "to read", "to speak"], "correct": 2},
-            {"id": "A1_V8", "german": "der Stuhl", "english": "chair", "options": ["table", "chair", "bed"], "correct": 1},
-            {"id": "A1_V9", "german": "die Zeitung", "english": "newspaper", "options": ["book", "magazine", "newspaper"], "correct": 2},
-            {"id": "A1_V10", "german": "machen", "english": "to do/make", "options": ["to go", "to do/make", "to see"], "correct": 1},
-            {"id": "A1_V11", "german": "heute", "english": "today", "options": ["yesterday", "tomorrow", "today"], "correct": 2},
-            {"id": "A1_V12", "german": "die Küche", "english": "kitchen", "options": ["bathroom", "bedroom", "kitchen"], "correct": 2},
-            {"id": "A1_V13", "german": "fragen", "english": "to ask", "options": ["to answer", "to listen", "to ask"], "correct": 2},
-            {"id": "A1_V14", "german": "klein", "english": "small", "options": ["small", "big", "new"], "correct": 0},
-            {"id": "A1_V15", "german": "die Wohnung", "english": "apartment", "options": ["house", "car", "apartment"], "correct": 2},
-            {"id": "A1_V16", "german": "rot", "english": "red", "options": ["blue", "red", "yellow"], "correct": 1},
-            {"id": "A1_V17", "german": "der Schlüssel", "english": "key", "options": ["money", "key", "phone"], "correct": 1},
-            {"id": "A1_V18", "german": "fahren", "english": "to drive/go", "options": ["to walk", "to sleep", "to drive/go"], "correct": 2},
-            {"id": "A1_V19", "german": "die Familie", "english": "family", "options": ["friends", "colleagues", "family"], "correct": 2},
-            {"id": "A1_V20", "german": "gut", "english": "good", "options": ["bad", "good", "fast"], "correct": 1},
-            {"id": "A1_V21", "german": "der Kaffee", "english": "coffee", "options": ["tea", "water", "coffee"], "correct": 2},
-            {"id": "A1_V22", "german": "lesen", "english": "to read", "options": ["to write", "to read", "to sing"], "correct": 1},
-            {"id": "A1_V23", "german": "schlafen", "english": "to sleep", "options": ["to eat", "to wake up", "to sleep"], "correct": 2},
-            {"id": "A1_V24", "german": "die Schule", "english": "school", "options": ["work", "school", "university"], "correct": 1},
-            {"id": "A1_V25", "german": "der Tisch", "english": "table", "options": ["chair", "table", "lamp"], "correct": 1},
-            {"id": "A1_V26", "german": "wohnen", "english": "to live", "options": ["to work", "to eat", "to live"], "correct": 2},
-            {"id": "A1_V27", "german": "das Zimmer", "english": "room", "options": ["house", "room", "garden"], "correct": 1},
-            {"id": "A1_V28", "german": "zehn", "english": "ten", "options": ["five", "ten", "twenty"], "correct": 1},
-            {"id": "A1_V29", "german": "arbeiten", "english": "to work", "options": ["to work", "to relax", "to travel"], "correct": 0},
-            {"id": "A1_V30", "german": "gehen", "english": "to go/walk", "options": ["to sit", "to go/walk", "to run"], "correct": 1},
-            {"id": "A1_V31", "german": "essen", "english": "to eat", "options": ["to drink", "to sleep", "to eat"], "correct": 2},
-            {"id": "A1_V32", "german": "das Kind", "english": "child", "options": ["adult", "child", "friend"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "A1_P1", "word": "tschüs", "meaning": "bye"},
-            {"id": "A1_P2", "word": "neun", "meaning": "nine"},
-            {"id": "A1_P3", "word": "fünf", "meaning": "five"},
-            {"id": "A1_P4", "word": "ich", "meaning": "I"},
-            {"id": "A1_P5", "word": "gern", "meaning": "gladly"},
-            {"id": "A1_P6", "word": "Mädchen", "meaning": "girl"},
-            {"id": "A1_P7", "word": "Haus", "meaning": "house"},
-            {"id": "A1_P8", "word": "Auto", "meaning": "car"},
-            {"id": "A1_P9", "word": "Straße", "meaning": "street"},
-            {"id": "A1_P10", "word": "Kaffee", "meaning": "coffee"},
-            {"id": "A1_P11", "word": "Apfel", "meaning": "apple"},
-            {"id": "A1_P12", "word": "Brot", "meaning": "bread"},
-            {"id": "A1_P13", "word": "Eins", "meaning": "one"},
-            {"id": "A1_P14", "word": "Zwei", "meaning": "two"},
-            {"id": "A1_P15", "word": "Drei", "meaning": "three"},
-            {"id": "A1_P16", "word": "Vier", "meaning": "four"},
-            {"id": "A1_P17", "word": "Sechs", "meaning": "six"},
-            {"id": "A1_P18", "word": "Sieben", "meaning": "seven"},
-            {"id": "A1_P19", "word": "Acht", "meaning": "eight"},
-            {"id": "A1_P20", "word": "Zehn", "meaning": "ten"},
-            {"id": "A1_P21", "word": "Katze", "meaning": "cat"},
-            {"id": "A1_P22", "word": "Tasse", "meaning": "cup"},
-            {"id": "A1_P23", "word": "Milch", "meaning": "milk"},
-            {"id": "A1_P24", "word": "Buch", "meaning": "book"},
-            {"id": "A1_P25", "word": "Wohnung", "meaning": "apartment"},
-            {"id": "A1_P26", "word": "Stuhl", "meaning": "chair"},
-            {"id": "A1_P27", "word": "Tisch", "meaning": "table"},
-            {"id": "A1_P28", "word": "Zeitung", "meaning": "newspaper"},
-            {"id": "A1_P29", "word": "Spielen", "meaning": "to play"},
-            {"id": "A1_P30", "word": "Arbeiten", "meaning": "to work"},
-        ],
-        "listening": [
-            {"id": "A1_L1", "transcript": "Guten Tag. Wie heißen Sie? - Ich heiße Frau Schmidt.", "questions": [{"q": "Was hört die Person?", "options": ["Wie spät ist es?", "Wie heißen Sie?", "Wo wohnen Sie?"], "correct": 1}]},
-            {"id": "A1_L2", "transcript": "Ist das dein Fahrrad? - Nein, das ist das Auto von meinem Bruder.", "questions": [{"q": "Wem gehört das Auto?", "options": ["Der Frau", "Dem Bruder", "Dem Mann"], "correct": 1}]},
-            {"id": "A1_L3", "transcript": "Woher kommen Sie? - Ich komme aus Italien.", "questions": [{"q": "Woher kommt die Person?", "options": ["Spanien", "Frankreich", "Italien"], "correct": 2}]},
-            {"id": "A1_L4", "transcript": "Ich hätte gern eine Tasse Kaffee mit Milch, bitte.", "questions": [{"q": "Was bestellt die Person?", "options": ["Tee", "Kaffee", "Wasser"], "correct": 1}]},
-            {"id": "A1_L5", "transcript": "Es ist vierzehn Uhr.", "questions": [{"q": "Wie spät ist es?", "options": ["12:00 Uhr", "14:00 Uhr", "16:00 Uhr"], "correct": 1}]},
-            {"id": "A1_L6", "transcript": "Wie ist Ihre Telefonnummer? - Null-fünf-drei-zwei-eins.", "questions": [{"q": "Was fragt die Person?", "options": ["Die Adresse", "Die Nummer", "Den Namen"], "correct": 1}]},
-            {"id": "A1_L7", "transcript": "Entschuldigung, wo ist die Toilette? - Im ersten Stock links.", "questions": [{"q": "Wo ist die Toilette?", "options": ["rechts", "im ersten Stock", "im Erdgeschoss"], "correct": 1}]},
-            {"id": "A1_L8", "transcript": "Ich brauche ein Ticket nach Hamburg. - Einfache Fahrt oder hin und zurück?", "questions": [{"q": "Was möchte die Person kaufen?", "options": ["Essen", "Ein Buch", "Ein Ticket"], "correct": 2}]},
-            {"id": "A1_L9", "transcript": "Haben Sie ein Zimmer frei? - Ja, ein Doppelzimmer mit Blick auf den See.", "questions": [{"q": "Welches Zimmer ist frei?", "options": ["Einzelzimmer", "Doppelzimmer", "Dreibettzimmer"], "correct": 1}]},
-            {"id": "A1_L10", "transcript": "Können Sie das bitte wiederholen? - Gern, es ist sehr wichtig.", "questions": [{"q": "Was soll die andere Person tun?", "options": ["langsamer sprechen", "wiederholen", "stoppen"], "correct": 1}]},
-            # Expanded listening scenarios
-            {"id": "A1_L11", "transcript": "Ich wohne in der Schillerstraße 12. Die Miete ist 500 Euro.", "questions": [{"q": "Wie hoch ist die Miete?", "options": ["400 Euro", "500 Euro", "600 Euro"], "correct": 1}]},
-            {"id": "A1_L12", "transcript": "Mein Mann arbeitet als Arzt im Krankenhaus. Er arbeitet lange.", "questions": [{"q": "Was macht der Mann beruflich?", "options": ["Lehrer", "Polizist", "Arzt"], "correct": 2}]},
-            {"id": "A1_L13", "transcript": "Wir essen am Abend Brot und Käse.", "questions": [{"q": "Was essen sie am Abend?", "options": ["Reis und Fisch", "Brot und Käse", "Pizza"], "correct": 1}]},
-            {"id": "A1_L14", "transcript": "Der Bus fährt nur bis 20 Uhr.", "questions": [{"q": "Wie lange fährt der Bus?", "options": ["bis 21 Uhr", "bis 20 Uhr", "bis Mitternacht"], "correct": 1}]},
-            {"id": "A1_L15", "transcript": "Ich habe zwei Kinder, einen Sohn und eine Tochter.", "questions": [{"q": "Wie viele Kinder hat die Person?", "options": ["eins", "zwei", "drei"], "correct": 1}]},
-            {"id": "A1_L16", "transcript": "Können Sie mir helfen, ich habe meinen Schlüssel vergessen.", "questions": [{"q": "Was ist das Problem?", "options": ["Vergessenes Essen", "Vergessener Schlüssel", "Vergessene Tasche"], "correct": 1}]},
-            {"id": "A1_L17", "transcript": "Es ist draußen sehr kalt, ich ziehe meinen Mantel an.", "questions": [{"q": "Wie ist das Wetter?", "options": ["warm", "sonnig", "kalt"], "correct": 2}]},
-            {"id": "A1_L18", "transcript": "Wir treffen uns um halb sieben vor dem Kino.", "questions": [{"q": "Wann treffen sie sich?", "options": ["06:00 Uhr", "06:30 Uhr", "07:00 Uhr"], "correct": 1}]},
-            {"id": "A1_L19", "transcript": "Ich bin neu hier, wo kann ich einkaufen?", "questions": [{"q": "Was möchte die Person tun?", "options": ["Essen kochen", "Einkaufen", "Schlafen"], "correct": 1}]},
-            {"id": "A1_L20", "transcript": "Mein Name ist Luca, und ich wohne seit zwei Jahren in Deutschland.", "questions": [{"q": "Wie lange wohnt Luca in Deutschland?", "options": ["ein Jahr", "zwei Jahre", "drei Jahre"], "correct": 1}]},
-        ],
-        "writing": [
-            {"id": "A1_W1", "prompt": "Schreiben Sie 3 Sätze über Ihre Hobbys."},
-            {"id": "A1_W2", "prompt": "Stellen Sie sich vor (Name, Alter, Beruf)."},
-            {"id": "A1_W3", "prompt": "Beschreiben Sie kurz, was Sie heute essen."},
-            {"id": "A1_W4", "prompt": "Schreiben Sie einen kurzen Dialog (3 Sätze) im Café."},
-            {"id": "A1_W5", "prompt": "Beschreiben Sie das Wetter in Ihrer Stadt heute."},
-            {"id": "A1_W6", "prompt": "Schreiben Sie 4 Dinge, die Sie in Ihrer Wohnung haben."},
-            {"id": "A1_W7", "prompt": "Schreiben Sie einen Gruß an einen Freund/eine Freundin."},
-            {"id": "A1_W8", "prompt": "Schreiben Sie die Zahlen von 1 bis 10 in Worten."},
-            {"id": "A1_W9", "prompt": "Schreiben Sie einen kurzen Satz mit 'Ich habe'. (z.B. Ich habe Hunger.)"},
-            {"id": "A1_W10", "prompt": "Schreiben Sie einen kurzen Satz mit 'Ich bin'. (z.B. Ich bin Student.)"},
-            {"id": "A1_W11", "prompt": "Schreiben Sie 3 Sätze über Ihre Familie."},
-            {"id": "A1_W12", "prompt": "Füllen Sie ein Formular aus: Name, Vorname, Geburtsdatum, Wohnort."},
-            {"id": "A1_W13", "prompt": "Schreiben Sie, was Sie gestern Abend gemacht haben."},
-            {"id": "A1_W14", "prompt": "Schreiben Sie eine Entschuldigung (3 Sätze), warum Sie zu spät sind."},
-            {"id": "A1_W15", "prompt": "Schreiben Sie, was Sie in der Küche haben."},
-            {"id": "A1_W16", "prompt": "Schreiben Sie 5 Sätze über Ihre tägliche Routine."},
-            {"id": "A1_W17", "prompt": "Schreiben Sie 3 Sätze über Ihren Lieblingssport."},
-            {"id": "A1_W18", "prompt": "Schreiben Sie, was Sie am Wochenende machen möchten."},
-            {"id": "A1_W19", "prompt": "Schreiben Sie eine kurze Einladung an einen Freund."},
-            {"id": "A1_W20", "prompt": "Beschreiben Sie Ihr bestes Kleidungsstück (Farbe, Größe)."},
-            {"id": "A1_W21", "prompt": "Schreiben Sie 4 Fragen an einen neuen Nachbarn."},
-            {"id": "A1_W22", "prompt": "Schreiben Sie einen kurzen Dankesbrief."},
-            {"id": "A1_W23", "prompt": "Schreiben Sie 3 Dinge, die Sie nicht mögen."},
-            {"id": "A1_W24", "prompt": "Schreiben Sie, was Sie in Ihrer Tasche/Ihrem Rucksack haben."},
-            {"id": "A1_W25", "prompt": "Schreiben Sie die Uhrzeit auf Deutsch (z.B. 10:45 Uhr)."},
-            {"id": "A1_W26", "prompt": "Schreiben Sie einen kurzen Satz mit dem Verb 'haben' (Perfekt)."},
-            {"id": "A1_W27", "prompt": "Schreiben Sie 3 Sätze, wo Ihre Freunde wohnen."},
-            {"id": "A1_W28", "prompt": "Schreiben Sie einen kurzen Wunsch (z.b. Ich wünsche dir alles Gute)."},
-            {"id": "A1_W29", "prompt": "Schreiben Sie, wie Sie zur Arbeit/Uni kommen."},
-            {"id": "A1_W30", "prompt": "Schreiben Sie einen Satz mit 'weil' (Begründung)."},
-        ]
-    },
-    "A2": {
-        "reading": [
-            {"id": "A2_R1", "text": "Ich habe gestern meine Tante im Krankenhaus besucht. Sie hat mir erzählt, dass sie am Wochenende wieder nach Hause darf. Das ist sehr gut!", "questions": [{"q": "Wo war die Tante?", "options": ["im Park", "im Krankenhaus", "im Kino"], "correct": 1}, {"q": "Wann darf sie nach Hause?", "options": ["morgen", "am Wochenende", "nächste Woche"], "correct": 1}]},
-            {"id": "A2_R2", "text": "Wir suchen eine neue Wohnung. Sie soll drei Zimmer und einen Balkon haben. Die Miete darf nicht über 900 Euro liegen.", "questions": [{"q": "Wie viele Zimmer soll die Wohnung haben?", "options": ["zwei", "drei", "vier"], "correct": 1}, {"q": "Was ist die maximale Miete?", "options": ["800 Euro", "900 Euro", "1000 Euro"], "correct": 1}]},
-            {"id": "A2_R3", "text": "Bitte senden Sie uns Ihre Bewerbungsunterlagen bis zum 15. Mai. Wir benötigen Ihren Lebenslauf und ein Motivationsschreiben. Verspätete Bewerbungen können nicht berücksichtigt werden.", "questions": [{"q": "Welches Dokument wird benötigt?", "options": ["Foto", "Reisepass", "Motivationsschreiben"], "correct": 2}, {"q": "Wann ist die Frist?", "options": ["15. April", "15. Mai", "15. Juni"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "A2_G1", "q": "Obwohl es regnete, __ wir spazieren gegangen.", "options": ["sind", "haben", "waren"], "correct": 0},
-            {"id": "A2_G2", "q": "Der Mann, __ ich gestern getroffen habe, ist mein Nachbar.", "options": ["der", "den", "dem"], "correct": 1},
-            {"id": "A2_G3", "q": "Ich möchte, __ du mir hilfst.", "options": ["dass", "ob", "weil"], "correct": 0},
-            {"id": "A2_G4", "q": "Das gehört __ Frau.", "options": ["der", "die", "den"], "correct": 0},
-            {"id": "A2_G5", "q": "Sie hat __ einen neuen Computer gekauft.", "options": ["sich", "ihr", "ihm"], "correct": 0},
-            {"id": "A2_G6", "q": "Er spielt Fußball, obwohl __.", "options": ["muss er arbeiten", "er arbeiten muss", "er arbeiten kann"], "correct": 1},
-            {"id": "A2_G7", "q": "Ich fahre __ meinem Fahrrad.", "options": ["mit", "bei", "zu"], "correct": 0},
-            {"id": "A2_G8", "q": "Wir wissen nicht, __ er kommt.", "options": ["wann", "was", "wer"], "correct": 0},
-            {"id": "A2_G9", "q": "Möchtest du __ Tee oder Kaffee?", "options": ["einen", "ein", "eine"], "correct": 0},
-            {"id": "A2_G10", "q": "Ich gehe ohne __ Mantel spazieren.", "options": ["mein", "meinem", "meinen"], "correct": 2},
-        ],
-        "vocabulary": [
-            {"id": "A2_V1", "german": "der Fahrstuhl", "english": "elevator", "options": ["stairs", "door", "elevator"], "correct": 2},
-            {"id": "A2_V2", "german": "die Behörde", "english": "authority", "options": ["school", "market", "authority"], "correct": 2},
-            {"id": "A2_V3", "german": "unterschreiben", "english": "to sign", "options": ["to read", "to sign", "to print"], "correct": 1},
-            {"id": "A2_V4", "german": "pünktlich", "english": "punctual", "options": ["late", "fast", "punctual"], "correct": 2},
-            {"id": "A2_V5", "german": "die Nebenkosten", "english": "utility costs", "options": ["rent", "food costs", "utility costs"], "correct": 2},
-            {"id": "A2_V6", "german": "kennenlernen", "english": "to get to know", "options": ["to forget", "to meet", "to get to know"], "correct": 2},
-            {"id": "A2_V7", "german": "die Kündigung", "english": "termination", "options": ["contract", "promotion", "termination"], "correct": 2},
-            {"id": "A2_V8", "german": "die Verspätung", "english": "delay", "options": ["delay", "start", "speed"], "correct": 0},
-            {"id": "A2_V9", "german": "der Ratschlag", "english": "advice", "options": ["money", "advice", "gift"], "correct": 1},
-            {"id": "A2_V10", "german": "ausfüllen", "english": "to fill out", "options": ["to empty", "to close", "to fill out"], "correct": 2},
-        ],
-        "pronunciation": [
-            {"id": "A2_P1", "word": "Entschuldigung", "meaning": "excuse me"},
-        ],
-        "listening": [
-            {"id": "A2_L1", "transcript": "Können Sie mir bitte sagen, wie ich zum Bahnhof komme? - Gehen Sie geradeaus bis zur Ampel, dann links.", "questions": [{"q": "Was soll die Person an der Ampel tun?", "options": ["rechts gehen", "geradeaus gehen", "links gehen"], "correct": 2}]},
-        ],
-        "writing": [
-            {"id": "A2_W1", "prompt": "Schreiben Sie eine E-Mail an Ihren Freund über Ihren letzten Urlaub."},
-        ]
-    },
-    "B1": {
-        "reading": [
-            {"id": "B1_R1", "text": "Die Mülltrennung ist in Deutschland gesetzlich geregelt. Jeder Haushalt muss seinen Abfall sorgfältig trennen, um die Umwelt zu schützen. Wer dies nicht tut, riskiert hohe Bußgelder.", "questions": [{"q": "Was wird durch Mülltrennung geschützt?", "options": ["Die Nachbarn", "Die Wirtschaft", "Die Umwelt"], "correct": 2}]},
-        ],
-        "grammar": [
-            {"id": "B1_G1", "q": "Wenn ich mehr Geld hätte, __ ich ein neues Auto kaufen.", "options": ["werde", "kann", "würde"], "correct": 2},
-            {"id": "B1_G2", "q": "Das ist das Buch, __ ich dir empfohlen habe.", "options": ["das", "dem", "den", "der"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "B1_V1", "german": "die Nachhaltigkeit", "english": "sustainability", "options": ["growth", "sustainability", "efficiency"], "correct": 1},
-            {"id": "B1_V2", "german": "sich bemühen", "english": "to make an effort", "options": ["to forget", "to make an effort", "to complain"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "B1_P1", "word": "Gesellschaft", "meaning": "society"},
-        ],
-        "listening": [
-            {"id": "B1_L1", "transcript": "Der Gastronom sagte, dass er aufgrund steigender Lebensmittelpreise die Preise erhöhen müsse. Er hofft auf das Verständnis seiner Kunden.", "questions": [{"q": "Warum erhöht der Gastronom die Preise?", "options": ["wegen des Wetters", "wegen der Preise", "wegen der Lebensmittelpreise"], "correct": 2}]},
-        ],
-        "writing": [
-            {"id": "B1_W1", "prompt": "Diskutieren Sie die Vor- und Nachteile der Digitalisierung in der Schule. (ca. 80 Wörter)"},
-        ]
-    },
-    "B2": {
-        "reading": [
-            {"id": "B2_R1", "text": "Die kontroverse Debatte über Künstliche Intelligenz wirft ethische Fragen auf. Die Automatisierung vieler Prozesse könnte Arbeitsplätze vernichten, aber gleichzeitig zu enormen Produktivitätssteigerungen führen. Es ist ein Balanceakt.", "questions": [{"q": "Welche Art von Fragen wirft die KI-Debatte auf?", "options": ["politische", "ethische", "historische"], "correct": 1}]},
-        ],
-        "grammar": [
-            {"id": "B2_G1", "q": "Er sagte, __ er morgen kommen würde.", "options": ["dass", "ob", "falls"], "correct": 0},
-        ],
-        "vocabulary": [
-            {"id": "B2_V1", "german": "die Eindämmung", "english": "containment", "options": ["expansion", "containment", "development"], "correct": 1},
-        ],
-        "pronunciation": [
-            {"id": "B2_P1", "word": "Gewährleisten", "meaning": "to guarantee"},
-        ],
-        "listening": [
-            {"id": "B2_L1", "transcript": "Der Soziologe betonte, dass der demografische Wandel eine fundamentale Umgestaltung der sozialen Sicherungssysteme erfordert. Dies sei unvermeidlich.", "questions": [{"q": "Was erfordert der demografische Wandel?", "options": ["neue Steuern", "eine fundamentale Umgestaltung", "mehr Arbeitskräfte"], "correct": 1}]},
-        ],
-        "writing": [
-            {"id": "B2_W1", "prompt": "Analysieren Sie kritisch die Auswirkungen der Globalisierung auf die lokale Kultur. (ca. 100 Wörter)"},
-        ]
-    }
-}
+# Vocabulary and grammar quizzes render one page of questions per rerun
+PAGE_SIZES = (5, 10, 15, 30)
+DEFAULT_PAGE_SIZE = 10
+
+# The exercise panel reruns on its own when its widgets change (st.fragment); releases without
+# fragments fall back to full-app reruns
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Inline HTML/JS snippets (st.iframe supersedes components.html in newer Streamlit releases)
+embed_html = getattr(st, "iframe", None) or components.html
+
+# Exercise content (by CEFR level and skill) comes from the shared content pack, see content_pack.py.
+# Always fetch it through load_content() so a hot-reloaded pack is picked up on the next selection.
 
 
 class GoetheTrainer:
@@ -356,72 +81,255 @@ class GoetheTrainer:
         if 'current_exercise_type' not in st.session_state:
             st.session_state.current_exercise_type = list(EXERCISE_TYPES.keys())[0]
 
-        # NEW STATE FLAG: Used to defer the final rerun after a 'Next Exercise' click
-        if 'do_reset' not in st.session_state:
-            st.session_state.do_reset = False
+        # Phase (select -> answer -> graded) of every exercise type, see exercise_flow.py
+        if 'exercise_flow' not in st.session_state:
+            st.session_state.exercise_flow = ExerciseFlow()
 
         for key in EXERCISE_TYPES.values(): 
             if key not in st.session_state:
                 st.session_state[key] = None
-            if f"checked_{key}" not in st.session_state:
-                 st.session_state[f"checked_{key}"] = False
         
         # Initialize stable containers for user answers
         if 'current_answers' not in st.session_state:
             st.session_state.current_answers = []
 
+        # Per-learner spaced-repetition history for vocabulary and grammar
+        if 'review_scheduler' not in st.session_state:
+            st.session_state.review_scheduler = ReviewScheduler()
+
+        # Anonymous learner id for the response log, and the ability estimate used for adaptive difficulty
+        if 'learner_id' not in st.session_state:
+            st.session_state.learner_id = uuid.uuid4().hex
+        if 'ability' not in st.session_state:
+            st.session_state.ability = AbilityEstimate()
+
+        # Items already served per (level, skill) pool, so 'Next Exercise' doesn't repeat them
+        if 'seen_items' not in st.session_state:
+            st.session_state.seen_items = SeenSet()
+
+        # Extra sampling weight for items answered wrongly, used by the 'Practice my mistakes' mode
+        if 'error_weights' not in st.session_state:
+            st.session_state.error_weights = ErrorWeights()
+
+        # Per-session RNG, so sessions served by the same process never share random state
+        if 'rng' not in st.session_state:
+            st.session_state.rng = random.Random()
+
+        # Pronunciation similarity (or the reason there is none) per item id, for the item's current recording
+        if 'pronunciation_scores' not in st.session_state:
+            st.session_state.pronunciation_scores = {}
+
     # --- CORE GAME LOGIC ---
 
-    def _select_exercise(self, level: str, content_key: str, state_key: str, count: int = 30): 
+    def _select_exercise(self, level: str, content_key: str, state_key: str, count: int = 30,
+                         tag: Optional[str] = None, seed: Optional[str] = None):
         """
         Selects a random exercise only if one isn't already stored in session state.
-        Ensures content stability across reruns.
+        Ensures content stability across reruns. Optionally restricted to items with a tag.
+        Session state only holds the content version and item ids; items are resolved on every run.
+        With a seed (argument or the sidebar 'Exam seed'), the same (seed, level, skill, content version)
+        always yields the same items, independent of the learner's history.
         """
-        if st.session_state[state_key] is None or level != st.session_state.current_level:
-            available_content = CONTENT_DB.get(level, {}).get(content_key, [])
-            if not available_content:
+        if seed is None:
+            seed = st.session_state.get('exam_seed') or None
+        # Resolves against the version the ids were sampled from, so a content reload doesn't change the quiz
+        flow = st.session_state.exercise_flow
+        items = resolve_selection(st.session_state[state_key])
+        if items is None or level != st.session_state.current_level:
+            if st.session_state[state_key] is not None:
+                # The sampled version was dropped from memory; start the exercise over
+                flow.reset(state_key)
+
+            # Sample ids from the prebuilt (level, skill) index; only the chosen items are touched
+            content = load_content()
+            theta = st.session_state.ability.theta
+            rng = st.session_state.rng
+            if seed is not None:
+                # Reproducible selection (mock exams, benchmarks): a private RNG, no per-learner history
+                sample_ids = content.sample(
+                    level, content_key, count, tag=tag, rng=seeded_rng(seed, level, content_key, content.version)
+                )
+            elif (st.session_state.get('practice_mistakes') and tag is None
+                    and st.session_state.error_weights.has_errors(level, content_key)):
+                # Practice mode: items answered wrongly are drawn more often (alias method, see sampling.py)
+                sample_ids = st.session_state.error_weights.select(content, level, content_key, count, rng=rng)
+            elif content_key in SRS_SKILLS and tag is None:
+                # Vocabulary and grammar: due reviews first, then new items near the learner's ability
+                sample_ids = st.session_state.review_scheduler.select(
+                    content, level, content_key, count, rng=rng,
+                    sample=lambda n: difficulty_index(content).select(level, content_key, theta, n, rng=rng),
+                )
+            elif content_key in IRT_SKILLS and tag is None:
+                # Reading and listening: unseen items whose calibrated difficulty is closest to the ability (see irt.py)
+                sample_ids = st.session_state.seen_items.select(
+                    content, level, content_key, count, rng=rng,
+                    pick=lambda allowed, n: difficulty_index(content).select(
+                        level, content_key, theta, n, rng=rng, allowed=allowed
+                    ),
+                )
+            else:
+                # Items not served yet in this cycle through the pool (see sampling.py)
+                sample_ids = st.session_state.seen_items.select(content, level, content_key, count, tag=tag, rng=rng)
+            if not sample_ids:
                 st.session_state[state_key] = None
                 return None
-                
-            # Determine the sample size (maximum 30 items)
-            sample_count = min(count, len(available_content))
 
-            # Use random.sample for non-repetitive selection from the expanded pools
-            sample = random.sample(available_content, sample_count)
-            st.session_state[state_key] = sample
+            st.session_state[state_key] = make_selection(content, sample_ids)
+            st.session_state[f"page_{state_key}"] = 0
+            flow.advance(state_key, Phase.ANSWER)
+            items = content.resolve(sample_ids)
         
-        return st.session_state[state_key]
+        return items
 
     def _reset_exercise(self, state_key: str, answers_state_key: str):
         """
-        Resets the exercise, checked status, and answers for a clean transition.
-        FIX: Sets the do_reset flag instead of calling st.rerun().
+        Resets the exercise and answers for a clean transition (graded -> select).
+        Runs as an on_click callback, so the run that follows already draws and shows the next exercise.
         """
         st.session_state[state_key] = None
         st.session_state[answers_state_key] = []
-        st.session_state[f"checked_{state_key}"] = False
-        st.session_state.do_reset = True # Set the flag to trigger RERUN from the main loop
+        st.session_state.exercise_flow.reset(state_key)
+
+    def _collect_answers(self, views, indices):
+        """
+        Copies submitted radio choices into current_answers. Used in callbacks, where the form's
+        values are already in session state; radios of pages not rendered keep their stored answer.
+        """
+        for i in indices:
+            label = st.session_state.get(views[i].key)
+            if label is not None:
+                st.session_state.current_answers[i] = views[i].option_index[label]
+
+    def _turn_page(self, views, start: int, end: int, page_key: str, page: int):
+        """
+        on_click callback of the quiz page navigation. The radios of the page being left are
+        not rendered in the next run, so their submitted answers are saved here.
+        """
+        self._collect_answers(views, range(start, end))
+        st.session_state[page_key] = page
+
+    def _grade_choices(self, level: str, content_key: str, state_key: str, views, items):
+        """
+        on_click callback of a quiz's 'Check' button: grades the submitted answers (answer -> graded)
+        before the script runs, so that run renders the results directly.
+        """
+        if st.session_state.exercise_flow.phase(state_key) is not Phase.ANSWER:
+            return
+        self._collect_answers(views, range(len(views)))
+        results = [st.session_state.current_answers[i] == view.correct for i, view in enumerate(views)]
+        self._record_results(level, content_key, items, results)
+        self._update_score(sum(results), len(views), level, state_key)
+
+    def _render_instant_quiz(self, level: str, content_key: str, state_key: str, views, items, prompt: str):
+        """Quiz graded in the browser as the learner answers; the answers arrive once, at the end (see quiz_grader.py)."""
+        instant_quiz(
+            views, st.session_state[state_key], key=f"instant_{state_key}", prompt=prompt,
+            page_size=st.session_state.get('page_size', DEFAULT_PAGE_SIZE),
+            on_submit=lambda answers: self._grade_instant_quiz(level, content_key, state_key, views, items, answers),
+        )
+
+    def _grade_instant_quiz(self, level: str, content_key: str, state_key: str, views, items, answers: List[int]):
+        """Callback for a browser-graded quiz's result: re-grades the posted answers (answer -> graded)."""
+        if st.session_state.exercise_flow.phase(state_key) is not Phase.ANSWER:
+            return
+        st.session_state.current_answers = list(answers)
+        results = [answer == view.correct for answer, view in zip(answers, views)]
+        self._record_results(level, content_key, items, results)
+        self._update_score(sum(results), len(views), level, state_key)
+
+    def _render_paged_choices(self, views, state_key: str, prompt: str):
+        """
+        Renders only the current page of a multiple-choice quiz (inside the quiz form); answers of
+        the other pages stay in current_answers and are restored when their page is shown again.
+        """
+        page_size = st.session_state.get('page_size', DEFAULT_PAGE_SIZE)
+        pages = max(1, math.ceil(len(views) / page_size))
+        page_key = f"page_{state_key}"
+        page = min(st.session_state.get(page_key, 0), pages - 1)
+        start = page * page_size
+        end = min(start + page_size, len(views))
+
+        for i in range(start, end):
+            view = views[i]
+            st.markdown(view.label)
+            selected_option_label = st.radio(
+                prompt,
+                options=view.options,
+                index=st.session_state.current_answers[i],
+                key=view.key
+            )
+            st.session_state.current_answers[i] = view.option_index[selected_option_label]
+
+        if pages > 1:
+            col_prev, col_info, col_next = st.columns([1, 2, 1])
+            # Page buttons submit the form, so the answers of the current page arrive with them
+            col_prev.form_submit_button("◀ Previous", key=f"{page_key}_prev", disabled=page == 0,
+                                        on_click=self._turn_page, args=(views, start, end, page_key, page - 1))
+            col_info.markdown(
+                f"<div style='text-align: center'>Page {page + 1} of {pages} "
+                f"(questions {start + 1}-{end} of {len(views)})</div>",
+                unsafe_allow_html=True,
+            )
+            col_next.form_submit_button("Next ▶", key=f"{page_key}_next", disabled=page == pages - 1,
+                                        on_click=self._turn_page, args=(views, start, end, page_key, page + 1))
+
+    def _record_results(self, level: str, content_key: str, items: List[Dict], results: List[bool]):
+        """
+        Feeds per-question correctness of a graded quiz into the learner's review schedule
+        (vocabulary/grammar), ability estimate, mistake weights and the response log used for calibration.
+        """
+        if content_key in SRS_SKILLS:
+            st.session_state.review_scheduler.record_results(
+                level, content_key, [item["id"] for item in items], results
+            )
+        keys = [key for item in items for key in question_keys(item)]
+
+        # An item counts as missed if any of its questions was answered wrongly
+        item_results, start = [], 0
+        for item in items:
+            end = start + len(question_keys(item))
+            item_results.append(all(results[start:end]))
+            start = end
+        st.session_state.error_weights.record(level, content_key, [item["id"] for item in items], item_results)
+
+        difficulties = load_difficulties()
+        st.session_state.ability.update([difficulties.get(key, 0.0) for key in keys], results)
+        log_responses(st.session_state.learner_id, keys, results)
 
     def _update_score(self, correct_count, total_count, level, state_key):
         """
-        Updates global score, total exercises, and level progress.
-        FIX: Added st.rerun() call back to force immediate transition to results view.
+        Updates global score, total exercises, and level progress, and moves the exercise to graded.
+        Called from callbacks; the feedback message is shown by the results view of the next run.
         """
         st.session_state.score += correct_count
         st.session_state.total_exercises += 1
         st.session_state.user_progress[level] += correct_count / total_count
         
-        # Display immediate feedback
+        # Immediate feedback, displayed above the detailed results
         if correct_count == total_count:
-            st.success(f"Perfect! You got all {total_count} questions correct! 🎉")
+            self._set_feedback(state_key, "success", f"Perfect! You got all {total_count} questions correct! 🎉")
         elif correct_count >= total_count * 0.7:
-            st.success(f"Great job! You got {correct_count}/{total_count} questions correct! 👍")
+            self._set_feedback(state_key, "success", f"Great job! You got {correct_count}/{total_count} questions correct! 👍")
         else:
-            st.warning(f"You got {correct_count}/{total_count} questions correct. Keep practicing! 💪")
+            self._set_feedback(state_key, "warning", f"You got {correct_count}/{total_count} questions correct. Keep practicing! 💪")
+
+        self._complete_exercise(state_key)
+
+    def _complete_exercise(self, state_key: str):
+        """answer -> graded, and flags the score change so the header and sidebar get refreshed."""
+        flow = st.session_state.exercise_flow
+        flow.advance(state_key, Phase.GRADED)
+        flow.score_changed()
+
+    def _set_feedback(self, state_key: str, kind: str, message: str):
+        st.session_state[f"feedback_{state_key}"] = (kind, message)
 
-        # Set checked state to display detailed results
-        st.session_state[f"checked_{state_key}"] = True
-        st.rerun() # FIX: This rerun is necessary to immediately switch the display mode
+    def _show_feedback(self, state_key: str):
+        """Displays (once) the message left by a callback for this exercise."""
+        feedback = st.session_state.pop(f"feedback_{state_key}", None)
+        if feedback is not None:
+            kind, message = feedback
+            getattr(st, kind)(message)
 
     
     # --- HEADER RENDERING (RESTORED) ---
@@ -434,19 +342,15 @@ class GoetheTrainer:
         
         with col1:
             # FIX: Using the same key "level_select" to stabilize the widget
-            selected_level = st.selectbox(
+            # The level change is applied in the on_change callback, before this run renders anything
+            st.selectbox(
                 "Select Your Level:",
                 options=list(self.levels.keys()),
                 format_func=lambda x: f"{x} - {self.levels[x]['name']}",
                 index=list(self.levels.keys()).index(st.session_state.current_level),
-                key="level_select"
+                key="level_select",
+                on_change=self._change_level
             )
-            # Only update if value changes
-            if selected_level != st.session_state.current_level:
-                 # Reset state when level changes
-                 self._reset_all_exercises()
-                 st.session_state.current_level = selected_level
-                 st.rerun()
         
         with col2:
             st.info(f"**Current Level:** {st.session_state.current_level}")
@@ -456,11 +360,40 @@ class GoetheTrainer:
             st.metric("Score", st.session_state.score)
             st.metric("Exercises Completed", st.session_state.total_exercises)
 
+    def _change_level(self):
+        """on_change callback of the level selector: resets all exercises for the new level."""
+        self._reset_all_exercises()
+        st.session_state.current_level = st.session_state.level_select
+
+    def _change_exercise_type(self):
+        """on_change callback of the exercise type menu: a graded exercise of the new type starts over."""
+        exercise_type = st.session_state.exercise_type_select
+        st.session_state.current_exercise_type = exercise_type
+        state_key = EXERCISE_TYPES.get(exercise_type)
+        if state_key and st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
+            st.session_state[state_key] = None
+            st.session_state.exercise_flow.reset(state_key)
+
+    def _reset_progress(self):
+        """on_click callback of 'Reset Progress'."""
+        st.session_state.score = 0
+        st.session_state.total_exercises = 0
+        st.session_state.user_progress = {level: 0 for level in self.levels.keys()}
+        st.session_state.review_scheduler = ReviewScheduler()
+        st.session_state.ability = AbilityEstimate()
+        st.session_state.seen_items = SeenSet()
+        st.session_state.error_weights = ErrorWeights()
+        st.session_state.exercise_flow = ExerciseFlow()
+        st.session_state.pronunciation_scores = {}
+        # Ensure all exercises are rerandomized on full reset
+        self._reset_all_exercises()
+        st.session_state.progress_reset = True
+
     def _reset_all_exercises(self):
         """Helper to clear all exercise data when level changes."""
         for state_key in EXERCISE_TYPES.values():
             st.session_state[state_key] = None
-            st.session_state[f"checked_{state_key}"] = False
+            st.session_state.exercise_flow.reset(state_key)
         st.session_state.current_answers = []
 
     # --- EXERCISE RENDERING ---
@@ -481,14 +414,14 @@ class GoetheTrainer:
         
         # Since reading is designed to be one passage with embedded questions:
         exercise = exercise_list[0] 
-        questions = exercise["questions"]
+        questions = selection_views(st.session_state[state_key])[0]
         
         # Initialize/resize answers list
         if len(st.session_state.current_answers) != len(questions):
             st.session_state.current_answers = [0] * len(questions)
 
         # Check if results should be displayed
-        if st.session_state.get(f"checked_{state_key}"):
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
             self._render_results(questions, level, state_key, "reading")
             return
         
@@ -499,28 +432,25 @@ class GoetheTrainer:
         st.markdown("---")
         st.markdown("**Answer the questions (Multiple Choice):**")
         
-        # Display questions and capture answers
-        for i, question in enumerate(questions):
-            # FIX: Stable key based on exercise ID and question index
-            options_key = f"{exercise['id']}_q_{i}"
-            
-            # Use index() to map the currently selected option back to the list index for storage
-            selected_option_label = st.radio(
-                f"**{question['q']}**",
-                options=question["options"],
-                # FIX: Set the default index based on stored answer index
-                index=st.session_state[answers_state_key][i] if i < len(st.session_state[answers_state_key]) else 0,
-                key=options_key
-            )
-            
-            # FIX: Store the selected index
-            st.session_state[answers_state_key][i] = question["options"].index(selected_option_label)
-        
-        # Button to submit and check answers
-        if st.button("Check Answers", key="reading_check", type="primary"):
-            correct_count = sum(1 for i, q in enumerate(questions) 
-                                if st.session_state.current_answers[i] == q["correct"])
-            self._update_score(correct_count, len(questions), level, state_key)
+        # Answers are collected client-side in a form and sent once with the check button
+        with st.form("reading_form"):
+            # Display questions and capture answers (keys, labels and option lookups are precompiled)
+            for i, view in enumerate(questions):
+                selected_option_label = st.radio(
+                    view.label,
+                    options=view.options,
+                    # FIX: Set the default index based on stored answer index
+                    index=st.session_state[answers_state_key][i] if i < len(st.session_state[answers_state_key]) else 0,
+                    key=view.key
+                )
+
+                # FIX: Store the selected index
+                st.session_state[answers_state_key][i] = view.option_index[selected_option_label]
+
+            # Button to submit and check answers (graded in the callback, before the next run)
+            st.form_submit_button("Check Answers", key="reading_check", type="primary",
+                                  on_click=self._grade_choices,
+                                  args=(level, "reading", state_key, questions, exercise_list))
 
 
     def vocabulary_exercise(self, level: str):
@@ -535,36 +465,31 @@ class GoetheTrainer:
         if vocab_items is None:
             st.warning(f"No vocabulary exercises available for {level} yet.")
             return
+        vocab_views = [views[0] for views in selection_views(st.session_state[state_key])]
 
         # Initialize/resize answers list
         if len(st.session_state.current_answers) != len(vocab_items):
             st.session_state.current_answers = [0] * len(vocab_items)
 
         
-        if st.session_state.get(f"checked_{state_key}"):
-            self._render_results(vocab_items, level, state_key, "vocabulary")
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
+            self._render_results(vocab_views, level, state_key, "vocabulary")
             return
 
         # --- INPUT PHASE ---
         st.markdown("**Choose the correct English translation:**")
 
-        # Display questions and capture answers
-        for i, item in enumerate(vocab_items):
-            options_key = f"{item['id']}_v_{i}"
-            
-            st.markdown(f"**{item['german']}**")
-            selected_option_label = st.radio(
-                "Select the correct translation:",
-                options=item["options"],
-                index=st.session_state.current_answers[i],
-                key=options_key
-            )
-            st.session_state.current_answers[i] = item["options"].index(selected_option_label)
-        
-        if st.button("Check Vocabulary", key="vocab_check", type="primary"):
-            correct_count = sum(1 for i, item in enumerate(vocab_items) 
-                                if st.session_state.current_answers[i] == item["options"].index(item["english"]))
-            self._update_score(correct_count, len(vocab_items), level, state_key)
+        if st.session_state.get('instant_feedback'):
+            self._render_instant_quiz(level, "vocabulary", state_key, vocab_views, vocab_items,
+                                      "Select the correct translation:")
+            return
+
+        # Display the current page of questions and capture answers; nothing is sent until a form button is pressed
+        with st.form("vocabulary_form"):
+            self._render_paged_choices(vocab_views, state_key, "Select the correct translation:")
+            st.form_submit_button("Check Vocabulary", key="vocab_check", type="primary",
+                                  on_click=self._grade_choices,
+                                  args=(level, "vocabulary", state_key, vocab_views, vocab_items))
 
 
     def grammar_exercise(self, level: str):
@@ -579,44 +504,38 @@ class GoetheTrainer:
         if grammar_items is None:
             st.warning(f"No grammar exercises available for {level} yet.")
             return
+        grammar_views = [views[0] for views in selection_views(st.session_state[state_key])]
 
         # Initialize/resize answers list
         if len(st.session_state.current_answers) != len(grammar_items):
             st.session_state.current_answers = [0] * len(grammar_items)
 
         
-        if st.session_state.get(f"checked_{state_key}"):
-            self._render_results(grammar_items, level, state_key, "grammar")
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
+            self._render_results(grammar_views, level, state_key, "grammar")
             return
 
         # --- INPUT PHASE ---
         st.markdown("**Fill in the blanks with the correct option:**")
 
-        # Display questions and capture answers
-        for i, item in enumerate(grammar_items):
-            options_key = f"{item['id']}_g_{i}"
-            
-            st.markdown(f"**{item['q']}**")
-            selected_option_label = st.radio(
-                "Select the correct option:",
-                options=item["options"],
-                index=st.session_state.current_answers[i],
-                key=options_key
-            )
-            st.session_state.current_answers[i] = item["options"].index(selected_option_label)
-        
-        if st.button("Check Grammar", key="grammar_check", type="primary"):
-            correct_count = sum(1 for i, item in enumerate(grammar_items) 
-                                if st.session_state.current_answers[i] == item["correct"])
-            self._update_score(correct_count, len(grammar_items), level, state_key)
+        if st.session_state.get('instant_feedback'):
+            self._render_instant_quiz(level, "grammar", state_key, grammar_views, grammar_items,
+                                      "Select the correct option:")
+            return
+
+        # Display the current page of questions and capture answers; nothing is sent until a form button is pressed
+        with st.form("grammar_form"):
+            self._render_paged_choices(grammar_views, state_key, "Select the correct option:")
+            st.form_submit_button("Check Grammar", key="grammar_check", type="primary",
+                                  on_click=self._grade_choices,
+                                  args=(level, "grammar", state_key, grammar_views, grammar_items))
 
     def writing_exercise(self, level: str):
         """Writing exercise (Goethe Schreiben)"""
         state_key = EXERCISE_TYPES["Schreiben (Writing)"] # FIX: Used EXERCISE_TYPES
         st.subheader("✍️ Writing Exercise (Schreiben)")
         
-        prompt_list = CONTENT_DB.get(level, {}).get("writing", [])
-        if not prompt_list:
+        if not load_content().ids(level, "writing"):
              st.warning(f"No writing prompts available for {level} yet.")
              return
         
@@ -630,16 +549,18 @@ class GoetheTrainer:
         st.markdown("**Writing Prompt:**")
         st.info(prompt)
         
+        text_key = f"writing_{level}_{prompt_data['id']}"
         user_text = st.text_area(
             "Write your response here:",
             height=200,
-            key=f"writing_{level}_{prompt_data['id']}"
+            key=text_key
         )
         
         col1, col2 = st.columns(2)
         
-        if st.session_state.get(f"checked_{state_key}"):
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
              st.markdown("---")
+             self._show_feedback(state_key)
              st.success("Exercise marked complete.")
              # FIX: Use on_click callback
              if st.button("Next Writing Prompt", key="writing_next_after_check", on_click=self._reset_exercise, args=(state_key, 'current_answers')):
@@ -647,23 +568,32 @@ class GoetheTrainer:
              return
 
         with col1:
-            if st.button("Submit Writing & Mark Complete", key="writing_submit", type="primary"):
-                if user_text.strip():
-                    word_count = len(user_text.split())
-                    
-                    st.session_state.total_exercises += 1
-                    st.session_state.user_progress[level] += 1.0 # Full point for attempt
-                    st.session_state[f"checked_{state_key}"] = True
-                    
-                    st.success(f"Writing submitted! Word count: {word_count}. Feedback would be generated by LLM here.")
-                    st.rerun()
-                else:
-                    st.warning("Please write something before submitting.")
+            st.button("Submit Writing & Mark Complete", key="writing_submit", type="primary",
+                      on_click=self._submit_writing, args=(level, state_key, text_key))
+            self._show_feedback(state_key)
         
         with col2:
             if user_text:
                 st.metric("Word Count", len(user_text.split()))
 
+    def _submit_writing(self, level: str, state_key: str, text_key: str):
+        """on_click callback of the writing submit button."""
+        if st.session_state.exercise_flow.phase(state_key) is not Phase.ANSWER:
+            return
+        user_text = st.session_state.get(text_key) or ""
+        if not user_text.strip():
+            self._set_feedback(state_key, "warning", "Please write something before submitting.")
+            return
+        word_count = len(user_text.split())
+
+        st.session_state.total_exercises += 1
+        st.session_state.user_progress[level] += 1.0 # Full point for attempt
+        self._set_feedback(
+            state_key, "success",
+            f"Writing submitted! Word count: {word_count}. Feedback would be generated by LLM here."
+        )
+        self._complete_exercise(state_key)
+
     def listening_exercise(self, level: str):
         """Listening comprehension exercise (Goethe Hören)"""
         state_key = EXERCISE_TYPES["Hören (Listening)"] # FIX: Used EXERCISE_TYPES
@@ -677,26 +607,19 @@ class GoetheTrainer:
             return
 
         exercise = exercise_list[0]
-        questions = exercise["questions"]
+        questions = selection_views(st.session_state[state_key])[0]
         if len(st.session_state.current_answers) != len(questions):
             st.session_state.current_answers = [0] * len(questions)
 
         
-        if st.session_state.get(f"checked_{state_key}"):
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
             self._render_results(questions, level, state_key, "listening")
             return
         
         # --- INPUT PHASE ---
         st.markdown(f"**Scenario:** *{self.levels[level]['name']} Level Listening*")
         
-        # FIX: Render actual HTML button to trigger JS TTS function
-        # FIX: Correctly escape quotes inside the f-string for the JS call
-        escaped_transcript = exercise['transcript'].replace("'", "\\'")
-        st.markdown(f"""
-            <button onclick="speakGerman('{escaped_transcript}')">
-                🔊 Play Audio
-            </button>
-        """, unsafe_allow_html=True)
+        self._play_passage(exercise, key=f"speak_{state_key}")
         
         with st.expander("Show Transcript (for practice/checking)"):
             st.markdown(f"*{exercise['transcript']}*")
@@ -704,21 +627,19 @@ class GoetheTrainer:
         st.markdown("---")
         st.markdown("**Answer the questions based on what you heard:**")
 
-        for i, question in enumerate(questions):
-            options_key = f"{exercise['id']}_l_{i}"
-            
-            selected_option_label = st.radio(
-                f"**{question['q']}**",
-                options=question["options"],
-                index=st.session_state.current_answers[i],
-                key=options_key
-            )
-            st.session_state.current_answers[i] = question["options"].index(selected_option_label)
-        
-        if st.button("Check Listening", key="listening_check", type="primary"):
-            correct_count = sum(1 for i, q in enumerate(questions) 
-                                if st.session_state.current_answers[i] == q["correct"])
-            self._update_score(correct_count, len(questions), level, state_key)
+        with st.form("listening_form"):
+            for i, view in enumerate(questions):
+                selected_option_label = st.radio(
+                    view.label,
+                    options=view.options,
+                    index=st.session_state.current_answers[i],
+                    key=view.key
+                )
+                st.session_state.current_answers[i] = view.option_index[selected_option_label]
+
+            st.form_submit_button("Check Listening", key="listening_check", type="primary",
+                                  on_click=self._grade_choices,
+                                  args=(level, "listening", state_key, questions, exercise_list))
 
     def pronunciation_exercise(self, level: str):
         """Pronunciation practice (Goethe Sprechen)"""
@@ -733,56 +654,135 @@ class GoetheTrainer:
             return
         
         st.markdown("**Practice pronouncing these German words:**")
-        st.markdown("*Note: In a full deployment, this would include audio playback and recording features.*")
-        
+        can_score = speech.available()
+        if can_score:
+            st.markdown("*Play a word, then record yourself: your recording is compared with the reference voice.*")
+
+        scores = []
         for i, item in enumerate(pron_items):
             with st.expander(f"Word {i+1}: **{item['word']}**"):
+                if item.get('ipa'):
+                    st.markdown(f"**IPA:** {item['ipa']}")
                 st.markdown(f"**Meaning:** {item['meaning']}")
                 
-                # FIX: Render actual HTML button to trigger JS TTS function
-                escaped_word = item['word'].replace("'", "\\'")
-                st.markdown(f"""
-                    <button onclick="speakGerman('{escaped_word}')">
-                        🔊 Play Word
-                    </button>
-                    <p style="margin-top: 10px; font-size: 0.9em; color: #555;">🎤 Recording feature placeholder.</p>
-                """, unsafe_allow_html=True)
+                self._play_audio(item, key=f"speak_{item['id']}", label="🔊 Play Word")
+                if not can_score:
+                    st.caption("🎤 Recording and scoring need the server voice (espeak-ng).")
+                    continue
+                record_key = f"record_{item['id']}"
+                st.audio_input("🎤 Record yourself", key=record_key,
+                               on_change=self._score_recording, args=(item['id'], item['word']))
+                result = st.session_state.pronunciation_scores.get(item['id'])
+                if st.session_state.get(record_key) is None or result is None:
+                    continue
+                if isinstance(result, str):
+                    st.warning(result)
+                else:
+                    scores.append(result.similarity)
+                    st.progress(result.similarity / 100, text=f"🎯 Similarity to the reference: {result.similarity}%")
+
+        if scores:
+            st.caption(f"🎯 Average similarity: {sum(scores) / len(scores):.0f}% over {len(scores)} recorded word(s)")
             
-        if st.session_state.get(f"checked_{state_key}"):
+        if st.session_state.exercise_flow.phase(state_key) is Phase.GRADED:
              st.success("Pronunciation marked as practiced.")
              # FIX: Use on_click callback
              if st.button("Next Pronunciation Set", key="pron_next_after_check", on_click=self._reset_exercise, args=(state_key, 'current_answers')):
                  pass
              return
         
-        if st.button("Mark as Practiced", key="pronunciation_done", type="primary"):
-            st.session_state.total_exercises += 1
-            st.session_state.user_progress[level] += 1.0 # Full point for attempting
-            st.session_state[f"checked_{state_key}"] = True
-            st.rerun()
+        st.button("Mark as Practiced", key="pronunciation_done", type="primary",
+                  on_click=self._mark_practiced, args=(level, state_key))
+
+    def _playback_speed(self) -> float:
+        return st.session_state.get('playback_speed', speech.DEFAULT_SPEED)
 
-    def _render_results(self, exercise_items, level, state_key, content_key):
+    def _play_audio(self, item, key: str, label: str = "🔊 Play Audio", speed: Optional[float] = None):
+        """
+        Audio player for a transcript or word at the chosen playback speed: server-rendered and cached
+        (speech.py) when a TTS engine is installed, otherwise the browser TTS button (tts_player.py).
+        """
+        speed = self._playback_speed() if speed is None else speed
+        path = speech.clip_path(speech.spoken_text(item), speed, passage="transcript" in item)
+        if path is not None:
+            st.audio(str(path), format="audio/wav")
+        else:
+            speak_button(item, key=key, label=label, rate=speed)
+
+    def _play_passage(self, item, key: str):
+        """
+        Listening audio with per-sentence replay (server-side TTS only). Sentence clips are rendered and
+        sent one at a time, so the first can be played while the rest are still prepared; the full-passage
+        player above them is filled in last, joined from the cached sentence clips.
+        """
+        sentences = speech.split_sentences(item['transcript']) if speech.available() else []
+        if len(sentences) <= 1:
+            self._play_audio(item, key)
+            return
+
+        speed = self._playback_speed()
+        passage = st.empty()
+        passage.caption("🔊 Preparing the full passage...")
+        with st.expander("🔁 Replay a sentence", expanded=True):
+            for i, sentence in enumerate(sentences):
+                col_label, col_audio = st.columns([1, 6])
+                col_label.markdown(f"**Satz {i + 1}**")
+                path = speech.clip_path(sentence, speed)
+                if path is not None:
+                    col_audio.audio(str(path), format="audio/wav")
+                else:
+                    col_audio.caption("Audio unavailable")
+
+        path = speech.clip_path(item['transcript'], speed, passage=True)
+        if path is not None:
+            passage.audio(str(path), format="audio/wav")
+        else:
+            with passage.container():
+                speak_button(item, key=key, rate=speed)
+
+    def _score_recording(self, item_id: str, word: str):
+        """on_change callback of a word's recorder: each recording is scored once, not on every rerun."""
+        recording = st.session_state[f"record_{item_id}"]
+        scores = st.session_state.pronunciation_scores
+        scores.pop(item_id, None)
+        if recording is None:
+            return
+        try:
+            scores[item_id] = pronunciation.score_recording(recording.getvalue(), word)
+        except speech.SpeechError as e:
+            scores[item_id] = f"Could not score the recording: {e}"
+
+    def _mark_practiced(self, level: str, state_key: str):
+        """on_click callback of 'Mark as Practiced'."""
+        if st.session_state.exercise_flow.phase(state_key) is not Phase.ANSWER:
+            return
+        st.session_state.total_exercises += 1
+        st.session_state.user_progress[level] += 1.0 # Full point for attempting
+        self._complete_exercise(state_key)
+
+    def _render_results(self, question_views, level, state_key, content_key):
         """
         Centralized function to display detailed results and handle score updates (which already happened).
         FIX: Explicitly renders the context text (reading/listening) before detailed results.
         """
+        self._show_feedback(state_key)
         st.markdown("---")
 
         # Get the full exercise object list/item to retrieve context text
-        full_exercise_list = st.session_state[state_key]
+        full_exercise_list = resolve_selection(st.session_state[state_key])
 
         if content_key == "reading":
             # For reading, full_exercise_list is a list containing ONE item (the passage)
             full_exercise = full_exercise_list[0]
             st.subheader("📖 Reading Comprehension (Lesen)")
             st.markdown("**Text:**")
-            st.info(f"*{full_exercise.get('text')}*")
+            st.info(f"*{full_exercise['text']}*")
         elif content_key == "listening":
             # For listening, full_exercise_list is a list containing ONE item (the scenario)
             full_exercise = full_exercise_list[0]
             st.subheader("👂 Listening Comprehension (Hören)")
             st.markdown("**Scenario:**")
-            st.info(f"*{full_exercise.get('transcript')}*")
+            st.info(f"*{full_exercise['transcript']}*")
         
         st.markdown("---")
         st.markdown("**Detailed Results:**")
@@ -790,30 +790,9 @@ class GoetheTrainer:
         # Recalculate based on current state (answers already stored)
         user_answers_indices = st.session_state.current_answers
         
-        for i, item in enumerate(exercise_items):
-            user_choice_index = user_answers_indices[i]
-            
-            if content_key == "vocabulary":
-                # Find the correct English translation from the options array
-                correct_label = item["english"]
-                is_correct = (user_choice_index >= 0 and item["options"][user_choice_index] == correct_label)
-                question_text = f"{item['german']}"
-                user_choice_display = item["options"][user_choice_index] if user_choice_index >= 0 else "None selected"
-            else:
-                # Find the correct option using the stored index
-                correct_index = item["correct"]
-                correct_label = item["options"][correct_index]
-                is_correct = user_choice_index == correct_index
-                question_text = item.get("q") or item.get("prompt") or item.get("word")
-                user_choice_display = item["options"][user_choice_index] if user_choice_index >= 0 else "None selected"
-            
-            icon = "✅" if is_correct else "❌"
-            feedback_text = f"**{icon} {question_text}**"
-            
-            if not is_correct:
-                feedback_text += f"<br>_Correct Answer:_ **{correct_label}** (You selected: {user_choice_display})"
-            
-            st.markdown(feedback_text, unsafe_allow_html=True)
+        for i, view in enumerate(question_views):
+            # Feedback markdown for every possible answer is prebuilt in the view model
+            st.markdown(view.feedback[user_answers_indices[i]], unsafe_allow_html=True)
         
         # FIX: Use on_click callback with arguments for guaranteed scope stability
         # The action is triggered via the on_click callback
@@ -824,6 +803,150 @@ class GoetheTrainer:
             pass # Action handled by callback
 
 
+    # --- MOCK EXAM ---
+
+    def _start_exam(self, level: str):
+        """Assembles a full paper for the level in one pass (on_click callback, so no extra rerun)."""
+        content = load_content()
+        seed = st.session_state.get('exam_seed') or None
+        rng = seeded_rng(seed, level, "exam", content.version) if seed else st.session_state.rng
+        st.session_state.exam = assemble_exam(content, level, rng=rng)
+        st.session_state.exam_result = None
+        flow = st.session_state.exercise_flow
+        flow.reset("exam")
+        flow.advance("exam", Phase.ANSWER)
+
+    def mock_exam(self, level: str):
+        """Full mock exam (Lesen, Hören, Schreiben, Sprechen) submitted and graded once"""
+        state_key = EXERCISE_TYPES["Prüfung (Mock Exam)"]
+        st.subheader("📝 Mock Exam (Prüfung)")
+
+        flow = st.session_state.exercise_flow
+        paper = st.session_state[state_key]
+        # One batched lookup for every item and question view of the paper
+        sections = exam_sections(paper) if paper is not None and paper.level == level else None
+        if sections is None:
+            flow.reset(state_key)
+            blueprint = EXAM_BLUEPRINT[level]
+            st.markdown(f"**{self.levels[level]['name']}** - all four modules in one sitting, graded at the end:")
+            st.table(pd.DataFrame(
+                [(SECTION_TITLES[spec.skill], spec.items, f"{spec.minutes} min") for spec in blueprint],
+                columns=["Module", "Items", "Time"],
+            ))
+            st.caption(
+                f"Total time: {sum(spec.minutes for spec in blueprint)} minutes. Lesen and Hören are graded and "
+                f"decide the result (60% passes); Schreiben and Sprechen are self-assessed."
+            )
+            st.button("Start Exam", key="exam_start", type="primary", on_click=self._start_exam, args=(level,))
+            return
+
+        if flow.phase(state_key) is Phase.GRADED:
+            self._render_exam_results(st.session_state.exam_result, state_key)
+            return
+
+        remaining = paper.remaining()
+        if remaining < -SUBMIT_GRACE:
+            # The server clock ran out without a submission: the paper is collected unanswered.
+            # The header and sidebar were already rendered in this run, so rerun the app to show the new score.
+            self._finish_exam(paper, sections, {}, level)
+            st.rerun()
+
+        # Display-only countdown; the deadline itself is enforced on the server when grading
+        embed_html(
+            f"""
+            <div id="exam-timer" style="font-family: sans-serif; font-weight: 600;"></div>
+            <script>
+                const deadline = {paper.deadline * 1000:.0f};
+                const timer = document.getElementById("exam-timer");
+                function tick() {{
+                    const left = Math.max(0, Math.round((deadline - Date.now()) / 1000));
+                    timer.textContent = left > 0
+                        ? "⏱️ Time left: " + Math.floor(left / 60) + ":" + String(left % 60).padStart(2, "0")
+                        : "⏱️ Time is up - submit now, later answers are not accepted.";
+                }}
+                tick();
+                setInterval(tick, 1000);
+            </script>
+            """,
+            height=30,
+        )
+
+        # Answers are collected client-side and sent once with the submit button
+        with st.form("mock_exam_form"):
+            for section in sections:
+                skill = section.spec.skill
+                st.markdown(f"### {SECTION_TITLES[skill]} ({section.spec.minutes} min)")
+                for item, views in zip(section.items, section.views):
+                    if skill == "reading":
+                        st.info(f"*{item['text']}*")
+                    elif skill == "listening":
+                        # Exam conditions: natural speed
+                        self._play_audio(item, key=f"exam_speak_{item['id']}", speed=1.0)
+                    elif skill == "writing":
+                        st.markdown(f"**{item['prompt']}**")
+                        st.text_area(
+                            f"Your text (about {MIN_WORDS[level]} words):", key=text_key(item), height=150
+                        )
+                    else:
+                        st.checkbox(
+                            f"I said **{item['word']}** ({item['meaning']}) aloud", key=spoken_key(item)
+                        )
+                    for view in views:
+                        st.radio(
+                            view.label, options=view.options, index=None, key=choice_key(view)
+                        )
+                st.markdown("---")
+            st.form_submit_button("Submit Exam", type="primary", on_click=self._submit_exam, args=(level,))
+
+    def _submit_exam(self, level: str):
+        """on_click callback of 'Submit Exam': collects the form's answers and grades the paper."""
+        if st.session_state.exercise_flow.phase("exam") is not Phase.ANSWER:
+            return
+        paper = st.session_state.exam
+        sections = exam_sections(paper)
+        if sections is None:
+            return
+        keys = [text_key(item) for section in sections for item in section.items]
+        keys += [spoken_key(item) for section in sections for item in section.items]
+        keys += [choice_key(view) for section in sections for views in section.views for view in views]
+        self._finish_exam(paper, sections, {key: st.session_state.get(key) for key in keys}, level)
+
+    def _finish_exam(self, paper, sections, answers, level):
+        """Single grading pass over the whole paper; updates the score once (answer -> graded)."""
+        if st.session_state.exercise_flow.phase("exam") is not Phase.ANSWER:
+            return
+        result = grade_exam(paper, sections, answers)
+        st.session_state.exam_result = result
+        st.session_state.score += int(sum(
+            section.points for section in result.sections if section.skill in ("reading", "listening")
+        ))
+        st.session_state.total_exercises += 1
+        st.session_state.user_progress[level] += result.total
+        self._complete_exercise("exam")
+
+    def _render_exam_results(self, result, state_key):
+        """Displays per-module scores and the detailed answers of a graded exam."""
+        if result.late:
+            st.error("Time was up before the exam was submitted; answers given after the deadline are not counted.")
+        if result.passed:
+            st.success(f"Bestanden! Lesen and Hören score: {result.total:.0%} 🎉")
+        else:
+            st.warning(f"Nicht bestanden. Lesen and Hören score: {result.total:.0%} (60% needed). Keep practicing! 💪")
+
+        columns = st.columns(len(result.sections))
+        for column, section in zip(columns, result.sections):
+            title = SECTION_TITLES[section.skill] + (" (self-assessed)" if section.self_assessed else "")
+            column.metric(title, f"{section.score:.0%}")
+        st.caption("Self-assessed modules (word count, spoken words you ticked) are shown for practice "
+                   "and do not count toward the result.")
+
+        for section in result.sections:
+            with st.expander(f"{SECTION_TITLES[section.skill]}: {section.points:g}/{section.max_points:g}"):
+                for detail in section.details:
+                    st.markdown(detail, unsafe_allow_html=True)
+
+        st.button("New Exam", key=f"next_{state_key}", on_click=self._reset_exercise, args=(state_key, 'current_answers'))
+
     def display_progress(self):
         """Display user progress and statistics"""
         st.subheader("📈 Your Progress")
@@ -851,15 +974,66 @@ class GoetheTrainer:
             
             st.metric("Total Score", total_score)
             st.metric("Exercises Completed", total_exercises)
+            if len(st.session_state.ability):
+                st.metric("Estimated Ability", f"{st.session_state.ability.theta:+.2f}")
+            flow = st.session_state.exercise_flow
+            if flow.completed:
+                st.caption(f"Reruns per completed exercise: {flow.runs_per_exercise:.1f}")
+
+    def display_search(self):
+        """Full-text search over the content (offered when the SQLite content backend is active)"""
+        content = load_content()
+        if not hasattr(content, "search"):
+            return
+
+        st.subheader("🔎 Search Content")
+        query = st.text_input("Search texts, transcripts, questions and words:", key="content_search")
+        if not query:
+            return
+
+        hits = content.search(query)
+        if not hits:
+            st.caption("No matches found.")
+        for item_id, level, skill, snippet in hits:
+            st.markdown(f"`{content.item(item_id)['id']}` ({level}, {skill}): {snippet}")
+
+    @fragment
+    def exercise_panel(self):
+        """
+        The active exercise. Runs as a fragment: answering, paging and 'Next Exercise' rerun only
+        this panel; a run that changed the score is escalated to a full-app rerun so the header and
+        sidebar show it.
+        """
+        current_level = st.session_state.current_level
+        exercise_type = st.session_state.current_exercise_type
+        flow = st.session_state.exercise_flow
+        # Counted before escalating: the escalated fragment run and the full run it triggers both cost a run
+        flow.record_run(EXERCISE_TYPES[exercise_type])
+        if flow.score_revision != flow.rendered_revision:
+            st.rerun()
+
+        # Route to appropriate exercise
+        if exercise_type == "Lesen (Reading)":
+            self.reading_exercise(current_level)
+        elif exercise_type == "Wortschatz (Vocabulary)":
+            self.vocabulary_exercise(current_level)
+        elif exercise_type == "Grammatik (Grammar Quiz)":
+            self.grammar_exercise(current_level)
+        elif exercise_type == "Sprechen (Pronunciation)":
+            self.pronunciation_exercise(current_level)
+        elif exercise_type == "Schreiben (Writing)":
+            self.writing_exercise(current_level)
+        elif exercise_type == "Hören (Listening)":
+            self.listening_exercise(current_level)
+        elif exercise_type == "Prüfung (Mock Exam)":
+            self.mock_exam(current_level)
 
     def run(self):
         """Main application runner"""
         
-        # FIX: Check the 'do_reset' flag early to trigger the final rerun
-        # This handles the transition from _reset_exercise to the next question.
-        if st.session_state.get('do_reset'):
-            st.session_state.do_reset = False
-            st.rerun()
+        # The header and sidebar below show the score as of this run
+        flow = st.session_state.exercise_flow
+        flow.rendered_revision = flow.score_revision
 
         # Display header
         self.display_header()
@@ -867,22 +1041,48 @@ class GoetheTrainer:
         # Sidebar for exercise selection
         st.sidebar.title("Exercise Menu")
         # Store the selected exercise type in session state for stability
-        exercise_type = st.sidebar.selectbox(
+        st.sidebar.selectbox(
             "Choose Exercise Type:",
             list(EXERCISE_TYPES.keys()),
             key='exercise_type_select',
-            index=list(EXERCISE_TYPES.keys()).index(st.session_state.current_exercise_type)
+            index=list(EXERCISE_TYPES.keys()).index(st.session_state.current_exercise_type),
+            on_change=self._change_exercise_type,
         )
 
-        # FIX: Check if exercise type has changed and reset the 'checked' state
-        if st.session_state.current_exercise_type != exercise_type:
-            st.session_state.current_exercise_type = exercise_type
-            
-            # Reset the 'checked' state when the exercise type changes to allow a new quiz
-            state_key = EXERCISE_TYPES.get(exercise_type) # FIX: Used EXERCISE_TYPES
-            if state_key:
-                st.session_state[f"checked_{state_key}"] = False
-            st.rerun()
+        st.sidebar.checkbox(
+            "🎯 Practice my mistakes",
+            key="practice_mistakes",
+            help="Serve items you answered wrongly more often in new exercises.",
+        )
+        st.sidebar.checkbox(
+            "⚡ Instant feedback",
+            key="instant_feedback",
+            help="Vocabulary and grammar quizzes are graded in your browser as you answer; "
+                 "the results are sent once, at the end.",
+        )
+        st.sidebar.selectbox(
+            "Questions per page:",
+            PAGE_SIZES,
+            index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE),
+            key="page_size",
+            help="Vocabulary and grammar quizzes show this many questions at a time.",
+        )
+        st.sidebar.selectbox(
+            "🐢 Playback speed:",
+            speech.SPEEDS,
+            index=speech.SPEEDS.index(speech.DEFAULT_SPEED),
+            format_func=lambda speed: f"{speed:g}×",
+            key="playback_speed",
+            help="Speed of the listening and pronunciation audio (the pitch stays the same).",
+        )
+        st.sidebar.text_input(
+            "🔢 Exam seed",
+            key="exam_seed",
+            on_change=self._reset_all_exercises,
+            help="Everyone using the same seed gets the same exercises for each level and skill.",
+        )
+        if st.session_state.get('exam_seed'):
+            st.sidebar.caption("Seeded exercises: your review history and ability are not used.")
         
         # Display progress in sidebar
         with st.sidebar:
@@ -890,33 +1090,16 @@ class GoetheTrainer:
             self.display_progress()
             
             # Reset progress button
-            if st.button("Reset Progress", key="reset_progress"):
-                st.session_state.score = 0
-                st.session_state.total_exercises = 0
-                st.session_state.user_progress = {level: 0 for level in self.levels.keys()}
-                # Ensure all exercises are rerandomized on full reset
-                self._reset_all_exercises()
+            st.button("Reset Progress", key="reset_progress", on_click=self._reset_progress)
+            if st.session_state.pop('progress_reset', False):
                 st.success("Progress reset!")
-                st.rerun()
+
+            st.markdown("---")
+            self.display_search()
         
         # Main content area
         st.markdown("---")
-        
-        current_level = st.session_state.current_level
-        
-        # Route to appropriate exercise
-        if exercise_type == "Lesen (Reading)":
-            self.reading_exercise(current_level)
-        elif exercise_type == "Wortschatz (Vocabulary)":
-            self.vocabulary_exercise(current_level)
-        elif exercise_type == "Grammatik (Grammar Quiz)":
-            self.grammar_exercise(current_level)
-        elif exercise_type == "Sprechen (Pronunciation)":
-            self.pronunciation_exercise(current_level)
-        elif exercise_type == "Schreiben (Writing)":
-            self.writing_exercise(current_level)
-        elif exercise_type == "Hören (Listening)":
-            self.listening_exercise(current_level)
+        self.exercise_panel()
             
         # Footer
         st.markdown("---")
@@ -0,0 +1,76 @@
+"""Signal processing helpers of the audio features (audio_dsp.py)."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+RATE = 22050
+
+
+@pytest.fixture(autouse=True)
+def _repo_on_path(monkeypatch):
+    monkeypatch.syspath_prepend(str(ROOT))
+
+
+def _tone(seconds, hz=440.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.5 * np.sin(2 * np.pi * hz * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("speed", [0.5, 0.75, 0.9, 1.25, 1.5, 2.0])
+@pytest.mark.parametrize("length", [1, 700, 22050, 33333])
+def test_time_stretch_output_length(speed, length):
+    from audio_dsp import time_stretch
+
+    samples = np.random.default_rng(length).uniform(-0.5, 0.5, length).astype(np.float32)
+    assert len(time_stretch(samples, speed)) == int(round(length / speed))
+
+
+def test_time_stretch_keeps_the_pitch():
+    from audio_dsp import time_stretch
+
+    stretched = time_stretch(_tone(1.0), 0.75)
+    spectrum = np.abs(np.fft.rfft(stretched * np.hanning(len(stretched))))
+    peak_hz = np.argmax(spectrum) * RATE / len(stretched)
+    assert peak_hz == pytest.approx(440.0, abs=3.0)
+
+
+def test_time_stretch_identity_and_invalid_speed():
+    from audio_dsp import time_stretch
+
+    samples = _tone(0.1)
+    assert time_stretch(samples, 1.0) is samples
+    assert len(time_stretch(np.zeros(0, dtype=np.float32), 1.5)) == 0
+    with pytest.raises(ValueError):
+        time_stretch(samples, 0.0)
+
+
+def _naive_dtw(a, b):
+    n, m = len(a), len(b)
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = np.linalg.norm(a[i - 1] - b[j - 1])
+            acc[i, j] = cost + min(acc[i - 1, j - 1], acc[i - 1, j], acc[i, j - 1])
+    return acc[n, m] / (n + m)
+
+
+@pytest.mark.parametrize("n, m", [(1, 1), (1, 7), (7, 1), (5, 5), (12, 30), (41, 17)])
+def test_dtw_distance_matches_the_naive_recurrence(n, m):
+    from audio_dsp import dtw_distance
+
+    rng = np.random.default_rng(n * 100 + m)
+    a, b = rng.normal(size=(n, 13)), rng.normal(size=(m, 13))
+    assert dtw_distance(a, b) == pytest.approx(_naive_dtw(a, b), rel=1e-9)
+
+
+def test_dtw_distance_ignores_tempo():
+    from audio_dsp import dtw_distance
+
+    a = np.random.default_rng(3).normal(size=(20, 13))
+    slow = np.repeat(a, 2, axis=0)
+    assert dtw_distance(a, a) == pytest.approx(0.0, abs=1e-6)
+    assert dtw_distance(a, slow) == pytest.approx(0.0, abs=1e-6)
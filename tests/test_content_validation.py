@@ -0,0 +1,129 @@
+"""Content validation (content_pack.compile_content) and the CSV reader of compile_pack.py."""
+
+import copy
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def _repo_on_path(monkeypatch):
+    monkeypatch.syspath_prepend(str(ROOT))
+
+
+def _level(level):
+    return {
+        "reading": [{"id": f"{level}_R1", "text": "Ich wohne in München.",
+                     "questions": [{"q": "Wo?", "options": ["Berlin", "München"], "correct": 1}]}],
+        "listening": [{"id": f"{level}_L1", "transcript": "Guten Tag.",
+                       "questions": [{"q": "Was?", "options": ["Hallo", "Tschüs"], "correct": 0}]}],
+        "writing": [{"id": f"{level}_W1", "prompt": "Schreiben Sie drei Sätze."}],
+        "pronunciation": [{"id": f"{level}_P1", "word": "tschüs", "meaning": "bye"}],
+        "grammar": [{"id": f"{level}_G1", "q": "Er __ aus der Schweiz.", "options": ["komme", "kommt"], "correct": 1}],
+        "vocabulary": [{"id": f"{level}_V1", "german": "der Hund", "english": "dog", "options": ["cat", "dog"]}],
+    }
+
+
+def _content():
+    return {"A1": _level("A1"), "A2": _level("A2")}
+
+
+def _correct_out_of_range(c):
+    c["A1"]["grammar"][0]["correct"] = 2
+
+
+def _english_not_in_options(c):
+    c["A1"]["vocabulary"][0]["english"] = "house"
+
+
+def _duplicate_id(c):
+    c["A1"]["vocabulary"].append({"id": "A1_G1", "german": "das Haus", "english": "house", "options": ["house", "dog"]})
+
+
+def _id_under_wrong_level(c):
+    c["A1"]["writing"].append(c["A2"]["writing"].pop())
+    c["A2"]["writing"].append({"id": "A2_W2", "prompt": "Ein Brief."})
+
+
+def _empty_pool(c):
+    c["A2"]["pronunciation"] = []
+
+
+def _question_correct_out_of_range(c):
+    c["A1"]["reading"][0]["questions"][0]["correct"] = -1
+
+
+def _unknown_skill(c):
+    c["A1"]["speaking"] = []
+
+
+@pytest.mark.parametrize("mutate, message", [
+    (_correct_out_of_range, "A1.grammar[0] (A1_G1): 'correct' must be an index into options (0..1), got 2"),
+    (_question_correct_out_of_range, "A1.reading[0] (A1_R1).questions[0]: 'correct' must be an index"),
+    (_english_not_in_options, "A1.vocabulary[0] (A1_V1): 'english' ('house') must be one of 'options'"),
+    (_duplicate_id, "A1.vocabulary[1] (A1_G1): duplicate id, already used at A1.grammar[0]"),
+    (_id_under_wrong_level, "A1.writing[1] (A2_W1): id belongs to level A2 but is listed under A1"),
+    (_empty_pool, "A2.pronunciation: empty pool"),
+    (_unknown_skill, "A1.speaking: unknown skill"),
+])
+def test_invalid_content_is_reported(mutate, message):
+    from content_pack import ContentError, compile_content
+
+    content = _content()
+    mutate(content)
+    with pytest.raises(ContentError) as excinfo:
+        compile_content(content)
+    assert message in str(excinfo.value)
+
+
+def test_valid_content_compiles_to_canonical_form():
+    from content_pack import compile_content
+
+    source = _content()
+    compiled = compile_content(copy.deepcopy(source))
+    assert compiled["A1"]["vocabulary"][0]["correct"] == 1
+    assert [item["id"] for item in compiled["A2"]["grammar"]] == ["A2_G1"]
+    assert source == _content()    # the authoring source is left untouched
+
+
+def test_csv_rows_sharing_an_id_become_one_item(tmp_path):
+    from compile_pack import read_csv
+    from content_pack import compile_content
+
+    path = tmp_path / "extra.csv"
+    path.write_text(
+        "level,skill,id,text,transcript,q,options,correct\n"
+        "A1,reading,A1_R9,Ich heiße Anna.,,Wie heißt sie?,Anna|Eva,0\n"
+        "A1,reading,A1_R9,,,Ist sie Lehrerin?,ja|nein,1\n"
+        "A1,listening,A1_L9,,Guten Morgen.,Wann?,morgens|abends,0\n"
+        "A1,listening,A1_L9,,,Wer?,Anna|Eva,1\n",
+        encoding="utf-8",
+    )
+    source = read_csv(path)
+
+    reading, = source["A1"]["reading"]
+    assert reading["text"] == "Ich heiße Anna."
+    assert reading["questions"] == [
+        {"q": "Wie heißt sie?", "options": ["Anna", "Eva"], "correct": 0},
+        {"q": "Ist sie Lehrerin?", "options": ["ja", "nein"], "correct": 1},
+    ]
+    listening, = source["A1"]["listening"]
+    assert [q["q"] for q in listening["questions"]] == ["Wann?", "Wer?"]
+
+    content = _content()
+    content["A1"]["reading"] += source["A1"]["reading"]
+    content["A1"]["listening"] += source["A1"]["listening"]
+    compiled = compile_content(content)
+    assert len(compiled["A1"]["reading"][1]["questions"]) == 2
+
+
+def test_csv_rejects_a_non_integer_correct(tmp_path):
+    from compile_pack import read_csv
+    from content_pack import ContentError
+
+    path = tmp_path / "bad.csv"
+    path.write_text("level,skill,id,q,options,correct\nA1,grammar,A1_G9,Ich __.,bin|bist,first\n", encoding="utf-8")
+    with pytest.raises(ContentError, match=r"bad.csv:2: 'correct' must be an integer"):
+        read_csv(path)
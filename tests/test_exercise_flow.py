@@ -0,0 +1,30 @@
+"""Rerun accounting of the practice exercises (see exercise_flow.py), driven through Streamlit's AppTest."""
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "streamlit_app.py"
+
+
+def test_check_then_next_costs_two_runs_per_exercise(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(ROOT))
+    monkeypatch.setenv("GOETHE_RESPONSE_LOG", str(tmp_path / "responses.csv"))
+    monkeypatch.setenv("GOETHE_AUDIO_CACHE", str(tmp_path / "audio"))
+
+    at = AppTest.from_file(str(APP), default_timeout=60).run()
+    at.sidebar.selectbox(key="exercise_type_select").set_value("Grammatik (Grammar Quiz)").run()
+
+    for _ in range(3):
+        at.button(key="grammar_check").click().run()
+        assert not at.exception
+        assert at.session_state.exercise_flow.phase("grammar").value == "graded"
+        at.button(key="next_grammar").click().run()
+        assert at.session_state.exercise_flow.phase("grammar").value == "answer"
+
+    flow = at.session_state.exercise_flow
+    assert flow.completed == 3
+    # One run shows the exercise, the 'Check' click runs once more.  AppTest always reruns the whole
+    # script, so the fragment escalation (counted too in the browser) never happens here.
+    assert flow.runs_per_exercise == 2
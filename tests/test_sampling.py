@@ -0,0 +1,93 @@
+"""Per-learner sampling helpers (sampling.py)."""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def _repo_on_path(monkeypatch):
+    monkeypatch.syspath_prepend(str(ROOT))
+
+
+@pytest.fixture
+def source():
+    with open(ROOT / "content" / "goethe_content.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _pack(source):
+    from content_pack import compile_content, decode_pack, encode_pack
+
+    return decode_pack(encode_pack(compile_content(source)))
+
+
+def _keys(content, item_ids):
+    return {item["id"] for item in content.resolve(item_ids)}
+
+
+def test_served_items_carry_over_to_a_new_content_version(source, monkeypatch):
+    import sampling
+
+    old = _pack(source)
+    seen = sampling.SeenSet()
+    rng = random.Random(1)
+    served = _keys(old, seen.select(old, "A1", "grammar", 3, rng=rng))
+
+    # A new first grammar item shifts the integer ids of every later A1 item
+    source["A1"]["grammar"].insert(0, {"id": "A1_G_NEW", "q": "Ich __ müde.", "options": ["bin", "ist"], "correct": 0})
+    new = _pack(source)
+    assert new.lookup("A1_G1") != old.lookup("A1_G1")
+    monkeypatch.setattr(sampling, "content_for_version", {old.version: old, new.version: new}.get)
+
+    assert seen.seen_count(new, "A1", "grammar") == 3
+    pool_size = len(new.ids("A1", "grammar"))
+    rest = _keys(new, seen.select(new, "A1", "grammar", pool_size - 3, rng=rng))
+    assert not rest & served
+    assert "A1_G_NEW" in rest
+
+
+def test_served_items_are_kept_for_an_unchanged_pool_of_a_dropped_version(source, monkeypatch):
+    import sampling
+
+    old = _pack(source)
+    seen = sampling.SeenSet()
+    seen.select(old, "A1", "vocabulary", 2)
+    seen.select(old, "A2", "grammar", 2)
+
+    source["A2"]["grammar"].append({"id": "A2_G_NEW", "q": "Ich __ müde.", "options": ["bin", "ist"], "correct": 0})
+    new = _pack(source)
+    monkeypatch.setattr(sampling, "content_for_version", lambda version: None)
+
+    assert seen.seen_count(new, "A1", "vocabulary") == 2    # same ids: kept
+    assert seen.seen_count(new, "A2", "grammar") == 0       # pool changed: starts over
+
+
+@pytest.mark.parametrize("weights", [
+    [1.0],
+    [1.0, 1.0, 1.0, 1.0],
+    [4.0, 1.0, 0.5, 0.25, 12.0],
+    [0.001, 1000.0, 3.0],
+])
+def test_alias_table_reproduces_the_weights(weights):
+    from sampling import AliasTable
+
+    table = AliasTable(weights)
+    n = len(table)
+    # Each column i is picked with probability 1/n, then keeps i with prob[i] or yields alias[i]
+    exact = [table.prob[i] / n for i in range(n)]
+    for i in range(n):
+        exact[table.alias[i]] += (1.0 - table.prob[i]) / n
+    total = sum(weights)
+    assert exact == pytest.approx([w / total for w in weights], abs=1e-12)
+
+    rng = random.Random(7)
+    draws = 20000
+    counts = [0] * n
+    for _ in range(draws):
+        counts[table.draw(rng)] += 1
+    assert [c / draws for c in counts] == pytest.approx([w / total for w in weights], abs=0.015)
@@ -0,0 +1,87 @@
+"""
+"Play" buttons for German text-to-speech in the browser, as a static component.
+
+The speech script lives in frontend/tts_player/ and is served by Streamlit as
+component assets, so the browser fetches it once and caches it instead of
+receiving it again with every script run.  A button does not carry its text
+either: each spoken text is written once to a small file in the data
+directory (``GOETHE_TTS_TEXT_DIR``, data/tts_texts/ by default), named by the
+hash of the text, and the button only carries that name.  The directory is
+served as a second component, so the browser fetches a text on first use
+and keeps it in its cache.  If the directory cannot be written (read-only
+deployment) the button carries its text instead; component arguments are
+JSON-encoded, so quotes in a transcript need no escaping.
+
+Text files are named by their content and never change, so processes can
+write them concurrently and never need to delete each other's files; an edit
+to the content only adds files.  The directory can be emptied at any time
+the app is stopped.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Mapping, Optional, Set
+
+import streamlit.components.v1 as components
+
+from speech import DATA_DIR, spoken_text
+
+COMPONENT_DIR = Path(__file__).resolve().parent / "frontend" / "tts_player"
+TEXT_DIR = Path(os.environ.get("GOETHE_TTS_TEXT_DIR", DATA_DIR / "tts_texts"))
+
+logger = logging.getLogger(__name__)
+
+_component = components.declare_component("tts_player", path=str(COMPONENT_DIR))
+
+try:
+    TEXT_DIR.mkdir(parents=True, exist_ok=True)
+    _texts = components.declare_component("tts_texts", path=str(TEXT_DIR))
+except OSError as e:
+    logger.warning("Could not create %s, TTS buttons will carry their text: %s", TEXT_DIR, e)
+    _texts = None
+
+# Names of the text files this process has written or found
+_written: Set[str] = set()
+
+
+def _text_file(text: str) -> Optional[str]:
+    """Writes ``text`` to its hash-named file unless present; returns the file name, None if not writable."""
+    name = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32] + ".txt"
+    if name in _written:
+        return name
+    path = TEXT_DIR / name
+    if not path.exists():
+        try:
+            # A unique temp file per writer: several server processes may write the same text at once
+            fd, tmp_path = tempfile.mkstemp(dir=TEXT_DIR, prefix=name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.warning("Could not write TTS text %s, the button will carry its text: %s", path, e)
+            return None
+    _written.add(name)
+    return name
+
+
+def speak_button(item: Mapping, key: str, label: str = "🔊 Play Audio", rate: float = 0.9) -> None:
+    """Renders a button that reads the item aloud at ``rate`` (1.0 is the voice's natural speed)."""
+    text = spoken_text(item)
+    name = _text_file(text) if _texts is not None else None
+    _component(
+        # Relative to the player's own URL (component/<player name>/index.html)
+        text_url=f"../{_texts.name}/{name}" if name else None,
+        text=None if name else text,
+        label=label,
+        rate=rate,
+        key=key,
+        default=None,
+    )
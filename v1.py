@@ -4,6 +4,7 @@ import time
 from datetime import datetime
 from typing import Dict, List, Tuple
 import pandas as pd
+from content_pack import load_content
 
 # Configure Streamlit page
 st.set_page_config(
@@ -43,8 +44,8 @@ class GermanLearningGame:
         
         self.exercise_types = list(EXERCISE_KEYS.keys())
         
-        # Sample content database
-        self.content = self._initialize_content()
+        # Shared content pack (loaded once per server process, read-only)
+        self.content = load_content().levels
         
         # Initialize session state for game parameters
         if 'current_level' not in st.session_state:
@@ -63,105 +64,6 @@ class GermanLearningGame:
             if key not in st.session_state:
                 st.session_state[key] = None
 
-    def _initialize_content(self) -> Dict:
-        """Initialize the content database with exercises for each level"""
-        # NOTE: The structure for the content remains the same as provided.
-        return {
-            "A1": {
-                "reading": [
-                    {
-                        "id": "A1_R1",
-                        "text": "Hallo! Ich heiße Maria. Ich komme aus Deutschland. Ich bin 25 Jahre alt und ich wohne in Berlin. Ich arbeite als Lehrerin in einer Schule.",
-                        "questions": [
-                            {"q": "Wie heißt die Person?", "options": ["Maria", "Anna", "Lisa", "Emma"], "correct": 0},
-                            {"q": "Wo wohnt Maria?", "options": ["München", "Hamburg", "Berlin", "Köln"], "correct": 2},
-                            {"q": "Was ist Marias Beruf?", "options": ["Ärztin", "Lehrerin", "Studentin", "Verkäuferin"], "correct": 1}
-                        ]
-                    }
-                ],
-                "vocabulary": [
-                    {"id": "A1_V1", "german": "das Haus", "english": "house", "options": ["car", "house", "tree", "book"]},
-                    {"id": "A1_V2", "german": "die Katze", "english": "cat", "options": ["dog", "cat", "bird", "fish"]},
-                    {"id": "A1_V3", "german": "essen", "english": "to eat", "options": ["to sleep", "to eat", "to run", "to write"]}
-                ],
-                "grammar": [
-                    {"id": "A1_G1", "question": "Ich __ aus Deutschland.", "options": ["komme", "kommst", "kommt", "kommen"], "correct": 0},
-                    {"id": "A1_G2", "question": "Das ist __ Buch.", "options": ["eine", "ein", "einer", "eines"], "correct": 1}
-                ],
-                "pronunciation": [
-                    {"id": "A1_P1", "word": "Guten Tag", "ipa": "/ˈɡuːtən taːk/", "meaning": "Good day"},
-                    {"id": "A1_P2", "word": "Danke schön", "ipa": "/ˈdaŋkə ʃøːn/", "meaning": "Thank you very much"},
-                    {"id": "A1_P3", "word": "Entschuldigung", "ipa": "/ɛntˈʃʊldɪɡʊŋ/", "meaning": "Excuse me/Sorry"}
-                ]
-            },
-            "A2": {
-                "reading": [
-                    {
-                        "id": "A2_R1",
-                        "text": "Letzten Samstag war ich mit meiner Familie im Park. Das Wetter war sehr schön und warm. Wir haben ein Picknick gemacht und Fußball gespielt. Meine Schwester hat ein Buch gelesen, während mein Bruder mit dem Hund gespielt hat.",
-                        "questions": [
-                            {"q": "Wann war die Familie im Park?", "options": ["Sonntag", "Samstag", "Freitag", "Montag"], "correct": 1},
-                            {"q": "Wie war das Wetter?", "options": ["schlecht", "kalt", "regnerisch", "schön und warm"], "correct": 3},
-                            {"q": "Was hat die Schwester gemacht?", "options": ["Fußball gespielt", "ein Buch gelesen", "mit dem Hund gespielt", "gekocht"], "correct": 1}
-                        ]
-                    }
-                ],
-                "vocabulary": [
-                    {"id": "A2_V1", "german": "der Urlaub", "english": "vacation", "options": ["work", "vacation", "school", "hospital"]},
-                    {"id": "A2_V2", "german": "einkaufen", "english": "to shop", "options": ["to shop", "to cook", "to clean", "to study"]},
-                    {"id": "A2_V3", "german": "das Wetter", "english": "weather", "options": ["time", "weather", "money", "food"]}
-                ],
-                "grammar": [
-                    {"id": "A2_G1", "question": "Gestern __ ich ins Kino gegangen.", "options": ["bin", "habe", "war", "hatte"], "correct": 0},
-                    {"id": "A2_G2", "question": "Der Mann, __ ich gestern getroffen habe, ist mein Nachbar.", "options": ["der", "den", "dem", "dessen"], "correct": 1}
-                ]
-            },
-            "B1": {
-                "reading": [
-                    {
-                        "id": "B1_R1",
-                        "text": "Die Digitalisierung verändert unsere Arbeitswelt grundlegend. Viele traditionelle Berufe verschwinden, während neue entstehen. Es ist wichtig, dass wir uns kontinuierlich weiterbilden, um mit diesen Veränderungen Schritt zu halten. Unternehmen müssen ihre Mitarbeiter dabei unterstützen, neue Fähigkeiten zu erlernen.",
-                        "questions": [
-                            {"q": "Was verändert die Arbeitswelt?", "options": ["Die Digitalisierung", "Die Globalisierung", "Die Politik", "Das Klima"], "correct": 0},
-                            {"q": "Was ist wichtig für Arbeitnehmer?", "options": ["Mehr Geld verdienen", "Früher in Rente gehen", "Sich weiterbilden", "Weniger arbeiten"], "correct": 2},
-                            {"q": "Wer soll Mitarbeiter unterstützen?", "options": ["Die Regierung", "Die Unternehmen", "Die Familie", "Die Freunde"], "correct": 1}
-                        ]
-                    }
-                ],
-                "vocabulary": [
-                    {"id": "B1_V1", "german": "die Herausforderung", "english": "challenge", "options": ["opportunity", "challenge", "problem", "solution"]},
-                    {"id": "B1_V2", "german": "nachhaltig", "english": "sustainable", "options": ["expensive", "sustainable", "temporary", "difficult"]},
-                    {"id": "B1_V3", "german": "sich entwickeln", "english": "to develop", "options": ["to develop", "to destroy", "to ignore", "to avoid"]}
-                ],
-                "grammar": [
-                    {"id": "B1_G1", "question": "Wenn ich mehr Zeit hätte, __ ich mehr reisen.", "options": ["werde", "würde", "will", "wollte"], "correct": 1},
-                    {"id": "B1_G2", "question": "Das ist das Buch, __ ich dir empfohlen habe.", "options": ["das", "dem", "den", "der"], "correct": 0}
-                ]
-            },
-            "B2": {
-                "reading": [
-                    {
-                        "id": "B2_R1",
-                        "text": "Die Klimakrise stellt eine der größten Herausforderungen unserer Zeit dar. Wissenschaftler warnen eindringlich vor den Folgen des Klimawandels. Es bedarf einer koordinierten internationalen Anstrengung, um die Erderwärmung zu begrenzen. Sowohl politische Maßnahmen als auch individuelles Handeln sind erforderlich, um eine nachhaltige Zukunft zu gewährleisten.",
-                        "questions": [
-                            {"q": "Was stellt die Klimakrise dar?", "options": ["Ein kleines Problem", "Eine der größten Herausforderungen", "Eine Chance", "Ein Mythos"], "correct": 1},
-                            {"q": "Was ist erforderlich?", "options": ["Nur politische Maßnahmen", "Nur individuelles Handeln", "Beides", "Nichts"], "correct": 2},
-                            {"q": "Wovor warnen Wissenschaftler?", "options": ["Vor Naturkatastrophen", "Vor den Folgen des Klimawandels", "Vor Wirtschaftskrisen", "Vor Kriegen"], "correct": 1}
-                        ]
-                    }
-                ],
-                "vocabulary": [
-                    {"id": "B2_V1", "german": "die Nachhaltigkeit", "english": "sustainability", "options": ["sustainability", "profitability", "popularity", "availability"]},
-                    {"id": "B2_V2", "german": "bewältigen", "english": "to cope with", "options": ["to avoid", "to cope with", "to create", "to ignore"]},
-                    {"id": "B2_V3", "german": "die Auswirkung", "english": "impact", "options": ["cause", "impact", "beginning", "end"]}
-                ],
-                "grammar": [
-                    {"id": "B2_G1", "question": "Obwohl es regnete, __ wir spazieren gegangen.", "options": ["sind", "haben", "waren", "hatten"], "correct": 0},
-                    {"id": "B2_G2", "question": "Der Vorschlag, __ du gemacht hast, ist sehr interessant.", "options": ["der", "den", "dem", "dessen"], "correct": 1}
-                ]
-            }
-        }
-
     def _select_exercise(self, level: str, content_key: str, state_key: str, count: int = 1):
         """
         Selects a random exercise only if one isn't already stored in session state.
@@ -345,7 +247,7 @@ class GermanLearningGame:
         for i, item in enumerate(grammar_items):
             options_key = f"{item['id']}_g_{i}"
             
-            st.markdown(f"**{item['question']}**")
+            st.markdown(f"**{item['q']}**")
             selected_option_label = st.radio(
                 "Select the correct option:",
                 options=item["options"],
@@ -521,7 +423,8 @@ class GermanLearningGame:
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown(f"**German:** {item['word']}")
-                    st.markdown(f"**IPA:** {item['ipa']}")
+                    if item.get('ipa'):
+                        st.markdown(f"**IPA:** {item['ipa']}")
                     st.markdown(f"**Meaning:** {item['meaning']}")
                     
                 with col2:
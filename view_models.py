@@ -0,0 +1,91 @@
+"""
+Precompiled view models for multiple-choice exercises.
+
+Everything the quiz renderers need per question (stable widget key, question
+markdown, option label -> index map, correct index and the result feedback
+for every possible answer) is derived from the content once and shared by all
+sessions, instead of being recomputed on every Streamlit rerun.
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+from weakref import WeakKeyDictionary
+
+from content_pack import Selection, content_for_version
+
+
+class QuestionView(NamedTuple):
+    key: str                          # stable widget key
+    label: str                        # question markdown
+    options: Tuple[str, ...]
+    option_index: Mapping[str, int]   # option label -> index
+    correct: int
+    feedback: Tuple[str, ...]         # results markdown, indexed by the selected option
+
+
+def _question_view(key: str, text: str, options: Sequence[str], correct: int) -> QuestionView:
+    correct_label = options[correct]
+    feedback = tuple(
+        f"**✅ {text}**" if i == correct
+        else f"**❌ {text}**<br>_Correct Answer:_ **{correct_label}** (You selected: {choice})"
+        for i, choice in enumerate(options)
+    )
+    return QuestionView(
+        key=key,
+        label=f"**{text}**",
+        options=tuple(options),
+        option_index=MappingProxyType({label: i for i, label in enumerate(options)}),
+        correct=correct,
+        feedback=feedback,
+    )
+
+
+def build_item_views(item: Mapping) -> Tuple[QuestionView, ...]:
+    """Returns one view per question of an item (reading/listening have several)."""
+    if "questions" in item:
+        return tuple(
+            _question_view(f"{item['id']}_q_{i}", q["q"], q["options"], q["correct"])
+            for i, q in enumerate(item["questions"])
+        )
+    if "german" in item:
+        return (_question_view(f"{item['id']}_v", item["german"], item["options"], item["correct"]),)
+    if "q" in item:
+        return (_question_view(f"{item['id']}_g", item["q"], item["options"], item["correct"]),)
+    return ()
+
+
+# content source -> (content version, {item id: views}); dropped together with a superseded pack, and
+# started over when a source changes version in place (SQLite store refresh)
+_views: "WeakKeyDictionary[object, Tuple[str, Dict[int, Tuple[QuestionView, ...]]]]" = WeakKeyDictionary()
+_views_lock = threading.Lock()
+
+
+def item_views(content, item_ids: Sequence[int]) -> List[Tuple[QuestionView, ...]]:
+    """Returns the views of each item, building (once per content version) any that are missing."""
+    version = content.version
+    entry = _views.get(content)
+    if entry is None or entry[0] != version:
+        with _views_lock:
+            entry = _views.get(content)
+            if entry is None or entry[0] != version:
+                entry = _views[content] = (version, {})
+    cache = entry[1]
+
+    result = []
+    for item_id in item_ids:
+        views = cache.get(item_id)
+        if views is None:
+            views = cache[item_id] = build_item_views(content.item(item_id))
+        result.append(views)
+    return result
+
+
+def selection_views(selection: Optional[Selection]) -> Optional[List[Tuple[QuestionView, ...]]]:
+    """Views for a session's selection, resolved against the version it was sampled from."""
+    if selection is None:
+        return None
+    content = content_for_version(selection.version)
+    if content is None:
+        return None
+    return item_views(content, selection.ids)